@@ -1,15 +1,20 @@
 from django.contrib import admin
+from core.admin_base import LargeTableAdmin
 from .models import BlogCategory, BlogPost
 
 @admin.register(BlogCategory)
 class BlogCategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'slug')
     prepopulated_fields = {'slug': ('name',)}
+    search_fields = ('name',)  # for the category autocomplete on posts
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'category', 'published_date', 'is_published')
+class BlogPostAdmin(LargeTableAdmin):
+    list_display = ('title', 'category', 'published_date', 'is_published', 'view_count')
+    list_select_related = ('category',)
+    # all backed by blog_post_* indexes; use the date filter instead of date_hierarchy
     list_filter = ('is_published', 'category', 'published_date')
-    search_fields = ('title', 'content', 'tags')
+    # no `content`: LIKE '%...%' over every article body is a full scan
+    search_fields = ('title', 'tags', '=slug')
+    autocomplete_fields = ('profile', 'category')
     prepopulated_fields = {'slug': ('title',)}
-    date_hierarchy = 'published_date'
\ No newline at end of file
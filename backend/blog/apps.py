@@ -3,3 +3,19 @@ from django.apps import AppConfig
 
 class BlogConfig(AppConfig):
     name = 'blog'
+
+    def ready(self):
+        from core.caching import invalidate_on_change, register_ttl_bound
+        from core.images import track_images
+        from .models import BlogCategory, BlogPost
+        from .autocomplete import categories, posts
+        from .related import related_posts
+        from .scheduling import seconds_until_next_publish
+        from . import sync  # noqa: F401  registers the delta-sync collections
+
+        related_posts.connect()
+        posts.connect()
+        categories.connect()
+        track_images(BlogPost, 'featured_image')
+        invalidate_on_change('blog', BlogPost, BlogCategory)
+        register_ttl_bound('blog', seconds_until_next_publish)
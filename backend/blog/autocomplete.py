@@ -0,0 +1,30 @@
+from core.related import split_tags
+from core.typeahead import AutocompleteSource
+from .models import BlogCategory, BlogPost
+
+
+def post_suggestions(row):
+    yield {'type': 'post', 'id': row['pk'], 'label': row['title'], 'slug': row['slug']}
+    for tag in split_tags(row['tags']):
+        yield {'type': 'tag', 'label': tag}
+
+
+def category_suggestions(row):
+    yield {'type': 'category', 'id': row['pk'], 'label': row['name'], 'slug': row['slug']}
+
+
+posts = AutocompleteSource(
+    'blog.blogpost',
+    model=BlogPost,
+    queryset=lambda: BlogPost.objects.published(),
+    fields=['title', 'slug', 'tags'],
+    suggestions=post_suggestions,
+)
+
+categories = AutocompleteSource(
+    'blog.blogcategory',
+    model=BlogCategory,
+    queryset=lambda: BlogCategory.objects.all(),
+    fields=['name', 'slug'],
+    suggestions=category_suggestions,
+)
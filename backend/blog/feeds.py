@@ -0,0 +1,44 @@
+from django.contrib.syndication.views import Feed
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from core.related import split_tags
+from core.syndication import site_url
+from .models import BlogPost
+
+
+class LatestPostsFeed(Feed):
+    title = "Dr. Olana Wakoya Gichile — Blog"
+    description = "Latest articles on global health, medicine and medical education."
+
+    def link(self):
+        return site_url('/blog')
+
+    def items(self):
+        return BlogPost.objects.published().select_related('category')[:20]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return Truncator(post.content).words(60)
+
+    def item_link(self, post):
+        return site_url(f'/blog/{post.slug}')
+
+    def item_pubdate(self, post):
+        return post.published_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_categories(self, post):
+        categories = split_tags(post.tags)
+        if post.category:
+            categories.insert(0, post.category.name)
+        return categories
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
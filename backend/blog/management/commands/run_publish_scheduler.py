@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.scheduling import run_scheduler
+
+
+class Command(BaseCommand):
+    help = "Make scheduled blog posts go live exactly at their published_date"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-sleep', type=int, default=60,
+            help="Longest nap between checks for newly scheduled posts (seconds)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Publish scheduler running; Ctrl+C to stop")
+        try:
+            run_scheduler(max_sleep=options['max_sleep'], stdout=self.stdout)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+        ('core', '0004_alter_profile_options_profile_user_alter_profile_bio'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['is_published', 'published_date'], name='blog_post_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['category', 'is_published', 'published_date'], name='blog_post_category_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_blogpost_view_count'),
+        ('core', '0004_alter_profile_options_profile_user_alter_profile_bio'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['published_date'], name='blog_post_date_idx'),
+        ),
+    ]
@@ -6,6 +6,7 @@ from core.models import Profile  # Import Profile from core app
 class BlogCategory(models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=100, unique=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -19,18 +20,36 @@ class BlogCategory(models.Model):
         verbose_name = "Blog Category"
         verbose_name_plural = "Blog Categories"
 
+class BlogPostQuerySet(models.QuerySet):
+    def published(self):
+        # Scheduled posts (published_date in the future) stay hidden until then
+        return self.filter(is_published=True, published_date__lte=timezone.now())
+
+    def scheduled(self):
+        return self.filter(is_published=True, published_date__gt=timezone.now())
+
+
 class BlogPost(models.Model):
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='blog_posts')  
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     content = models.TextField()
     featured_image = models.ImageField(upload_to='blog/', blank=True, null=True)
+    # filled from the upload by core.images
+    featured_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_color = models.CharField(max_length=7, blank=True, editable=False, help_text="Dominant colour of the image, #rrggbb")
+    featured_image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blurred preview as a data: URI")
     category = models.ForeignKey(BlogCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name='posts')
     tags = models.CharField(max_length=300, blank=True, help_text="Comma-separated tags, e.g., global-health, medical-education, rwanda")
     published_date = models.DateTimeField(default=timezone.now)
     is_published = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
+    # written in batches by core.popularity, never by save()
+    view_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+
+    objects = BlogPostQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -41,4 +60,12 @@ class BlogPost(models.Model):
         return self.title
 
     class Meta:
-        ordering = ['-published_date']
\ No newline at end of file
+        ordering = ['-published_date']
+        indexes = [
+            # archive and public listing: WHERE is_published GROUP/ORDER BY published_date
+            models.Index(fields=['is_published', 'published_date'], name='blog_post_published_idx'),
+            # per-category counts and category pages
+            models.Index(fields=['category', 'is_published', 'published_date'], name='blog_post_category_idx'),
+            # admin changelist ordering and date filter (no is_published condition)
+            models.Index(fields=['published_date'], name='blog_post_date_idx'),
+        ]
\ No newline at end of file
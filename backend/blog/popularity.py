@@ -0,0 +1,8 @@
+from core.popularity import ViewCounter
+from .models import BlogPost
+
+post_views = ViewCounter(
+    'blog.blogpost',
+    model=BlogPost,
+    queryset=lambda: BlogPost.objects.published(),
+)
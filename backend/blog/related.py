@@ -0,0 +1,25 @@
+from collections import Counter
+
+from core.related import RelatedIndex, split_tags, tokenize
+from .models import BlogPost
+
+
+def post_terms(row):
+    terms = Counter()
+    for token in tokenize(row['title']):
+        terms[token] += 2
+    terms.update(tokenize(row['content']))
+    for tag in split_tags(row['tags']):
+        terms[f'tag:{tag}'] += 3
+    if row['category_id']:
+        terms[f'category:{row["category_id"]}'] += 3
+    return terms
+
+
+related_posts = RelatedIndex(
+    'blog.blogpost',
+    model=BlogPost,
+    queryset=lambda: BlogPost.objects.published(),
+    fields=['title', 'content', 'tags', 'category_id'],
+    terms=post_terms,
+)
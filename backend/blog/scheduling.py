@@ -0,0 +1,85 @@
+"""
+Scheduled publishing.
+
+A post with ``published_date`` in the future is hidden from public queries
+until that moment. Two mechanisms make it appear on time:
+
+* every cache lifetime in the ``blog`` namespace (app caches, feeds,
+  sitemaps, Cache-Control) is capped at the seconds left until the next
+  scheduled post, so nothing cached before the publish time outlives it;
+* ``manage.py run_publish_scheduler`` sleeps until the next publish time and
+  then invalidates everything that lists posts, so caches refill right away
+  instead of waiting for expiry.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from core import events, surrogate
+from core.delta import prune_tombstones
+from core.caching import bump, get_version
+from .autocomplete import posts as autocomplete_posts
+from .models import BlogPost
+from .related import related_posts
+
+NEXT_PUBLISH_KEY = 'blog:next-publish'
+
+
+def next_publish_at():
+    """Timestamp of the next scheduled post, or None. Cached per namespace version."""
+    now = time.time()
+    key = f'{NEXT_PUBLISH_KEY}:{get_version("blog")}'
+    entry = cache.get(key)
+    if entry is None or (entry['at'] is not None and entry['at'] <= now):
+        upcoming = BlogPost.objects.scheduled().order_by('published_date').values_list('published_date', flat=True).first()
+        entry = {'at': upcoming.timestamp() if upcoming else None}
+        cache.set(key, entry, int(entry['at'] - now) + 1 if entry['at'] else 3600)
+    return entry['at']
+
+
+def seconds_until_next_publish():
+    at = next_publish_at()
+    if at is None:
+        return None
+    return max(1, int(at - time.time()))
+
+
+def publish_due(since):
+    """
+    Invalidate everything that lists posts that went live in (since, now].
+    Returns those posts' ids.
+    """
+    now = timezone.now()
+    ids = list(
+        BlogPost.objects.filter(is_published=True, published_date__gt=since, published_date__lte=now)
+        .values_list('pk', flat=True)
+    )
+    if ids:
+        bump('blog')
+        surrogate.purge(['blog.blogpost'] + [f'blog.blogpost:{pk}' for pk in ids])
+        for pk in ids:
+            related_posts.feed.record(pk)
+            autocomplete_posts.feed.record(pk)
+            events.publish('blog.blogpost.published', {'model': 'blog.blogpost', 'id': pk})
+    return ids
+
+
+def run_scheduler(max_sleep=60, stdout=None):
+    """
+    Sleep until the next scheduled post (re-checking at least every
+    ``max_sleep`` seconds, in case posts were scheduled meanwhile), publish it,
+    repeat. Expired delta-sync tombstones are pruned on the way (hourly).
+    """
+    since = timezone.now()
+    while True:
+        at = next_publish_at()
+        wait = max(0.0, at - time.time()) + 0.01 if at is not None else max_sleep
+        time.sleep(min(wait, max_sleep))
+        now = timezone.now()
+        ids = publish_due(since)
+        since = now
+        prune_tombstones()
+        if ids and stdout:
+            stdout.write(f"{now:%Y-%m-%d %H:%M:%S} published {', '.join(map(str, ids))}")
@@ -1,23 +1,35 @@
 from rest_framework import serializers
 from .models import BlogCategory, BlogPost
-from core.serializers import ProfileSerializer  # Import to show profile info if needed
+from core.serializers import ProfileDocumentField
+from core.surrogate import SurrogateKeySerializerMixin
 
 # blog/serializers.py
-class BlogCategorySerializer(serializers.ModelSerializer):
+class BlogCategorySerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = BlogCategory
         fields = ['id', 'name', 'slug']
-        
 
-class BlogPostSerializer(serializers.ModelSerializer):
+
+class BlogCategoryCountSerializer(BlogCategorySerializer):
+    post_count = serializers.IntegerField(read_only=True)
+
+    class Meta(BlogCategorySerializer.Meta):
+        fields = BlogCategorySerializer.Meta.fields + ['post_count']
+
+
+class BlogPostSerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     category = BlogCategorySerializer(read_only=True)  # already there
-    profile = ProfileSerializer(read_only=True)        # already there or add
+    profile = ProfileDocumentField()                   # stored document, see core/documents.py
 
     class Meta:
         model = BlogPost
         fields = [
             'id', 'profile', 'title', 'slug', 'content', 'featured_image',
+            'featured_image_width', 'featured_image_height', 'featured_image_color', 'featured_image_placeholder',
             'category', 'tags', 'published_date', 'is_published',
-            'created_at', 'updated_at'
+            'created_at', 'updated_at', 'view_count'
         ]
-        read_only_fields = ['profile', 'slug', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = [
+            'profile', 'slug', 'created_at', 'updated_at', 'view_count',
+            'featured_image_width', 'featured_image_height', 'featured_image_color', 'featured_image_placeholder',
+        ]
\ No newline at end of file
@@ -0,0 +1,15 @@
+from core.syndication import SiteSitemap
+from .models import BlogPost
+
+
+class BlogPostSitemap(SiteSitemap):
+    namespace = 'blog'
+    lastmod_field = 'updated_at'
+    changefreq = 'weekly'
+    priority = 0.8
+
+    def items(self):
+        return BlogPost.objects.published().only('slug', 'updated_at').order_by('pk')
+
+    def location(self, post):
+        return f'/blog/{post.slug}'
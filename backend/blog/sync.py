@@ -0,0 +1,25 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from core.delta import SyncCollection
+from .models import BlogCategory, BlogPost
+from .serializers import BlogCategorySerializer, BlogPostSerializer
+
+
+def visible_posts(request):
+    # same rule as BlogPostViewSet: drafts and scheduled posts are admin-only
+    if request.user.is_authenticated:
+        return BlogPost.objects.all()
+    return BlogPost.objects.published()
+
+
+def changed_posts(since):
+    # a scheduled post going live changes what readers see without a save
+    return Q(updated_at__gte=since) | Q(published_date__gte=since, published_date__lte=timezone.now())
+
+
+categories = SyncCollection('blog.blogcategory', BlogCategory, BlogCategorySerializer)
+posts = SyncCollection(
+    'blog.blogpost', BlogPost, BlogPostSerializer,
+    queryset=visible_posts, changed=changed_posts, select_related=('category',),
+)
@@ -1,3 +1,260 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import typeahead
+from core.models import Education, Profile, Resume, Skill, Tombstone
+from .models import BlogCategory, BlogPost
+from .popularity import post_views
+
+
+class FastPostListTests(TestCase):
+    """The fast list path (core.fast) must return exactly what the serializers return."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = Profile.objects.create(full_name="Dr. Test", profile_image='profile/portrait 1.jpg')
+        Skill.objects.create(profile=cls.profile, name="Ultrasound", category='clinical')
+        Education.objects.create(profile=cls.profile, institution="Uni", degree="MD", start_year=2000, end_year=2006)
+        Resume.objects.create(profile=cls.profile, pdf_file='resumes/cv.pdf')
+        cls.category = BlogCategory.objects.create(name="Global Health")
+
+        now = timezone.now()
+        for day in range(5):
+            BlogPost.objects.create(
+                profile=cls.profile, title=f"Published {day}", content="...", tags="rwanda, equity",
+                category=cls.category if day % 2 else None, published_date=now - timedelta(days=day),
+                featured_image=f'blog/cover {day}.jpg' if day % 2 else None,
+            )
+        BlogPost.objects.create(profile=cls.profile, title="Scheduled", content="...",
+                                published_date=now + timedelta(days=3))
+        BlogPost.objects.create(profile=cls.profile, title="Draft", content="...", is_published=False)
+
+        cls.staff = User.objects.create_user('staff', password='x', is_staff=True)
+
+    def get(self, path, fast, **headers):
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            return self.client.get(path, HTTP_ACCEPT='application/json', **headers)
+
+    def assertSameOutput(self, path, **headers):
+        slow = self.get(path, False, **headers)
+        fast = self.get(path, True, **headers)
+        self.assertEqual(slow.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+        self.assertEqual(fast.get('Surrogate-Key'), slow.get('Surrogate-Key'))
+        return fast.json()
+
+    def test_published_posts(self):
+        body = self.assertSameOutput('/api/blog/posts/')
+        titles = [post['title'] for post in body['results']]
+        self.assertEqual(titles, [f"Published {day}" for day in range(5)])
+
+    def test_nested_category_and_profile(self):
+        body = self.assertSameOutput('/api/blog/posts/')
+        post = body['results'][1]
+        self.assertEqual(post['category']['name'], "Global Health")
+        self.assertIsNone(body['results'][0]['category'])
+        self.assertEqual(post['profile']['full_name'], "Dr. Test")
+        self.assertEqual(post['profile']['skills'][0]['name'], "Ultrasound")
+        self.assertEqual(post['profile']['resume']['pdf_file'], 'http://testserver/media/resumes/cv.pdf')
+        self.assertEqual(post['featured_image'], 'http://testserver/media/blog/cover%201.jpg')
+
+    def test_drafts_and_scheduled_for_staff(self):
+        token = AccessToken.for_user(self.staff)
+        body = self.assertSameOutput('/api/blog/posts/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        titles = {post['title'] for post in body['results']}
+        self.assertTrue({"Scheduled", "Draft"} <= titles)
+
+    def test_pagination(self):
+        # page_size is read from the settings once, when DRF is imported
+        with mock.patch.object(PageNumberPagination, 'page_size', 2):
+            first = self.assertSameOutput('/api/blog/posts/')
+            last = self.assertSameOutput('/api/blog/posts/?page=3')
+        self.assertEqual(first['count'], 5)
+        self.assertEqual(len(first['results']), 2)
+        self.assertIsNotNone(first['next'])
+        self.assertEqual([post['title'] for post in last['results']], ["Published 4"])
+        self.assertIsNone(last['next'])
+
+
+class DeltaSyncTests(TestCase):
+    """/api/sync/ (core.delta) on the blog collections."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = Profile.objects.create(full_name="Dr. Test")
+        cls.posts = [
+            BlogPost.objects.create(profile=cls.profile, title=f"Post {number}", content="...")
+            for number in range(5)
+        ]
+        cls.draft = BlogPost.objects.create(profile=cls.profile, title="Draft", content="...", is_published=False)
+        # older than the tokens' overlap, so a delta only has what a test changes
+        hour_ago = timezone.now() - timedelta(hours=1)
+        BlogPost.objects.update(published_date=hour_ago, updated_at=hour_ago)
+        cls.staff = User.objects.create_user('staff', password='x', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def sync(self, status=200, **params):
+        response = self.client.get('/api/sync/', {'collections': 'blog.blogpost', **params}, **self.headers)
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    headers = {}
+
+    def sync_all(self, **params):
+        """Follows the cursors; returns the pages."""
+        pages = [self.sync(**params)]
+        while pages[-1]['next']:
+            pages.append(self.sync(cursor=pages[-1]['next']))
+        return pages
+
+    def test_pages_follow_cursors(self):
+        with self.settings(SYNC_PAGE_SIZE=2):
+            pages = self.sync_all()
+        self.assertEqual(len(pages), 3)
+        self.assertEqual([page['token'] is None for page in pages], [True, True, False])
+        titles = [row['title'] for page in pages for row in page['collections']['blog.blogpost']['changed']]
+        self.assertEqual(titles, [f"Post {number}" for number in range(5)])
+
+    def test_delta_has_changes_and_deletions(self):
+        token = self.sync()['token']
+        post = self.posts[1]
+        post.title = "Post 1, revised"
+        post.save()
+        deleted_pk = self.posts[2].pk
+        self.posts[2].delete()
+        part = self.sync(changed_since=token)['collections']['blog.blogpost']
+        self.assertEqual([row['title'] for row in part['changed']], ["Post 1, revised"])
+        self.assertEqual(part['deleted'], [deleted_pk])
+
+    def test_unpublished_post_is_reported_once_hidden(self):
+        token = self.sync()['token']
+        post = self.posts[3]
+        post.is_published = False
+        post.save()
+        part = self.sync(changed_since=token)['collections']['blog.blogpost']
+        self.assertEqual(part, {'changed': [], 'deleted': [post.pk]})
+
+    def test_drafts_dont_leak_to_anonymous_callers(self):
+        token = self.sync()['token']
+        self.draft.title = "Draft, revised"
+        self.draft.save()
+        draft_pk = self.draft.pk
+        self.draft.delete()
+        part = self.sync(changed_since=token)['collections']['blog.blogpost']
+        self.assertEqual(part, {'changed': [], 'deleted': []})
+
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.staff)}'}
+        self.assertEqual(self.sync(changed_since=token)['collections']['blog.blogpost']['deleted'], [draft_pk])
+
+    def test_old_token_resets(self):
+        token = self.sync()['token']
+        with self.settings(SYNC_TOMBSTONE_RETENTION=0):
+            body = self.sync(changed_since=token)
+        self.assertTrue(body['reset'])
+        self.assertEqual(len(body['collections']['blog.blogpost']['changed']), 5)
+
+    def test_invalid_token_and_cursor(self):
+        self.assertIn('changed_since', self.sync(400, changed_since='nope'))
+        self.assertIn('cursor', self.sync(400, cursor='nope'))
+        self.assertIn('collections', self.sync(400, collections='blog.nothing'))
+
+    def test_prune_tombstones(self):
+        old, recent = self.posts[:2]
+        recent_pk = recent.pk
+        old.delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=365))
+        recent.delete()
+        call_command('prune_tombstones', stdout=mock.Mock())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [str(recent_pk)])
+
+
+class RecordViewTests(TestCase):
+    """POST /api/blog/posts/<id>/view/ (core.popularity)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        profile = Profile.objects.create(full_name="Dr. Test")
+        cls.post = BlogPost.objects.create(profile=profile, title="Post", content="...")
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(post_views.flush)
+
+    def view(self, ip='10.0.0.1', **headers):
+        return self.client.post(f'/api/blog/posts/{self.post.pk}/view/', REMOTE_ADDR=ip, **headers).status_code
+
+    def test_one_view_per_visitor(self):
+        self.view(HTTP_USER_AGENT='a')
+        self.view(HTTP_USER_AGENT='b', HTTP_X_FORWARDED_FOR='203.0.113.9')  # the same client, disguised
+        self.view('10.0.0.2')
+        post_views.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 2)
+
+    def test_throttled(self):
+        with mock.patch.dict(api_settings.DEFAULT_THROTTLE_RATES, {'views': '2/min'}):
+            self.assertEqual([self.view() for _ in range(3)], [204, 204, 429])
+
+
+class AutocompleteTests(TestCase):
+    """/api/autocomplete/ (core.typeahead) over the blog sources."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = Profile.objects.create(full_name="Dr. Test")
+        cls.category = BlogCategory.objects.create(name="Médecine tropicale")
+        cls.post = BlogPost.objects.create(profile=cls.profile, title="Global Health Equity", content="...",
+                                           tags="rwanda, health systems")
+        BlogPost.objects.create(profile=cls.profile, title="Hidden draft health", content="...", is_published=False)
+
+    def setUp(self):
+        cache.clear()
+        typeahead.rebuild()
+        self.addCleanup(self.forget)
+
+    def forget(self):
+        with typeahead.index.lock:
+            typeahead.index.clear()
+            for source in typeahead.SOURCES.values():
+                source.generation, source.contributed = None, {}
+
+    def labels(self, q, **params):
+        response = self.client.get('/api/autocomplete/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [result['label'] for result in response.json()['results']]
+
+    def test_prefix_of_any_word(self):
+        self.assertEqual(self.labels('glo'), ["Global Health Equity"])
+        self.assertEqual(self.labels('heal'), ["health systems", "Global Health Equity"])
+        self.assertEqual(self.labels('health eq'), ["Global Health Equity"])
+        self.assertEqual(self.labels('medecine'), ["Médecine tropicale"])  # accents folded
+        self.assertEqual(self.labels('heal', types='tag'), ["health systems"])
+
+    def test_changes_are_picked_up(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = "Planetary Health"
+            self.post.save()
+        self.assertEqual(self.labels('plan'), ["Planetary Health"])
+        self.assertEqual(self.labels('glo'), [])
+
+    def test_no_match(self):
+        self.assertEqual(self.labels('draft'), [])
+        self.assertEqual(self.labels(''), [])
+        self.assertEqual(self.labels('zzz'), [])
+
+    def test_cold_index_answers_without_waiting(self):
+        self.forget()
+        with mock.patch.object(typeahead.background, 'start') as start:
+            self.assertEqual(self.labels('glo'), [])
+        start.assert_called()
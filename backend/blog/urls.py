@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BlogCategoryViewSet, BlogPostViewSet
+from .views import BlogArchiveView, BlogCategoryViewSet, BlogPostViewSet
 
 router = DefaultRouter()
 router.register(r'categories', BlogCategoryViewSet, basename='blogcategory')
 router.register(r'posts', BlogPostViewSet, basename='blogpost')
 
 urlpatterns = [
+    path('archive/', BlogArchiveView.as_view(), name='blog-archive'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,15 +1,30 @@
 # blog/views.py
 
-from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.db.models.functions import ExtractMonth, ExtractYear
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import BlogCategory, BlogPost
-from .serializers import BlogCategorySerializer, BlogPostSerializer
+from .popularity import post_views
+from .related import related_posts
+from .serializers import BlogCategorySerializer, BlogCategoryCountSerializer, BlogPostSerializer
+from core.caching import cached
+from core.documents import NestedProfileDocument
+from core.fast import FastListMixin, NestedByForeignKey
+from core.idempotency import IdempotencyMixin
 from core.models import Profile
+from core.surrogate import SurrogateKeyMixin, instance_key
+from core.throttling import PUBLIC_WRITE_THROTTLES
 
-class BlogCategoryViewSet(viewsets.ModelViewSet):          # ← changed from ReadOnlyModelViewSet
+class BlogCategoryViewSet(IdempotencyMixin, SurrogateKeyMixin, viewsets.ModelViewSet):          # ← changed from ReadOnlyModelViewSet
     queryset = BlogCategory.objects.all()
     serializer_class = BlogCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespaces = ('blog',)
 
     # Optional: if you want to auto-generate slug on create/update
     def perform_create(self, serializer):
@@ -18,11 +33,58 @@ class BlogCategoryViewSet(viewsets.ModelViewSet):          # ← changed from Re
     def perform_update(self, serializer):
         serializer.save()
 
+    def list(self, request, *args, **kwargs):
+        # ?with_counts=1 → every category with its number of published posts,
+        # one LEFT JOIN ... GROUP BY, cached until a post or category changes.
+        # Not paginated: it's meant for sidebars.
+        if request.query_params.get('with_counts') not in ('1', 'true'):
+            return super().list(request, *args, **kwargs)
+        self._surrogate_keys.add('blog.blogpost')
+        return Response(cached('blog', 'categories-with-counts', self.categories_with_counts))
 
-class BlogPostViewSet(viewsets.ModelViewSet):
+    def categories_with_counts(self):
+        categories = BlogCategory.objects.annotate(
+            post_count=Count('posts', filter=Q(posts__is_published=True, posts__published_date__lte=timezone.now()))
+        ).order_by('name')
+        return BlogCategoryCountSerializer(categories, many=True).data
+
+
+class BlogArchiveView(SurrogateKeyMixin, APIView):
+    """Published post counts per year and month, newest first."""
+    permission_classes = [AllowAny]
+    surrogate_keys = ('blog.blogpost',)
+    cache_namespaces = ('blog',)
+
+    def get(self, request):
+        return Response(cached('blog', 'archive', self.archive))
+
+    def archive(self):
+        rows = (
+            BlogPost.objects.published()
+            .annotate(year=ExtractYear('published_date'), month=ExtractMonth('published_date'))
+            .values('year', 'month')
+            .annotate(count=Count('id'))
+            .order_by('-year', '-month')
+        )
+        return list(rows)
+
+
+class BlogPostViewSet(IdempotencyMixin, FastListMixin, SurrogateKeyMixin, viewsets.ModelViewSet):
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_scope = 'views'  # record_view only; nothing else here is throttled
+    cache_namespaces = ('blog',)
+    fast_nested = {
+        'category': NestedByForeignKey(BlogCategorySerializer, lambda: BlogCategory.objects.all()),
+        'profile': NestedProfileDocument(),
+    }
+
+    def get_queryset(self):
+        # The admin sees drafts and scheduled posts; everyone else only what's live
+        if self.request.user.is_authenticated:
+            return BlogPost.objects.all()
+        return BlogPost.objects.published()
 
     def perform_create(self, serializer):
         if self.request.user.is_authenticated and hasattr(self.request.user, 'profile'):
@@ -38,4 +100,30 @@ class BlogPostViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         # Optional: you can add extra checks here later
-        serializer.save()
\ No newline at end of file
+        serializer.save()
+
+    @action(detail=True)
+    def related(self, request, pk=None):
+        # Served from the precomputed similarity index (see blog/related.py)
+        post = self.get_object()
+        self._surrogate_keys.add(instance_key(post))
+        ids = related_posts.related_ids(post.pk)
+        posts = BlogPost.objects.select_related('category').in_bulk(ids)
+        serializer = self.get_serializer([posts[i] for i in ids if i in posts], many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['post'], url_path='view', permission_classes=[AllowAny],
+            throttle_classes=PUBLIC_WRITE_THROTTLES)
+    def record_view(self, request, pk=None):
+        # Counted in memory and flushed in batches (see core/popularity.py)
+        post_views.record(request, self.get_object().pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False)
+    def popular(self, request):
+        # Most read posts, from the ranking refreshed after each counter flush
+        self._surrogate_keys.add(post_views.surrogate_key)
+        ids = post_views.popular_ids()
+        posts = self.get_queryset().select_related('category').in_bulk(ids)
+        serializer = self.get_serializer([posts[i] for i in ids if i in posts], many=True)
+        return Response(serializer.data)
\ No newline at end of file
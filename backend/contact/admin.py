@@ -1,10 +1,12 @@
 from django.contrib import admin
+from core.admin_base import LargeTableAdmin
 from .models import ContactMessage
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(LargeTableAdmin):
     list_display = ('name', 'email', 'subject', 'created_at', 'is_read', 'replied')
+    # index-backed (see ContactMessage.Meta.indexes); no date_hierarchy on the inbox
     list_filter = ('is_read', 'replied', 'created_at')
-    search_fields = ('name', 'email', 'message', 'subject')
+    # exact e-mail uses its index; the message body is not searched
+    search_fields = ('=email', 'name', 'subject')
     readonly_fields = ('created_at',)
-    date_hierarchy = 'created_at'
\ No newline at end of file
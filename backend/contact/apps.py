@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ContactConfig(AppConfig):
     name = 'contact'
+
+    def ready(self):
+        from . import sync  # noqa: F401  registers the delta-sync collections
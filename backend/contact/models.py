@@ -9,6 +9,7 @@ class ContactMessage(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     is_read = models.BooleanField(default=False)
     replied = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
 
     def __str__(self):
         return f"Message from {self.name} - {self.email}"
@@ -16,4 +17,12 @@ class ContactMessage(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Contact Message"
-        verbose_name_plural = "Contact Messages"
\ No newline at end of file
+        verbose_name_plural = "Contact Messages"
+        indexes = [
+            # inbox ordering and date filter
+            models.Index(fields=['created_at'], name='contact_created_idx'),
+            # "unread" / "not replied" filters, newest first
+            models.Index(fields=['is_read', 'created_at'], name='contact_unread_idx'),
+            models.Index(fields=['replied', 'created_at'], name='contact_replied_idx'),
+            models.Index(fields=['email'], name='contact_email_idx'),
+        ]
\ No newline at end of file
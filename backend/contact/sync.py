@@ -0,0 +1,5 @@
+from core.delta import SyncCollection
+from .models import ContactMessage
+from .serializers import ContactMessageSerializer
+
+messages = SyncCollection('contact.contactmessage', ContactMessage, ContactMessageSerializer, private=True)
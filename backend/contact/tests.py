@@ -1,3 +1,49 @@
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from core.idempotency import cache_key
+from .models import ContactMessage
+
+MESSAGE = {'name': "Ada", 'email': 'ada@example.com', 'subject': "Talk", 'message': "Hello"}
+
+
+class IdempotencyTests(TestCase):
+    """core.idempotency on the public contact form."""
+
+    def setUp(self):
+        cache.clear()
+
+    def post(self, data, key='retry-1'):
+        return self.client.post('/api/contact/messages/', data, content_type='application/json',
+                                HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_resend_is_replayed(self):
+        first = self.post(MESSAGE)
+        second = self.post(MESSAGE)
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_validation_error_is_replayed(self):
+        first = self.post({'name': "Ada"})
+        second = self.post({'name': "Ada"})
+        self.assertEqual(first.status_code, 400)
+        self.assertEqual(second.status_code, 400)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.json(), first.json())
+
+    def test_key_reused_with_another_body(self):
+        self.post(MESSAGE)
+        response = self.post({**MESSAGE, 'message': "Something else"})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_duplicate_in_flight_gets_409_at_once(self):
+        # the same caller, method and path as the duplicate: what the first request locked
+        request = self.post(MESSAGE, key='other').wsgi_request
+        cache.add(cache_key(request, 'in-flight') + ':lock', True)
+        response = self.post(MESSAGE, key='in-flight')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
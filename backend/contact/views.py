@@ -1,22 +1,53 @@
 # contact/views.py
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework import viewsets, status
 from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from core.idempotency import IdempotencyMixin, idempotent
+from core.throttling import PUBLIC_WRITE_THROTTLES
 from .models import ContactMessage
 from .serializers import ContactMessageSerializer
 
-class ContactMessageViewSet(viewsets.ModelViewSet):
+class ContactMessageViewSet(IdempotencyMixin, viewsets.ModelViewSet):
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
+    throttle_scope = 'contact'
 
     def get_permissions(self):
         if self.action == 'create':
             return [AllowAny()]
         return [IsAuthenticatedOrReadOnly()]
 
+    def get_throttles(self):
+        if self.action == 'create':
+            return [throttle() for throttle in PUBLIC_WRITE_THROTTLES]
+        return super().get_throttles()
+
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+
+        # Identical submissions inside the window are acknowledged but never stored
+        key = self.dedup_key(serializer.validated_data)
+        if not cache.add(key, True, settings.CONTACT_DEDUP_WINDOW):
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        try:
+            self.perform_create(serializer)
+        except Exception:
+            # nothing was stored: the client's retry must not be taken for a duplicate
+            cache.delete(key)
+            raise
         headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def dedup_key(self, data):
+        normalized = '\x1f'.join(
+            ' '.join(str(data.get(field, '')).lower().split())
+            for field in ('name', 'email', 'subject', 'message')
+        )
+        return 'contact:dedup:' + hashlib.sha256(normalized.encode()).hexdigest()
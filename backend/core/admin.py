@@ -8,6 +8,8 @@ from .models import Resume
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'title', 'years_experience', 'specialization')
+    search_fields = ('full_name',)  # for the profile autocompletes
+    ordering = ('full_name',)
     readonly_fields = ('created_at',)
 
     fieldsets = (
@@ -23,20 +25,28 @@ class ProfileAdmin(admin.ModelAdmin):
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'profile')
+    list_select_related = ('profile',)
     list_filter = ('category',)
+    autocomplete_fields = ('profile',)
 
 
 
 @admin.register(Education)
 class EducationAdmin(admin.ModelAdmin):
     list_display = ('degree', 'institution', 'start_year', 'end_year', 'profile')
+    list_select_related = ('profile',)
     list_filter = ('profile',)
+    autocomplete_fields = ('profile',)
 
 @admin.register(Experience)
 class ExperienceAdmin(admin.ModelAdmin):
     list_display = ('position', 'organization', 'start_date', 'end_date', 'is_current', 'profile')
+    list_select_related = ('profile',)
     list_filter = ('is_current', 'profile')
+    autocomplete_fields = ('profile',)
 
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
-    list_display = ('profile', 'updated_at')
\ No newline at end of file
+    list_display = ('profile', 'updated_at')
+    list_select_related = ('profile',)
+    autocomplete_fields = ('profile',)
\ No newline at end of file
@@ -3,3 +3,20 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+        from .events import connect_model_events
+        from .surrogate import connect_purge_signals
+        from . import sync  # noqa: F401  registers the delta-sync collections
+        from .autocomplete import skills
+        from .documents import connect as connect_documents
+
+        connect_model_events(settings.EVENT_MODELS)
+        connect_purge_signals(settings.SURROGATE_KEY_MODELS)
+        skills.connect()
+        connect_documents()
+
+        if settings.MEDIA_DELETE_REPLACED_FILES:
+            from .media import connect_file_cleanup
+            connect_file_cleanup()
@@ -0,0 +1,15 @@
+from .models import Skill
+from .typeahead import AutocompleteSource
+
+
+def skill_suggestions(row):
+    yield {'type': 'skill', 'id': row['pk'], 'label': row['name']}
+
+
+skills = AutocompleteSource(
+    'core.skill',
+    model=Skill,
+    queryset=lambda: Skill.objects.all(),
+    fields=['name'],
+    suggestions=skill_suggestions,
+)
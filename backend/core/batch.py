@@ -0,0 +1,159 @@
+"""
+``POST /api/batch/``: several API calls in one round trip.
+
+    {"atomic": false,
+     "requests": [{"method": "GET", "path": "/api/blog/posts/?page=2"},
+                  {"method": "PATCH", "path": "/api/blog/posts/4/", "body": {"is_published": true}}]}
+
+answers ``{"responses": [{"status": 200, "headers": {...}, "body": ...}, ...]}``
+in the same order.
+
+* The caller is authenticated once; every item runs as that user and still
+  goes through its own view's permissions and throttles.
+* Consecutive GETs run concurrently on up to ``BATCH_MAX_CONCURRENCY``
+  threads. A write waits for the items before it and runs on the request's
+  own connection, so later items see its effects.
+* With ``"atomic": true`` the items run one after another in a single
+  transaction. The first item that fails (4xx/5xx) rolls everything back;
+  the items after it are not run and report 424.
+
+Items are dispatched straight to their views, without the middleware stack.
+"""
+
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from inspect import iscoroutinefunction
+from itertools import groupby
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections, transaction
+from django.urls import Resolver404, resolve, reverse
+from rest_framework import serializers
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+# request metadata the items inherit from the batch request
+INHERITED_META = (
+    'REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT', 'HTTP_HOST', 'HTTP_USER_AGENT', 'HTTP_ACCEPT_LANGUAGE',
+    'HTTP_AUTHORIZATION', 'HTTP_X_FORWARDED_FOR', 'HTTP_X_FORWARDED_HOST', 'HTTP_X_FORWARDED_PROTO',
+)
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.CharField()
+    body = serializers.JSONField(required=False, allow_null=True)
+
+    def validate_path(self, value):
+        if not value.startswith('/api/') or value.split('?')[0] == reverse('batch'):
+            raise serializers.ValidationError("Must be an API path other than the batch endpoint.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    atomic = serializers.BooleanField(default=False)
+    requests = BatchItemSerializer(many=True, allow_empty=False, max_length=settings.BATCH_MAX_REQUESTS)
+
+
+def build_request(parent, item):
+    path, _, query = item['path'].partition('?')
+    body = b'' if item.get('body') is None else json.dumps(item['body']).encode()
+    environ = {key: parent.META[key] for key in INHERITED_META if key in parent.META}
+    environ.update({
+        'REQUEST_METHOD': item['method'],
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.url_scheme': parent.scheme,
+    })
+    request = WSGIRequest(environ)
+    # DRF picks these up instead of running the authenticators again
+    request.user = request._force_auth_user = parent.user
+    request._force_auth_token = parent.auth
+    return request
+
+
+def item_error(status, detail):
+    return {'status': status, 'headers': {}, 'body': {'detail': detail}}
+
+
+def run_item(parent, item):
+    request = build_request(parent, item)
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return item_error(404, "Not found.")
+    if iscoroutinefunction(match.func):
+        return item_error(400, "This endpoint cannot be batched.")
+
+    request.resolver_match = match
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+    except Exception:
+        logger.exception("Batch item %s %s failed", item['method'], item['path'])
+        return item_error(500, "Internal server error.")
+    if response.streaming:
+        return item_error(400, "Streaming endpoints cannot be batched.")
+
+    if not response.content:
+        body = None
+    elif response.get('Content-Type', '').startswith('application/json'):
+        body = json.loads(response.content)  # [], {}, 0 and false stay as they are
+    else:
+        body = response.content.decode(response.charset or 'utf-8')
+    return {'status': response.status_code, 'headers': dict(response.items()), 'body': body}
+
+
+def run_item_in_thread(parent, item):
+    try:
+        return run_item(parent, item)
+    finally:
+        connections.close_all()  # this worker thread's connections only
+
+
+class BatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['requests']
+        if serializer.validated_data['atomic']:
+            results = self.run_atomic(request, items)
+        else:
+            results = self.run_concurrent(request, items)
+        return Response({'responses': results})
+
+    def run_atomic(self, request, items):
+        results = []
+        with transaction.atomic():
+            for item in items:
+                result = run_item(request, item)
+                results.append(result)
+                if result['status'] >= 400:
+                    transaction.set_rollback(True)
+                    break
+        skipped = item_error(424, "Not run: an earlier request in this atomic batch failed.")
+        return results + [skipped] * (len(items) - len(results))
+
+    def run_concurrent(self, request, items):
+        results = []
+        for is_read, group in groupby(items, key=lambda item: item['method'] == 'GET'):
+            group = list(group)
+            if is_read and len(group) > 1:
+                with ThreadPoolExecutor(max_workers=settings.BATCH_MAX_CONCURRENCY) as pool:
+                    results.extend(pool.map(lambda item: run_item_in_thread(request, item), group))
+            else:
+                results.extend(run_item(request, item) for item in group)
+        return results
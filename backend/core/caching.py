@@ -0,0 +1,85 @@
+"""
+Versioned cache namespaces.
+
+Cached values are stored under a key that includes the namespace's current
+version. Invalidating a namespace bumps the version, so every old entry is
+ignored at once (and expires on its own) without having to track keys.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .metrics import record_cache
+
+
+def version_key(namespace):
+    return f'ns:{namespace}:version'
+
+
+def get_version(namespace):
+    version = cache.get(version_key(namespace))
+    if version is None:
+        cache.add(version_key(namespace), 1, None)
+        version = cache.get(version_key(namespace)) or 1
+    return version
+
+
+def bump(namespace):
+    try:
+        cache.incr(version_key(namespace))
+    except ValueError:  # not set yet, or evicted
+        cache.set(version_key(namespace), 2, None)
+
+
+# namespace -> callable returning the most seconds an entry may live, or None
+_ttl_bounds = {}
+
+
+def register_ttl_bound(namespace, bound):
+    """
+    Cap cache lifetimes in ``namespace``, e.g. so nothing cached before a
+    scheduled blog post goes live outlives its publish time.
+    """
+    _ttl_bounds[namespace] = bound
+
+
+def bounded_timeout(namespaces, timeout):
+    for namespace in namespaces:
+        bound = _ttl_bounds.get(namespace)
+        limit = bound() if bound else None
+        if limit is not None:
+            timeout = max(1, min(timeout, limit))
+    return timeout
+
+
+def cached(namespace, key, compute, timeout=300):
+    """Return ``compute()`` from the cache, keyed under the namespace version."""
+    full_key = f'ns:{namespace}:{get_version(namespace)}:{key}'
+    value = cache.get(full_key)
+    record_cache(namespace, value is not None)
+    if value is None:
+        value = compute()
+        cache.set(full_key, value, bounded_timeout([namespace], timeout))
+    return value
+
+
+# model -> namespaces bumped when one of its rows changes
+_model_namespaces = {}
+
+
+def namespaces_for(model):
+    """The namespaces to bump by hand after writes that send no signals (``bulk_update``)."""
+    return _model_namespaces.get(model, [])
+
+
+def invalidate_on_change(namespace, *models):
+    """Bump ``namespace`` after any save or delete of the given models commits."""
+    def receiver(sender, **kwargs):
+        transaction.on_commit(lambda: bump(namespace))
+
+    for model in models:
+        _model_namespaces.setdefault(model, []).append(namespace)
+        label = model._meta.label_lower
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f'ns-{namespace}-{label}-save')
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f'ns-{namespace}-{label}-delete')
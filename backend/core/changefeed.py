@@ -0,0 +1,115 @@
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connections
+
+RESET = '__reset__'
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeFeed:
+    """
+    A small log of changed primary keys kept in the shared cache.
+
+    In-process indexes (related content, autocomplete, ...) remember the
+    generation they last applied. On lookup they ask the feed what changed
+    since then and update only those rows. If the log has gaps (entries
+    evicted, or too far behind), ``since()`` returns None and the caller
+    rebuilds from scratch, off the request path (``BackgroundBuild``).
+    """
+
+    def __init__(self, name, timeout=24 * 3600, max_backlog=1000):
+        self.name = name
+        self.timeout = timeout
+        self.max_backlog = max_backlog
+
+    @property
+    def generation_key(self):
+        return f'changefeed:{self.name}:generation'
+
+    def entry_key(self, generation):
+        return f'changefeed:{self.name}:{generation}'
+
+    def current(self):
+        return cache.get(self.generation_key) or 0
+
+    def _next_generation(self):
+        cache.add(self.generation_key, 0, None)
+        try:
+            return cache.incr(self.generation_key)
+        except ValueError:  # evicted between add() and incr()
+            cache.set(self.generation_key, 1, None)
+            return 1
+
+    def record(self, pk):
+        generation = self._next_generation()
+        cache.set(self.entry_key(generation), pk, self.timeout)
+        return generation
+
+    def reset(self):
+        """Tell every process to rebuild its index (in the background) on next use."""
+        return self.record(RESET)
+
+    def since(self, generation):
+        """
+        Return ``(current_generation, changed_pks)``. ``changed_pks`` is None
+        when the caller cannot catch up incrementally and must rebuild.
+        """
+        current = self.current()
+        if current == generation:
+            return current, []
+        if current < generation or current - generation > self.max_backlog:
+            return current, None
+
+        keys = [self.entry_key(g) for g in range(generation + 1, current + 1)]
+        entries = cache.get_many(keys)
+        if len(entries) != len(keys):
+            return current, None
+        changed = [entries[key] for key in keys]
+        if RESET in changed:
+            return current, None
+        return current, list(dict.fromkeys(changed))
+
+
+class BackgroundBuild:
+    """
+    Runs an index's full rebuild on a daemon thread, one at a time, so no
+    request ever waits for one; lookups keep using the data they have (or
+    none, on a cold worker) until ``build`` swaps the new data in. After a
+    failure, the next attempt waits ``retry_after`` seconds.
+    """
+
+    def __init__(self, name, build, retry_after=30):
+        self.name = name
+        self.build = build
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.thread = None
+        self.failed_at = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        with self.lock:
+            if self.running:
+                return False
+            if self.failed_at is not None and time.monotonic() - self.failed_at < self.retry_after:
+                return False
+            self.thread = threading.Thread(target=self.run, name=f'rebuild {self.name}', daemon=True)
+            self.thread.start()
+            return True
+
+    def run(self):
+        try:
+            self.build()
+            self.failed_at = None
+        except Exception:
+            self.failed_at = time.monotonic()
+            logger.exception("Rebuilding %s failed", self.name)
+        finally:
+            connections.close_all()  # this thread's connections only
@@ -0,0 +1,121 @@
+"""
+Response compression helpers used by ``core.middleware.CompressionMiddleware``.
+
+gzip (stdlib zlib) is always available. Brotli and zstd are picked up when
+their packages are installed, and are preferred over gzip when the client
+accepts them.
+"""
+
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import record_cache
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:  # optional dependency
+        zstd = None
+
+
+def _gzip(data, level):
+    # mtime=0 keeps the output deterministic, so identical bodies give identical bytes
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli(data, level):
+    return brotli.compress(data, quality=level)
+
+
+def _zstd(data, level):
+    # same one-shot signature in compression.zstd and the zstandard package
+    return zstd.compress(data, level=level)
+
+
+# Server-side preference order: first match the client accepts wins.
+CODECS = {}
+if zstd is not None:
+    CODECS['zstd'] = _zstd
+if brotli is not None:
+    CODECS['br'] = _brotli
+CODECS['gzip'] = _gzip
+
+DEFAULT_LEVELS = {
+    'zstd': 3,
+    'br': 5,
+    'gzip': 6,
+}
+
+
+def get_level(encoding):
+    levels = getattr(settings, 'COMPRESSION_LEVELS', {})
+    return levels.get(encoding, DEFAULT_LEVELS[encoding])
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} for an Accept-Encoding header value."""
+    accepted = {}
+    for part in header.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        coding, _, params = part.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate(header):
+    """Pick the best encoding we support for the given Accept-Encoding, or None."""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for encoding in CODECS:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data, encoding):
+    return CODECS[encoding](data, get_level(encoding))
+
+
+def compress_cached(data, encoding):
+    """
+    Compress ``data`` once and keep the compressed bytes in the cache.
+
+    The key is a digest of the uncompressed body, so a hot response that is
+    rendered again with the same content is served from the cache instead of
+    being compressed a second time.
+    """
+    timeout = getattr(settings, 'COMPRESSION_CACHE_TIMEOUT', 300)
+    if not timeout:
+        return compress(data, encoding)
+
+    digest = hashlib.sha1(data).hexdigest()
+    key = f'compress:{encoding}:{get_level(encoding)}:{digest}'
+    compressed = cache.get(key)
+    record_cache('compression', compressed is not None)
+    if compressed is None:
+        compressed = compress(data, encoding)
+        cache.set(key, compressed, timeout)
+    return compressed
@@ -0,0 +1,254 @@
+"""
+Incremental ("delta") sync of content collections.
+
+``GET /api/sync/`` returns every registered collection the caller may see,
+plus a ``token``. ``GET /api/sync/?changed_since=<token>`` returns only the
+rows created or updated since then (indexed ``updated_at``) and the ids
+deleted since then (``Tombstone`` rows written by a ``pre_delete``
+handler), so a client downloads what changed, not the whole dataset:
+
+    {"token": "...", "next": null, "reset": false,
+     "collections": {"blog.blogpost": {"changed": [...], "deleted": [12, 40]}}}
+
+* Responses hold at most ``SYNC_PAGE_SIZE`` rows. When there are more,
+  ``next`` is a cursor and ``token`` is null: the client requests
+  ``?cursor=<next>`` until ``next`` is null, merging the pages, and keeps the
+  last page's ``token``. Rows saved while it pages are picked up by its next
+  delta.
+
+* Tokens are the sync time minus ``SYNC_OVERLAP`` seconds, so a row saved
+  by a transaction that committed just after the previous sync is not
+  missed; it may arrive twice, and applying it twice is harmless.
+* A row that stopped being visible to anonymous callers (a post turned back
+  into a draft) gets a ``hidden`` tombstone when it is saved, and is
+  reported to them as deleted. Anonymous callers only ever hear about rows
+  they could see: deleting a draft leaves a tombstone only signed-in callers
+  get, so the ids of unpublished content don't leak. Rows hidden by
+  ``QuerySet.update()`` (no signals) are not reported.
+* Tombstones are kept for ``SYNC_TOMBSTONE_RETENTION`` seconds; run
+  ``manage.py prune_tombstones`` from cron (``run_publish_scheduler`` also
+  prunes, hourly). A token older than that gets a full snapshot with
+  ``"reset": true``, and the client should drop what it has.
+* The endpoint is public, so it is throttled (scope ``sync``).
+
+Collections are registered per app (``<app>/sync.py``, imported from the
+app's ``ready()``) with ``SyncCollection``; ``?collections=a,b`` limits the response to some of them.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Tombstone
+from .throttling import PUBLIC_WRITE_THROTTLES
+
+COLLECTIONS = {}
+
+
+def encode_token(moment):
+    return base64.urlsafe_b64encode(f'v1:{int(moment.timestamp() * 1_000_000)}'.encode()).decode().rstrip('=')
+
+
+def decode_token(token):
+    try:
+        version, micros = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode().split(':')
+        if version != 'v1':
+            raise ValueError(version)
+        return datetime.fromtimestamp(int(micros) / 1_000_000, tz=dt_timezone.utc)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError({'changed_since': "Invalid sync token."})
+
+
+def encode_cursor(state):
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """``{'now', 'since', 'reset', 'names', 'after'}`` of the request that started the sync."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if state.get('v') != 1 or not state['names'] or any(name not in COLLECTIONS for name in state['names']):
+            raise ValueError(cursor)
+        return state
+    except (ValueError, KeyError, TypeError, AttributeError, UnicodeDecodeError):
+        raise ValidationError({'cursor': "Invalid sync cursor."})
+
+
+def to_micros(moment):
+    return None if moment is None else int(moment.timestamp() * 1_000_000)
+
+
+def from_micros(micros):
+    return None if micros is None else datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+
+
+class Anonymous:
+    """Stands in for the request of a caller who isn't signed in."""
+    user = AnonymousUser()
+
+
+class SyncCollection:
+    """
+    ``queryset(request)`` gives the rows the caller may see (default: all);
+    it may tell anonymous callers from signed-in ones, nothing finer.
+    ``changed(since)`` gives a ``Q`` for rows that changed, by default
+    ``updated_at >= since``; it can add other reasons a row's visible state
+    changed (a scheduled post going live). ``private`` collections are only
+    listed for authenticated users. ``select_related`` / ``prefetch_related``
+    are applied to the rows the serializer reads.
+    """
+
+    def __init__(self, name, model, serializer_class, queryset=None, changed=None, private=False,
+                 select_related=(), prefetch_related=()):
+        self.name = name
+        self.model = model
+        self.serializer_class = serializer_class
+        self._queryset = queryset
+        self._changed = changed
+        self.private = private
+        self.select_related = select_related
+        self.prefetch_related = prefetch_related
+        COLLECTIONS[name] = self
+        pre_delete.connect(self.record_deletion, sender=model, weak=False, dispatch_uid=f'tombstone-{name}')
+        if queryset:
+            pre_save.connect(self.saving, sender=model, weak=False, dispatch_uid=f'tombstone-{name}-pre-save')
+            post_save.connect(self.saved, sender=model, weak=False, dispatch_uid=f'tombstone-{name}-save')
+
+    def queryset(self, request):
+        return self._queryset(request) if self._queryset else self.model._default_manager.all()
+
+    def changed(self, since):
+        return self._changed(since) if self._changed else Q(updated_at__gte=since)
+
+    def visible_to(self, request):
+        return not self.private or request.user.is_authenticated
+
+    def page(self, request, context, since, after, limit):
+        """
+        Up to ``limit`` rows after primary key ``after``, changed since
+        ``since`` (all of them when None); returns ``(data, last_pk)``,
+        ``last_pk`` being None once the collection is exhausted.
+        """
+        rows = self.queryset(request)
+        if since is not None:
+            rows = rows.filter(self.changed(since))
+        if after is not None:
+            rows = rows.filter(pk__gt=after)
+        rows = list(
+            rows.select_related(*self.select_related).prefetch_related(*self.prefetch_related)
+            .order_by('pk')[:limit + 1]
+        )
+        last_pk = rows[limit - 1].pk if len(rows) > limit else None
+        return self.serializer_class(rows[:limit], many=True, context=context).data, last_pk
+
+    def deleted(self, request, since):
+        tombstones = Tombstone.objects.filter(collection=self.name, deleted_at__gte=since)
+        if not request.user.is_authenticated:
+            tombstones = tombstones.filter(public=True)
+        to_python = self.model._meta.pk.to_python
+        deleted, hidden = set(), set()
+        for object_id, was_hidden in tombstones.values_list('object_id', 'hidden'):
+            (hidden if was_hidden else deleted).add(to_python(object_id))
+        if hidden:
+            # hidden, but visible again (republished) or never hidden from this caller
+            hidden -= set(self.queryset(request).filter(pk__in=hidden).values_list('pk', flat=True))
+        return sorted(deleted | hidden)
+
+    def is_public(self, pk):
+        return not self._queryset or self.queryset(Anonymous).filter(pk=pk).exists()
+
+    def record_deletion(self, sender, instance, **kwargs):
+        # before the delete (in its transaction), while the row can still be checked
+        Tombstone.objects.create(collection=self.name, object_id=str(instance.pk), public=self.is_public(instance.pk))
+
+    def saving(self, sender, instance, raw=False, **kwargs):
+        if not raw and not instance._state.adding:
+            instance._sync_was_public = self.is_public(instance.pk)
+
+    def saved(self, sender, instance, **kwargs):
+        if instance.__dict__.pop('_sync_was_public', False) and not self.is_public(instance.pk):
+            Tombstone.objects.create(collection=self.name, object_id=str(instance.pk), hidden=True)
+
+
+def prune_tombstones(hourly=True):
+    """
+    Delete tombstones past retention; returns how many. With ``hourly``
+    (from a loop) it runs at most once an hour per cache.
+    """
+    if hourly and not cache.add('delta:tombstones-pruned', True, 3600):
+        return 0
+    cutoff = timezone.now() - timedelta(seconds=settings.SYNC_TOMBSTONE_RETENTION)
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+class SyncView(APIView):
+    permission_classes = [AllowAny]
+    throttle_classes = PUBLIC_WRITE_THROTTLES  # per IP and in total, like the public writes
+    throttle_scope = 'sync'
+
+    def get(self, request):
+        cursor = request.query_params.get('cursor')
+        state = decode_cursor(cursor) if cursor else self.start(request)
+        now, since = from_micros(state['now']), from_micros(state['since'])
+
+        context = {'request': request, 'view': self}
+        collections = {}
+        budget = settings.SYNC_PAGE_SIZE
+        names, after = list(state['names']), state['after']
+        while names and budget:
+            collection = COLLECTIONS[names[0]]
+            if not collection.visible_to(request):
+                names.pop(0)
+                continue
+            part = {'changed': [], 'deleted': []}
+            if since is not None and after is None:
+                # once per collection, on the page where it starts
+                part['deleted'] = collection.deleted(request, since)
+            part['changed'], after = collection.page(request, context, since, after, budget)
+            collections[collection.name] = part
+            budget -= len(part['changed'])
+            if after is None:
+                names.pop(0)
+
+        if names:
+            next_cursor = encode_cursor({**state, 'names': names, 'after': after})
+            token = None
+        else:
+            next_cursor = None
+            token = encode_token(now - timedelta(seconds=settings.SYNC_OVERLAP))
+        response = Response({
+            'token': token,
+            'next': next_cursor,
+            'reset': state['reset'],
+            'collections': collections,
+        })
+        response['Cache-Control'] = 'private, no-store'
+        return response
+
+    def start(self, request):
+        now = timezone.now()
+        token = request.query_params.get('changed_since')
+        since = decode_token(token) if token else None
+        reset = since is not None and since < now - timedelta(seconds=settings.SYNC_TOMBSTONE_RETENTION)
+        if reset:
+            since = None
+
+        wanted = request.query_params.get('collections')
+        names = wanted.split(',') if wanted else list(COLLECTIONS)
+        unknown = [name for name in names if name not in COLLECTIONS]
+        if unknown:
+            raise ValidationError({'collections': f"Unknown collection(s): {', '.join(unknown)}"})
+        return {'v': 1, 'now': to_micros(now), 'since': to_micros(since), 'reset': reset,
+                'names': names, 'after': None}
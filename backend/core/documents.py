@@ -0,0 +1,159 @@
+"""
+Materialized profile documents.
+
+A profile is read far more often than it changes, on its own page and
+embedded in every blog post, yet ``ProfileSerializer`` costs a join for the
+resume and a query each for skills, educations and experiences. Instead the
+serialized profile is stored in ``Profile.document`` and rebuilt after
+commit whenever the profile or one of its children is saved or deleted (a
+child moved to another profile rebuilds both), so a read is one primary-key
+lookup of one column.
+
+The document is serialized without a request, so file fields hold
+site-relative URLs; ``render`` makes them absolute for the current request,
+as the live serializer would. Writes that send no signals
+(``QuerySet.update()``, ``bulk_create``) leave the document stale:
+run ``manage.py rebuild_profile_documents`` afterwards. An empty document
+(a row from before the column existed) is built on first read.
+"""
+
+from functools import cache
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import surrogate
+from .models import Profile
+
+CHILD_MODELS = ('core.Skill', 'core.Education', 'core.Experience', 'core.Resume')
+
+
+def build(profile):
+    from .serializers import ProfileSerializer
+
+    return dict(ProfileSerializer(profile).data)
+
+
+def rebuild(profile_id):
+    """Store a fresh document for the profile; returns it, or None if the profile is gone."""
+    with transaction.atomic():
+        # Rebuilds of one profile take turns on its row lock, and each reads the
+        # children only once it holds it: an older render can't be written last.
+        if not list(Profile.objects.select_for_update().filter(pk=profile_id).values_list('pk')):
+            return None
+        profile = (
+            Profile.objects.select_related('resume')
+            .prefetch_related('skills', 'educations', 'experiences')
+            .get(pk=profile_id)
+        )
+        document = build(profile)
+        if document != profile.document:
+            # update() sends no post_save, so this doesn't schedule itself again
+            Profile.objects.filter(pk=profile_id).update(document=document, updated_at=timezone.now())
+            surrogate.purge([f'{surrogate.collection_key(Profile)}:{profile_id}'])
+    return document
+
+
+def schedule(profile_id):
+    if profile_id is not None:
+        transaction.on_commit(lambda: rebuild(profile_id))
+
+
+def connect():
+    from django.apps import apps
+
+    def profile_saved(sender, instance, **kwargs):
+        schedule(instance.pk)
+
+    def child_saving(sender, instance, **kwargs):
+        # a row moved to another profile must leave the old profile's document too
+        if not instance._state.adding:
+            instance._previous_profile_id = (
+                sender._base_manager.filter(pk=instance.pk).values_list('profile_id', flat=True).first()
+            )
+
+    def child_changed(sender, instance, **kwargs):
+        previous = instance.__dict__.pop('_previous_profile_id', None)
+        if previous != instance.profile_id:
+            schedule(previous)
+        schedule(instance.profile_id)
+
+    post_save.connect(profile_saved, sender=Profile, weak=False, dispatch_uid='document-core.profile-save')
+    for label in CHILD_MODELS:
+        model = apps.get_model(label)
+        pre_save.connect(child_saving, sender=model, weak=False, dispatch_uid=f'document-{label}-pre-save')
+        post_save.connect(child_changed, sender=model, weak=False, dispatch_uid=f'document-{label}-save')
+        post_delete.connect(child_changed, sender=model, weak=False, dispatch_uid=f'document-{label}-delete')
+
+
+# -- reading -----------------------------------------------------------
+
+def walk_file_fields(serializer, path=()):
+    for name, field in serializer.fields.items():
+        if isinstance(field, serializers.ListSerializer):
+            yield from walk_file_fields(field.child, path + (name, None))
+        elif isinstance(field, serializers.BaseSerializer):
+            yield from walk_file_fields(field, path + (name,))
+        elif isinstance(field, serializers.FileField):
+            yield path + (name,)
+
+
+@cache
+def file_paths():
+    """Paths to the URLs in a document; ``None`` steps into every item of a list."""
+    from .serializers import ProfileSerializer
+
+    return tuple(walk_file_fields(ProfileSerializer()))
+
+
+def absolutize(value, path, request):
+    if value is None:
+        return None
+    if not path:
+        return request.build_absolute_uri(value)
+    step, rest = path[0], path[1:]
+    if step is None:
+        return [absolutize(item, rest, request) for item in value]
+    if step not in value:
+        return value
+    return {**value, step: absolutize(value[step], rest, request)}
+
+
+def render(document, request=None):
+    if request is not None:
+        for path in file_paths():
+            document = absolutize(document, path, request)
+    return document
+
+
+def render_rows(rows, request=None, keys=None):
+    """
+    ``{pk: document}`` for ``(pk, document)`` rows, in order. Each profile
+    is recorded in the surrogate-key set ``keys``.
+    """
+    label = surrogate.collection_key(Profile)
+    found = {}
+    for pk, document in rows:
+        document = document or rebuild(pk)
+        if document is None:
+            continue
+        found[pk] = render(document, request)
+        if keys is not None:
+            keys.update((label, f'{label}:{pk}'))
+    return found
+
+
+def documents(ids, request=None, keys=None):
+    ids = [pk for pk in ids if pk is not None]
+    if not ids:
+        return {}
+    return render_rows(Profile.objects.filter(pk__in=ids).values_list('pk', 'document'), request, keys)
+
+
+class NestedProfileDocument:
+    """A ``fast_nested`` resolver (see core.fast) that serves the stored documents."""
+
+    def resolve(self, ids, context):
+        return documents(ids, context.get('request'), context.get('surrogate_keys'))
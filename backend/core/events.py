@@ -0,0 +1,123 @@
+"""
+Change events for the admin, delivered over Server-Sent Events.
+
+Model signals ``publish()`` events into the shared cache. Each event gets a
+sequence number from ``cache.incr``, so every worker sees the same ids, and
+a client reconnecting with ``Last-Event-ID`` gets the events it missed while
+they are retained. Inside a worker, a single poller watches the sequence
+counter and wakes every open stream. However many admin tabs are open, the
+cost is one cache read per poll interval and no database queries.
+"""
+
+import asyncio
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+SEQ_KEY = 'events:seq'
+
+
+def event_key(event_id):
+    return f'events:{event_id}'
+
+
+def publish(event_type, data):
+    cache.add(SEQ_KEY, 0, None)
+    try:
+        event_id = cache.incr(SEQ_KEY)
+    except ValueError:
+        cache.set(SEQ_KEY, 1, None)
+        event_id = 1
+    event = {'id': event_id, 'type': event_type, 'data': data}
+    cache.set(event_key(event_id), event, settings.EVENTS_RETENTION)
+    return event
+
+
+def events_after(last_id, latest):
+    first = max(last_id + 1, latest - settings.EVENTS_BACKLOG + 1)
+    keys = [event_key(event_id) for event_id in range(first, latest + 1)]
+    found = cache.get_many(keys)
+    return [found[key] for key in keys if key in found]
+
+
+def format_event(event):
+    # unnamed events, so a plain EventSource.onmessage receives all of them
+    payload = {'type': event['type'], **event['data']}
+    return f"id: {event['id']}\ndata: {json.dumps(payload)}\n\n"
+
+
+class Broadcaster:
+    """One poller per process; every open stream waits on its condition."""
+
+    def __init__(self):
+        self.latest = 0
+        self.listeners = 0
+        self.condition = None
+        self.task = None
+
+    def _ensure_poller(self):
+        if self.task is None or self.task.done():
+            self.condition = asyncio.Condition()
+            self.task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _poll(self):
+        while self.listeners:
+            latest = await cache.aget(SEQ_KEY) or 0
+            if latest != self.latest:
+                self.latest = latest
+                async with self.condition:
+                    self.condition.notify_all()
+            await asyncio.sleep(settings.EVENTS_POLL_INTERVAL)
+
+    async def wait(self, after, timeout):
+        """Wait until an event newer than ``after`` exists (or timeout)."""
+        self._ensure_poller()
+        async with self.condition:
+            try:
+                await asyncio.wait_for(self.condition.wait_for(lambda: self.latest > after), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.latest
+
+    async def stream(self, last_id):
+        self.listeners += 1
+        try:
+            self._ensure_poller()
+            yield 'retry: 3000\n\n'
+            latest = await cache.aget(SEQ_KEY) or 0
+            last_id = min(last_id, latest)  # the cache was flushed since the client's last event
+            while True:
+                if latest > last_id:
+                    for event in await asyncio.to_thread(events_after, last_id, latest):
+                        yield format_event(event)
+                    last_id = latest
+                else:
+                    yield ': keep-alive\n\n'
+                latest = await self.wait(last_id, settings.EVENTS_HEARTBEAT)
+        finally:
+            self.listeners -= 1
+
+
+broadcaster = Broadcaster()
+
+
+def connect_model_events(labels):
+    from django.apps import apps
+
+    def saved(sender, instance, created, **kwargs):
+        label = sender._meta.label_lower
+        data = {'model': label, 'id': instance.pk}
+        transaction.on_commit(lambda: publish(f"{label}.{'created' if created else 'updated'}", data))
+
+    def deleted(sender, instance, **kwargs):
+        label = sender._meta.label_lower
+        data = {'model': label, 'id': instance.pk}
+        transaction.on_commit(lambda: publish(f'{label}.deleted', data))
+
+    for label in labels:
+        model = apps.get_model(label)
+        post_save.connect(saved, sender=model, weak=False, dispatch_uid=f'events-{label}-save')
+        post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=f'events-{label}-delete')
@@ -0,0 +1,132 @@
+"""
+``Idempotency-Key`` support for write endpoints.
+
+A client that times out can resend the same request with the same
+``Idempotency-Key`` header. The first request runs normally and its
+response (anything below 500, validation errors included) is kept in the
+cache for ``IDEMPOTENCY_TTL`` seconds. A resend then gets that stored response back,
+marked ``Idempotent-Replayed: true``, without touching the models (so no
+duplicate rows, signals, purges or events).
+
+* A duplicate that arrives while the first request is still running gets
+  409 at once (with ``Retry-After``) rather than holding a worker while it
+  waits; a request that dies without finishing frees its key after
+  ``IDEMPOTENCY_LOCK_TIMEOUT`` seconds.
+* Reusing a key with a different body gets 422.
+* Keys are scoped to the caller (user, or IP when anonymous), the method
+  and the path.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.files.uploadedfile import UploadedFile
+from django.http import Http404
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+REPLAYED_RESPONSE_HEADERS = ('Location',)
+
+
+def _json_default(value):
+    if isinstance(value, UploadedFile):
+        return f'{value.name}:{value.size}'
+    return str(value)
+
+
+def fingerprint(request):
+    data = request.data
+    if hasattr(data, 'lists'):  # QueryDict from a form/multipart body
+        data = dict(data.lists())
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=_json_default).encode()).hexdigest()
+
+
+def cache_key(request, key):
+    caller = f'user:{request.user.pk}' if request.user.is_authenticated else BaseThrottle().get_ident(request)
+    scope = f'{caller}\x1f{request.method}\x1f{request.path}\x1f{key}'
+    return 'idempotency:' + hashlib.sha256(scope.encode()).hexdigest()
+
+
+def replay(stored):
+    response = Response(stored['data'], status=stored['status'], headers=stored['headers'])
+    response[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def run_idempotent(view, request, handler):
+    key = request.headers.get(HEADER)
+    if not key or getattr(request, '_idempotency_active', False):
+        return handler()
+    if len(key) > 255:
+        return Response({'detail': f"{HEADER} must be at most 255 characters."}, status=status.HTTP_400_BAD_REQUEST)
+
+    result_key = cache_key(request, key)
+    lock_key = result_key + ':lock'
+    request_fingerprint = fingerprint(request)
+
+    stored = cache.get(result_key)
+    if stored is None and not cache.add(lock_key, True, settings.IDEMPOTENCY_LOCK_TIMEOUT):
+        stored = cache.get(result_key)  # finished in between
+        if stored is None:
+            return Response(
+                {'detail': f"A request with this {HEADER} is still being processed."},
+                status=status.HTTP_409_CONFLICT, headers={'Retry-After': '1'},
+            )
+    if stored is not None:
+        if stored['fingerprint'] != request_fingerprint:
+            return Response(
+                {'detail': f"This {HEADER} was already used with a different request body."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        return replay(stored)
+
+    request._idempotency_active = True  # partial_update -> update must not lock again
+    try:
+        try:
+            response = handler()
+        except (APIException, Http404, PermissionDenied) as exc:
+            # a 400 from is_valid(raise_exception=True) is a result too: replay it
+            response = view.handle_exception(exc)
+        if response.status_code < 500:
+            cache.set(result_key, {
+                'fingerprint': request_fingerprint,
+                'status': response.status_code,
+                'data': response.data,
+                'headers': {name: response[name] for name in REPLAYED_RESPONSE_HEADERS if response.has_header(name)},
+            }, settings.IDEMPOTENCY_TTL)
+        return response
+    finally:
+        request._idempotency_active = False
+        cache.delete(lock_key)
+
+
+def idempotent(method):
+    """Honour ``Idempotency-Key`` on a viewset action."""
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        return run_idempotent(self, request, lambda: method(self, request, *args, **kwargs))
+    return wrapper
+
+
+class IdempotencyMixin:
+    """``Idempotency-Key`` on ``create``, ``update`` and ``partial_update``."""
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @idempotent
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @idempotent
+    def partial_update(self, request, *args, **kwargs):
+        return super().partial_update(request, *args, **kwargs)
@@ -0,0 +1,100 @@
+"""
+Image metadata computed once, when a file is uploaded.
+
+For every tracked image field ``<name>`` the model has four companion
+columns, filled in before the row is saved:
+
+* ``<name>_width`` / ``<name>_height``: display size, after EXIF rotation
+* ``<name>_color``: dominant colour as ``#rrggbb``
+* ``<name>_placeholder``: a ~16px WebP as a ``data:`` URI (a few hundred
+  bytes), for a blurred preview that needs no extra request
+
+The frontend can reserve the right box and paint the placeholder while the
+real file loads. ``manage.py backfill_image_metadata`` fills in rows whose
+files were uploaded before this existed.
+"""
+
+import base64
+import io
+
+from django.db.models.signals import pre_save
+from PIL import Image, ImageOps
+
+PLACEHOLDER_SIZE = 16
+COLOR_SAMPLE_SIZE = 64
+METADATA_SUFFIXES = ('width', 'height', 'color', 'placeholder')
+
+# EXIF orientations that swap width and height
+_ROTATED = {5, 6, 7, 8}
+
+# model -> tracked image field names
+TRACKED = {}
+
+
+def describe(fp):
+    """``{'width', 'height', 'color', 'placeholder'}`` for an image file or path."""
+    with Image.open(fp) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in _ROTATED:
+            width, height = height, width
+        # decode JPEGs at a reduced scale; we only need small versions from here on
+        image.draft('RGB', (COLOR_SAMPLE_SIZE * 2, COLOR_SAMPLE_SIZE * 2))
+        small = ImageOps.exif_transpose(image).convert('RGB')
+    small.thumbnail((COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+
+    # most common colour of a 5-colour palette is a better "dominant" colour than the mean
+    palette_image = small.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    palette = palette_image.getpalette()
+    _, index = max(palette_image.getcolors())
+    red, green, blue = palette[index * 3:index * 3 + 3]
+
+    tiny = small.copy()
+    tiny.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = io.BytesIO()
+    tiny.save(buffer, format='WEBP', quality=30)
+
+    return {
+        'width': width,
+        'height': height,
+        'color': f'#{red:02x}{green:02x}{blue:02x}',
+        'placeholder': 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode(),
+    }
+
+
+def empty_metadata():
+    return {'width': None, 'height': None, 'color': '', 'placeholder': ''}
+
+
+def apply_metadata(instance, field_name, metadata):
+    for suffix in METADATA_SUFFIXES:
+        setattr(instance, f'{field_name}_{suffix}', metadata[suffix])
+
+
+def _describe_upload(file):
+    file.seek(0)
+    try:
+        return describe(file)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        # ImageField already validated it; an exotic format Pillow can't thumbnail
+        # just goes without metadata
+        return empty_metadata()
+    finally:
+        file.seek(0)
+
+
+def track_images(model, *field_names):
+    """Fill the companion columns of ``field_names`` whenever a new file is assigned."""
+    TRACKED[model] = field_names
+
+    def fill_metadata(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        for field_name in field_names:
+            file = getattr(instance, field_name)
+            if not file:
+                apply_metadata(instance, field_name, empty_metadata())
+            elif not file._committed:  # a fresh upload, not yet written to storage
+                apply_metadata(instance, field_name, _describe_upload(file.file))
+
+    pre_save.connect(fill_metadata, sender=model, weak=False,
+                     dispatch_uid=f'images-{model._meta.label_lower}')
@@ -0,0 +1,275 @@
+"""
+Bulk content import (``manage.py import_content``).
+
+Sources are streamed one item at a time:
+
+* a directory of Markdown files with a front-matter header
+  (``title``, ``slug``, ``date``, ``category``, ``tags``, ``image``,
+  ``published``, ``link``, ``featured``, ``type``), the body being the
+  post content or portfolio description;
+* NDJSON files, one object per line with the same keys plus ``content``.
+
+Items are keyed by their natural key (a post's slug, a portfolio's title and
+date). Keys already in the database are skipped, so a failed run is resumed
+by running the same command again.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, time as dt_time
+from pathlib import Path
+
+from django.apps import apps
+from django.core.files import File
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.text import slugify
+
+from .images import describe, empty_metadata
+
+MARKDOWN_SUFFIXES = ('.md', '.markdown')
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+
+class ItemError(ValueError):
+    pass
+
+
+# -- reading ----------------------------------------------------------
+
+def parse_scalar(value):
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    if value.startswith('[') and value.endswith(']'):
+        return [parse_scalar(part.strip()) for part in value[1:-1].split(',') if part.strip()]
+    lowered = value.lower()
+    if lowered in ('true', 'yes'):
+        return True
+    if lowered in ('false', 'no'):
+        return False
+    return value
+
+
+def parse_front_matter(text):
+    """``(metadata, body)`` for a document with an optional ``---`` header of ``key: value`` lines."""
+    if not text.startswith('---'):
+        return {}, text
+    header, _, body = text[3:].partition('\n---')
+    metadata = {}
+    for line in header.splitlines():
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        key, separator, value = line.partition(':')
+        if not separator:
+            raise ItemError(f"front matter line without 'key: value': {line.strip()!r}")
+        metadata[key.strip().lower()] = parse_scalar(value.strip())
+    return metadata, body.partition('\n')[2].lstrip('\n')
+
+
+def read_markdown(path):
+    try:
+        metadata, body = parse_front_matter(path.read_text(encoding='utf-8'))
+    except (ItemError, UnicodeDecodeError) as exc:
+        return ItemError(str(exc))
+    metadata.setdefault('content', body)
+    return metadata
+
+
+def is_supported(path):
+    path = Path(path)
+    return path.is_dir() or path.suffix.lower() in MARKDOWN_SUFFIXES + NDJSON_SUFFIXES
+
+
+def read_items(paths):
+    """Yield ``(source, base_dir, item_or_error)`` from files and directories, in a stable order."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            for file in sorted(p for p in path.rglob('*') if p.suffix.lower() in MARKDOWN_SUFFIXES):
+                yield str(file), file.parent, read_markdown(file)
+        elif path.suffix.lower() in MARKDOWN_SUFFIXES:
+            yield str(path), path.parent, read_markdown(path)
+        elif path.suffix.lower() in NDJSON_SUFFIXES:
+            with path.open(encoding='utf-8') as fh:
+                for number, line in enumerate(fh, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        item = json.loads(line)
+                        if not isinstance(item, dict):
+                            raise ValueError("not an object")
+                    except ValueError as exc:
+                        item = ItemError(f"invalid JSON: {exc}")
+                    yield f'{path}:{number}', path.parent, item
+        else:
+            raise ItemError(f"{path}: expected a directory, Markdown or NDJSON file")
+
+
+# -- field conversion -------------------------------------------------
+
+def to_datetime(value):
+    if not value:
+        return timezone.now()
+    moment = parse_datetime(str(value))
+    if moment is None:
+        day = parse_date(str(value))
+        if day is None:
+            raise ItemError(f"invalid date {value!r}")
+        moment = datetime.combine(day, dt_time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def to_date(value):
+    return timezone.localdate(to_datetime(value)) if value else timezone.localdate()
+
+
+def tag_list(value):
+    if isinstance(value, list):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    return [tag.strip() for tag in str(value or '').split(',') if tag.strip()]
+
+
+class TagMap:
+    """Spells each tag the way it was first seen (case-insensitively), existing rows first."""
+
+    def __init__(self, existing=()):
+        self.canonical = {}
+        for tags in existing:
+            self.join(tag_list(tags))
+
+    def join(self, tags, max_length=300):
+        result = []
+        for tag in tags:
+            tag = self.canonical.setdefault(tag.lower(), tag)
+            if tag not in result and len(', '.join(result + [tag])) <= max_length:
+                result.append(tag)
+        return ', '.join(result)
+
+
+# -- images (run in worker processes) ---------------------------------
+
+def init_worker():
+    import django
+    django.setup()
+
+
+def store_image(job):
+    """
+    Copy one image into the field's storage under a content-addressed name
+    and describe it. Returns ``(index, name, metadata, error)``.
+    """
+    index, label, field_name, source = job
+    try:
+        field = apps.get_model(label)._meta.get_field(field_name)
+        with open(source, 'rb') as fh:
+            digest = hashlib.sha1(fh.read()).hexdigest()[:12]
+        stem, suffix = os.path.splitext(os.path.basename(source))
+        name = field.generate_filename(None, f'{slugify(stem)[:60] or "image"}-{digest}{suffix.lower()}')
+        # same content, same name: a resumed run doesn't copy the file again
+        if not field.storage.exists(name):
+            with open(source, 'rb') as fh:
+                name = field.storage.save(name, File(fh), max_length=field.max_length)
+        return index, name, describe(source), None
+    except Exception as exc:  # missing or unreadable file
+        return index, None, None, str(exc)
+
+
+# -- targets ----------------------------------------------------------
+
+class Target:
+    """How items of one ``type`` become model rows."""
+    model_label = None
+    image_field = None
+
+    def __init__(self, profile, tag_map):
+        self.model = apps.get_model(self.model_label)
+        self.profile = profile
+        self.tag_map = tag_map
+        self.seen = self.existing_keys()
+
+    def existing_keys(self):
+        raise NotImplementedError
+
+    def key(self, item):
+        raise NotImplementedError
+
+    def build(self, item, key):
+        raise NotImplementedError
+
+    def apply_image(self, instance, name, metadata):
+        setattr(instance, self.image_field, name or None)
+        for suffix, value in (metadata or empty_metadata()).items():
+            setattr(instance, f'{self.image_field}_{suffix}', value)
+
+
+class PostTarget(Target):
+    model_label = 'blog.BlogPost'
+    image_field = 'featured_image'
+
+    def __init__(self, profile, tag_map):
+        super().__init__(profile, tag_map)
+        category_model = apps.get_model('blog.BlogCategory')
+        self.category_model = category_model
+        self.categories = {name.lower(): pk for pk, name in category_model.objects.values_list('pk', 'name')}
+
+    def existing_keys(self):
+        return set(self.model._base_manager.values_list('slug', flat=True).iterator())
+
+    def key(self, item):
+        if not item.get('title'):
+            raise ItemError("missing title")
+        slug = slugify(item.get('slug') or item['title'])[:200]
+        if not slug:
+            raise ItemError("title gives an empty slug; set 'slug'")
+        return slug
+
+    def category_id(self, name):
+        if not name:
+            return None
+        name = str(name).strip()[:100]
+        if name.lower() not in self.categories:
+            category, _ = self.category_model.objects.get_or_create(name=name)
+            self.categories[name.lower()] = category.pk
+        return self.categories[name.lower()]
+
+    def build(self, item, key):
+        return self.model(
+            profile=self.profile,
+            title=str(item['title'])[:200],
+            slug=key,
+            content=item.get('content') or '',
+            category_id=self.category_id(item.get('category')),
+            tags=self.tag_map.join(tag_list(item.get('tags'))),
+            published_date=to_datetime(item.get('date')),
+            is_published=item.get('published', True) is not False,
+        )
+
+
+class PortfolioTarget(Target):
+    model_label = 'works.Portfolio'
+    image_field = 'image'
+
+    def existing_keys(self):
+        return set(self.model._base_manager.values_list('title', 'date').iterator())
+
+    def key(self, item):
+        if not item.get('title'):
+            raise ItemError("missing title")
+        return str(item['title'])[:200], to_date(item.get('date'))
+
+    def build(self, item, key):
+        title, date = key
+        return self.model(
+            profile=self.profile,
+            title=title,
+            description=item.get('content') or item.get('description') or '',
+            link=item.get('link') or '',
+            date=date,
+            tags=self.tag_map.join(tag_list(item.get('tags'))),
+            is_featured=item.get('featured') is True,
+        )
+
+
+TARGETS = {'post': PostTarget, 'portfolio': PortfolioTarget}
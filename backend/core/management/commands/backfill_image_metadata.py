@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import surrogate
+from core.caching import bump, namespaces_for
+from core.images import METADATA_SUFFIXES, TRACKED, apply_metadata, describe
+
+
+def _describe(args):
+    pk, path = args
+    try:
+        return pk, describe(path), None
+    except Exception as exc:  # missing file, corrupt image, ...
+        return pk, None, str(exc)
+
+
+class Command(BaseCommand):
+    help = "Compute width/height/colour/placeholder for images uploaded before they were stored at upload time"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Recompute rows that already have metadata too")
+        parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows per bulk update")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            for model, field_names in TRACKED.items():
+                for field_name in field_names:
+                    d, f = self.backfill(pool, model, field_name, options)
+                    done += d
+                    failed += f
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {done} images ({failed} failed) in {time.perf_counter() - start:.1f}s"
+        ))
+
+    def backfill(self, pool, model, field_name, options):
+        field = model._meta.get_field(field_name)
+        rows = model._base_manager.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+        if not options['all']:
+            rows = rows.filter(**{f'{field_name}_width__isnull': True})
+        # only the storage name is needed; workers open the files themselves
+        jobs = [(pk, field.storage.path(name)) for pk, name in rows.values_list('pk', field_name).iterator()]
+
+        label = f'{model._meta.label}.{field_name}'
+        columns = [f'{field_name}_{suffix}' for suffix in METADATA_SUFFIXES] + ['updated_at']
+        batch, done, failed = [], 0, 0
+        now = timezone.now()
+        for pk, metadata, error in pool.map(_describe, jobs, chunksize=16):
+            if error:
+                failed += 1
+                self.stderr.write(f"{label} #{pk}: {error}")
+                continue
+            instance = model(pk=pk)
+            apply_metadata(instance, field_name, metadata)
+            instance.updated_at = now  # so delta-sync clients pick up the new fields
+            batch.append(instance)
+            if len(batch) >= options['batch_size']:
+                done += self.save(model, batch, columns)
+                batch = []
+        done += self.save(model, batch, columns)
+        self.stdout.write(f"{label}: {done} updated, {failed} failed")
+        return done, failed
+
+    def save(self, model, batch, columns):
+        """
+        bulk_update skips save(), so neither the pre_save hook runs again nor
+        the post_save handlers: invalidate what they would have, once per batch.
+        """
+        if not batch:
+            return 0
+        model._base_manager.bulk_update(batch, columns)
+        for namespace in namespaces_for(model):
+            bump(namespace)
+        surrogate.purge([surrogate.collection_key(model)] + [surrogate.instance_key(row) for row in batch])
+        return len(batch)
@@ -0,0 +1,64 @@
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from core.typeahead import SOURCES, PrefixIndex, index, rebuild
+
+
+class Command(BaseCommand):
+    help = "Build the autocomplete index and measure lookups, on the database or on generated rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--synthetic', type=int, default=0, metavar='N',
+            help="Index N generated blog posts instead of the database",
+        )
+        parser.add_argument('--lookups', type=int, default=20000, help="Lookups to time")
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        if options['synthetic']:
+            source = SOURCES['blog.blogpost']
+            words = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(3, 10))) for _ in range(5000)]
+            tags = [f'{rng.choice(words)}-{rng.choice(words)}' for _ in range(300)]
+            rows = [
+                {
+                    'pk': pk,
+                    'title': ' '.join(rng.choices(words, k=rng.randint(3, 10))).capitalize(),
+                    'slug': f'post-{pk}',
+                    'tags': ', '.join(rng.sample(tags, 3)),
+                }
+                for pk in range(1, options['synthetic'] + 1)
+            ]
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        if options['synthetic']:
+            # a separate index: the live one never sees the generated rows
+            target = PrefixIndex()
+            source.load(target, rows=lambda: iter(rows))
+            target.keys.sort()
+        else:
+            rebuild()
+            target = index
+        build_time = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        labels = [suggestion['label'] for suggestion in target.entries.values()]
+        queries = []
+        for label in rng.choices(labels, k=options['lookups']) if labels else []:
+            word = rng.choice(label.split() or [label])
+            queries.append(word[:rng.randint(1, 4)])
+
+        start = time.perf_counter()
+        for query in queries:
+            target.search(query)
+        lookup_time = (time.perf_counter() - start) / max(len(queries), 1)
+
+        self.stdout.write(
+            f"{len(target.entries)} suggestions, {len(target.keys)} keys, ~{memory / 2**20:.1f} MiB; "
+            f"built in {build_time:.2f}s, lookup {lookup_time * 1e6:.1f}us"
+        )
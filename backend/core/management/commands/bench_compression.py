@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from core import compression
+
+DEFAULT_PATHS = [
+    '/api/core/profiles/',
+    '/api/works/portfolios/',
+    '/api/works/products/',
+    '/api/blog/posts/',
+    '/api/blog/categories/',
+]
+
+
+class Command(BaseCommand):
+    help = "Measure compression CPU cost against bytes saved for real API responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="API paths to fetch (defaults to the public list endpoints)")
+        parser.add_argument('--repeat', type=int, default=20, help="Compressions per measurement")
+        parser.add_argument('--levels', default='', help="Comma-separated levels to try for every codec, e.g. 1,5,9")
+
+    def handle(self, *args, **options):
+        client = Client(SERVER_NAME='localhost')
+        repeat = options['repeat']
+        levels = [int(level) for level in options['levels'].split(',') if level]
+
+        self.stdout.write(f"codecs available: {', '.join(compression.CODECS)}")
+        self.stdout.write(
+            f"{'path':<28} {'codec':<6} {'lvl':>3} {'raw B':>9} {'out B':>9} "
+            f"{'ratio':>6} {'cpu us':>9} {'us/KB saved':>11} {'hit us':>7}"
+        )
+
+        for path in options['paths'] or DEFAULT_PATHS:
+            response = client.get(path)
+            if response.status_code != 200:
+                self.stderr.write(f"{path}: HTTP {response.status_code}, skipped")
+                continue
+            body = response.content
+
+            for encoding, codec in compression.CODECS.items():
+                for level in levels or [compression.get_level(encoding)]:
+                    self.report(path, body, encoding, codec, level, repeat)
+
+    def report(self, path, body, encoding, codec, level, repeat):
+        start = time.process_time()
+        for _ in range(repeat):
+            out = codec(body, level)
+        cpu_us = (time.process_time() - start) / repeat * 1e6
+
+        # Cost of serving the same body again from the compressed-bytes cache
+        compression.compress_cached(body, encoding)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            compression.compress_cached(body, encoding)
+        hit_us = (time.perf_counter() - start) / repeat * 1e6
+
+        saved_kb = max(len(body) - len(out), 1) / 1024
+        self.stdout.write(
+            f"{path:<28} {encoding:<6} {level:>3} {len(body):>9} {len(out):>9} "
+            f"{len(out) / max(len(body), 1):>6.2f} {cpu_us:>9.0f} {cpu_us / saved_kb:>11.1f} {hit_us:>7.0f}"
+        )
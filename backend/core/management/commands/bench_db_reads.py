@@ -0,0 +1,79 @@
+import multiprocessing
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from blog.models import BlogCategory, BlogPost
+
+
+def _post_list(pks):
+    list(BlogPost.objects.published().select_related('category')[:12])
+
+
+def _post_detail(pks):
+    BlogPost.objects.select_related('category').filter(pk=random.choice(pks)).first()
+
+
+def _category_counts(pks):
+    list(BlogCategory.objects.annotate(
+        post_count=Count('posts', filter=Q(posts__is_published=True, posts__published_date__lte=timezone.now()))
+    ))
+
+
+# the public read paths the API hits most, uncached
+READS = [_post_list, _post_detail, _post_detail, _post_detail, _category_counts]
+
+
+def _worker(args):
+    seconds, pks = args
+    done = 0
+    deadline = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < deadline:
+            for read in READS:
+                read(pks)
+            done += len(READS)
+    finally:
+        connections.close_all()
+    return done
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure read throughput of the configured database with concurrent worker processes. "
+        "Run once per DATABASE_ENGINE (mysql, sqlite) to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4,8', help="Comma-separated worker counts to try")
+        parser.add_argument('--seconds', type=float, default=5, help="Duration of each run")
+
+    def handle(self, *args, **options):
+        pks = list(BlogPost.objects.published().values_list('pk', flat=True))
+        if not pks:
+            raise CommandError("Needs at least one published blog post to read")
+
+        settings_dict = connection.settings_dict
+        self.stdout.write(f"engine: {connection.vendor} ({settings_dict['NAME']})")
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                pragmas = {}
+                for pragma in ('journal_mode', 'synchronous', 'mmap_size', 'busy_timeout'):
+                    cursor.execute(f'PRAGMA {pragma}')
+                    pragmas[pragma] = cursor.fetchone()[0]
+            self.stdout.write("pragmas: " + ', '.join(f'{key}={value}' for key, value in pragmas.items()))
+
+        # children must open their own connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        self.stdout.write(f"{'workers':>7} {'reads':>9} {'reads/s':>9} {'per worker/s':>12}")
+        for workers in [int(n) for n in options['workers'].split(',') if n]:
+            with context.Pool(workers) as pool:
+                start = time.perf_counter()
+                total = sum(pool.map(_worker, [(options['seconds'], pks)] * workers))
+                elapsed = time.perf_counter() - start
+            self.stdout.write(f"{workers:>7} {total:>9} {total / elapsed:>9.0f} {total / elapsed / workers:>12.0f}")
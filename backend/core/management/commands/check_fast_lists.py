@@ -0,0 +1,61 @@
+import contextlib
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from rest_framework.pagination import PageNumberPagination
+
+DEFAULT_PATHS = [
+    '/api/works/portfolios/',
+    '/api/works/products/',
+    '/api/blog/posts/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time fast list serialization against the serializers on this database, checking the output "
+        "is byte-identical (the equivalence tests are in blog/tests.py and works/tests.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="List endpoints to compare (defaults to the opted-in ones)")
+        parser.add_argument('--page-size', type=int, default=0, help="Override PAGE_SIZE for the run")
+        parser.add_argument('--repeat', type=int, default=20, help="Requests per measurement")
+
+    def fetch(self, client, path, fast, page_size, repeat):
+        # PAGE_SIZE is copied onto the paginator class when DRF is imported
+        page = mock.patch.object(PageNumberPagination, 'page_size', page_size) if page_size else contextlib.nullcontext()
+        with override_settings(FAST_LIST_SERIALIZERS=fast), page:
+            response = client.get(path)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                client.get(path)
+            elapsed = (time.perf_counter() - start) / repeat
+        return response, elapsed
+
+    def handle(self, *args, **options):
+        client = Client(SERVER_NAME='localhost')
+        failures = 0
+
+        self.stdout.write(f"{'path':<28} {'rows':>5} {'slow us/row':>11} {'fast us/row':>11} {'speedup':>7}  result")
+        for path in options['paths'] or DEFAULT_PATHS:
+            slow, slow_time = self.fetch(client, path, False, options['page_size'], options['repeat'])
+            fast, fast_time = self.fetch(client, path, True, options['page_size'], options['repeat'])
+            if slow.status_code != 200:
+                self.stderr.write(f"{path}: HTTP {slow.status_code}, skipped")
+                continue
+
+            body = slow.json()
+            rows = max(1, len(body['results'] if isinstance(body, dict) else body))
+            same = slow.content == fast.content and slow.get('Surrogate-Key') == fast.get('Surrogate-Key')
+            failures += not same
+            self.stdout.write(
+                f"{path:<28} {rows:>5} {slow_time / rows * 1e6:>11.1f} {fast_time / rows * 1e6:>11.1f} "
+                f"{slow_time / fast_time:>6.1f}x  {'identical' if same else self.style.ERROR('DIFFERENT')}"
+            )
+
+        if failures:
+            raise CommandError(f"{failures} endpoint(s) differ between fast and serializer output")
+        self.stdout.write(self.style.SUCCESS("All fast list responses match the serializer output"))
@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core.media import referenced_files, walk_media
+
+
+class Command(BaseCommand):
+    help = "Report (or delete with --delete) files in MEDIA_ROOT that no FileField/ImageField references"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help="Delete orphans instead of only listing them")
+        parser.add_argument(
+            '--grace-hours', type=float, default=24,
+            help="Ignore files modified more recently than this (uploads still in flight). Default: 24",
+        )
+        parser.add_argument('--workers', type=int, default=8, help="Threads used to walk MEDIA_ROOT")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        referenced = referenced_files()
+        files = walk_media(settings.MEDIA_ROOT, workers=options['workers'])
+        cutoff = time.time() - options['grace_hours'] * 3600
+
+        orphans = [
+            (name, size) for name, mtime, size in files
+            if name not in referenced and mtime < cutoff
+        ]
+        on_disk = {name for name, _, _ in files}
+        missing = sorted(referenced - on_disk)
+
+        for name, size in orphans:
+            if options['delete']:
+                default_storage.delete(name)
+            self.stdout.write(f"{'deleted' if options['delete'] else 'orphan'}  {name}  ({size} bytes)")
+        for name in missing:
+            self.stdout.write(self.style.WARNING(f"missing  {name}  (referenced but not on disk)"))
+
+        total = sum(size for _, size in orphans)
+        verb = "Deleted" if options['delete'] else "Found"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(orphans)} orphaned files ({total / 1024 / 1024:.1f} MB) out of {len(files)} "
+            f"on disk, {len(referenced)} referenced, in {time.perf_counter() - start:.2f}s"
+        ))
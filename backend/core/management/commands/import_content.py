@@ -0,0 +1,167 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from core import surrogate
+from core.caching import bump
+from core.importer import TARGETS, ItemError, TagMap, init_worker, is_supported, read_items, store_image
+from core.models import Profile
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Import blog posts or portfolio items from Markdown (with front matter) directories "
+        "or NDJSON files. Items already imported are skipped, so re-run to resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="Directories of .md files, .md files or .ndjson files")
+        parser.add_argument('--type', choices=sorted(TARGETS), default='post',
+                            help="Item type when an item has no 'type' key (default: post)")
+        parser.add_argument('--profile', type=int, help="Profile id to attach items to (default: the first)")
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows per transaction")
+        parser.add_argument('--workers', type=int, default=None, help="Image worker processes (default: CPU count)")
+
+    def handle(self, *args, **options):
+        profile = (Profile.objects.filter(pk=options['profile']) if options['profile'] else Profile.objects).first()
+        if profile is None:
+            raise CommandError("No profile to attach the items to. Create one first.")
+        missing = [path for path in options['paths'] if not Path(path).exists()]
+        if missing:
+            raise CommandError(f"Not found: {', '.join(missing)}")
+        unsupported = [path for path in options['paths'] if not is_supported(path)]
+        if unsupported:
+            raise CommandError(
+                f"Expected directories, Markdown (.md) or NDJSON (.ndjson) files: {', '.join(unsupported)}"
+            )
+
+        tag_map = TagMap(
+            tags for label in ('blog.BlogPost', 'works.Portfolio')
+            for tags in apps.get_model(label)._base_manager.exclude(tags='').values_list('tags', flat=True).iterator()
+        )
+        self.targets = {name: target(profile, tag_map) for name, target in TARGETS.items()}
+        self.default_type = options['type']
+        self.counts = {'read': 0, 'imported': 0, 'skipped': 0, 'failed': 0}
+        self.touched = set()
+        self.start = time.perf_counter()
+
+        # spawned, not forked: children must not inherit this process's database connection
+        context = multiprocessing.get_context('spawn')
+        try:
+            with ProcessPoolExecutor(options['workers'], mp_context=context, initializer=init_worker) as pool:
+                pending = None
+                for chunk in chunked(read_items(options['paths']), options['batch_size']):
+                    # the next chunk's images are processed while the current one is written
+                    prepared = self.prepare(pool, chunk)
+                    if pending:
+                        self.write(*pending)
+                    pending = prepared
+                if pending:
+                    self.write(*pending)
+        finally:
+            # chunks committed before a failure are skipped by the resumed run, so
+            # their invalidation can't be left to it
+            self.invalidate()
+        elapsed = time.perf_counter() - self.start
+        self.stdout.write(self.style.SUCCESS(f"Done in {elapsed:.1f}s: {self.summary()}"))
+
+    def fail(self, source, message):
+        self.counts['failed'] += 1
+        self.stderr.write(f"{source}: {message}")
+
+    def prepare(self, pool, chunk):
+        """Validate the chunk and submit its images; returns ``(rows, futures)``."""
+        rows, futures = [], []
+        for source, base_dir, item in chunk:
+            self.counts['read'] += 1
+            try:
+                if isinstance(item, ItemError):
+                    raise item
+                kind = item.get('type') or self.default_type
+                if kind not in self.targets:
+                    raise ItemError(f"unknown type {kind!r}")
+                target = self.targets[kind]
+                key = target.key(item)
+                if key in target.seen:
+                    self.counts['skipped'] += 1
+                    continue
+                instance = target.build(item, key)
+            except ItemError as exc:
+                self.fail(source, exc)
+                continue
+            target.seen.add(key)
+            if item.get('image'):
+                image = base_dir / str(item['image'])
+                futures.append(pool.submit(
+                    store_image, (len(rows), target.model._meta.label, target.image_field, str(image))
+                ))
+            rows.append((source, target, key, instance))
+        return rows, futures
+
+    def write(self, rows, futures):
+        failed = set()
+        for future in futures:
+            index, name, metadata, error = future.result()
+            source, target, key, instance = rows[index]
+            if error:
+                # left out of this run entirely, so running again retries it
+                failed.add(index)
+                target.seen.discard(key)
+                self.fail(source, f"image: {error}")
+            else:
+                target.apply_image(instance, name, metadata)
+
+        by_model = {}
+        for index, (source, target, key, instance) in enumerate(rows):
+            if index not in failed:
+                by_model.setdefault(target.model, []).append(instance)
+        try:
+            with transaction.atomic():
+                for model, instances in by_model.items():
+                    model._base_manager.bulk_create(instances)
+        except DatabaseError as exc:
+            raise CommandError(f"{exc}\n{self.summary()}. Re-run the same command to resume.")
+        for model, instances in by_model.items():
+            self.counts['imported'] += len(instances)
+            self.touched.add(model)  # committed: invalidate() must cover it whatever happens next
+        self.stdout.write(self.summary())
+
+    def summary(self):
+        rate = self.counts['read'] / max(time.perf_counter() - self.start, 1e-9)
+        return (
+            f"{self.counts['read']} read, {self.counts['imported']} imported, "
+            f"{self.counts['skipped']} already imported, {self.counts['failed']} failed ({rate:.0f} items/s)"
+        )
+
+    def invalidate(self):
+        """bulk_create sends no signals: do once what the save handlers would have done per row."""
+        if not self.touched:
+            return
+        from blog.autocomplete import posts as autocomplete_posts
+        from blog.models import BlogPost
+        from blog.related import related_posts
+        from works.autocomplete import portfolios as autocomplete_portfolios
+        from works.related import related_portfolios
+
+        feeds = {
+            BlogPost: ('blog', [related_posts.feed, autocomplete_posts.feed]),
+            apps.get_model('works.Portfolio'): ('works', [related_portfolios.feed, autocomplete_portfolios.feed]),
+        }
+        for model in self.touched:
+            namespace, model_feeds = feeds[model]
+            bump(namespace)
+            for feed in model_feeds:
+                feed.reset()
+        surrogate.purge([surrogate.collection_key(model) for model in self.touched])
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# runs in a fresh interpreter, so every import and lazy initialisation is paid again
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter() - start
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+loaded = time.perf_counter() - start
+from core import warmup
+steps = warmup.warm_up(application) if sys.argv[1] == 'warm' else []
+timings = []
+for path in sys.argv[2:]:
+    first = time.perf_counter()
+    warmup.request(application, path)
+    second = time.perf_counter()
+    warmup.request(application, path)
+    timings.append((path, second - first, time.perf_counter() - second))
+print(json.dumps({'setup': setup, 'loaded': loaded, 'steps': steps, 'timings': timings}))
+"""
+
+
+def parse_importtime(stderr):
+    """Top-level imports (``-X importtime`` lines without nesting) as ``[(seconds, name)]``."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith(' ') or name.startswith('  '):
+            continue  # nested import, already counted in its parent
+        imports.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(imports, reverse=True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile a cold worker: import times, app loading, and the latency of the first and "
+        "second request to each WARMUP_URLS path, with and without core.warmup"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help="Slowest top-level imports to list")
+
+    def run_child(self, mode):
+        env = {**os.environ, 'WARMUP_ON_START': '0'}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', CHILD, mode, *settings.WARMUP_URLS],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr[-2000:])
+        return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def handle(self, *args, **options):
+        cold, stderr = self.run_child('cold')
+        warm, _ = self.run_child('warm')
+
+        imports = parse_importtime(stderr)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Imports ({sum(seconds for seconds, _ in imports) * 1e3:.0f}ms top-level total)"
+        ))
+        for seconds, name in imports[:options['top']]:
+            self.stdout.write(f"  {seconds * 1e3:>8.1f}ms  {name}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Startup"))
+        self.stdout.write(f"  {cold['setup'] * 1e3:>8.1f}ms  django.setup()")
+        self.stdout.write(f"  {cold['loaded'] * 1e3:>8.1f}ms  ... + WSGI application (middleware)")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Warm-up steps"))
+        for name, seconds, detail in warm['steps']:
+            self.stdout.write(f"  {seconds * 1e3:>8.1f}ms  {name} ({detail})")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Requests: first / second, cold vs after warm-up"))
+        for (path, cold_first, cold_second), (_, warm_first, warm_second) in zip(cold['timings'], warm['timings']):
+            self.stdout.write(
+                f"  {path:<40} cold {cold_first * 1e3:>7.1f} / {cold_second * 1e3:>6.1f}ms"
+                f"   warm {warm_first * 1e3:>7.1f} / {warm_second * 1e3:>6.1f}ms"
+            )
+        cold_total = sum(first for _, first, _ in cold['timings'])
+        warm_total = sum(first for _, first, _ in warm['timings'])
+        self.stdout.write(self.style.SUCCESS(
+            f"First requests: {cold_total * 1e3:.0f}ms cold, {warm_total * 1e3:.0f}ms after warm-up"
+        ))
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.delta import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete delta-sync tombstones older than SYNC_TOMBSTONE_RETENTION. "
+        "Run it from cron, e.g. hourly"
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones(hourly=False)
+        days = settings.SYNC_TOMBSTONE_RETENTION / 86400
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones older than {days:g} days"))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.documents import build, rebuild
+from core.models import Profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the stored profile documents, e.g. after changing profiles or their "
+        "skills/educations/experiences/resumes with QuerySet.update() or bulk_create"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help="Profile ids (default: all)")
+        parser.add_argument('--check', action='store_true', help="Only report stale documents; exit 1 if any")
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.order_by('pk')
+        if options['ids']:
+            profiles = profiles.filter(pk__in=options['ids'])
+
+        start = time.perf_counter()
+        stale = []
+        for profile in profiles.select_related('resume').prefetch_related('skills', 'educations', 'experiences'):
+            if build(profile) != profile.document:
+                stale.append(profile.pk)
+                if not options['check']:
+                    rebuild(profile.pk)
+        elapsed = time.perf_counter() - start
+
+        if options['check']:
+            if stale:
+                self.stderr.write(f"Stale documents: {', '.join(map(str, stale))}")
+                raise SystemExit(1)
+            self.stdout.write(self.style.SUCCESS("All profile documents are current"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(stale)} profile documents in {elapsed:.2f}s"))
@@ -0,0 +1,82 @@
+import copy
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.related import INDEXES
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the related-content indexes in this process and report their size and build time. "
+        "Running workers rebuild theirs in the background when they fall behind the change feed; "
+        "this doesn't make them rebuild."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help="Indexes to rebuild (default: all)")
+        parser.add_argument(
+            '--synthetic', type=int, default=0, metavar='N',
+            help="Benchmark the in-memory index over N generated documents instead of the database "
+                 "(build, one incremental update, lookups; no cache or database access)",
+        )
+
+    def handle(self, *args, **options):
+        names = options['names'] or sorted(INDEXES)
+        unknown = set(names) - set(INDEXES)
+        if unknown:
+            raise CommandError(f"Unknown index: {', '.join(sorted(unknown))}. Choose from {', '.join(sorted(INDEXES))}")
+
+        for name in names:
+            index = INDEXES[name]
+            if options['synthetic']:
+                self.benchmark(index, options['synthetic'])
+                continue
+            start = time.perf_counter()
+            index.build()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {index.total_docs} documents, {len(index.postings)} terms in {elapsed:.2f}s"
+            ))
+
+    def benchmark(self, index, count):
+        rng = random.Random(42)
+        vocabulary = [f'term{i}' for i in range(20000)]
+        tags = [f'tag{i}' for i in range(300)]
+        documents = [
+            {
+                'pk': pk,
+                'title': ' '.join(rng.choices(vocabulary[:2000], k=6)),
+                'content': ' '.join(rng.choices(vocabulary, k=150)),
+                'description': '',
+                'tags': ', '.join(rng.sample(tags, 3)),
+                'category_id': rng.randint(1, 20),
+            }
+            for pk in range(1, count + 1)
+        ]
+
+        # a separate instance with the same settings: the live index never sees these
+        bench = copy.copy(index)
+        bench.lock = threading.RLock()
+        bench.clear()
+
+        start = time.perf_counter()
+        bench.build(rows=lambda: iter(documents))
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bench.update(1, documents[0])
+        update_time = time.perf_counter() - start
+
+        lookups = min(count, 10000)
+        start = time.perf_counter()
+        for pk in range(1, lookups + 1):
+            bench.neighbours(pk)
+        lookup_time = (time.perf_counter() - start) / lookups
+
+        self.stdout.write(
+            f"{index.name}: built {count} documents in {build_time:.2f}s, "
+            f"incremental update {update_time * 1e3:.2f}ms, lookup {lookup_time * 1e6:.1f}us"
+        )
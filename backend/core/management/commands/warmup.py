@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the worker warm-up steps in this process and report their timings. "
+        "Useful after a deploy to fill shared caches before traffic arrives."
+    )
+
+    def handle(self, *args, **options):
+        report = warm_up()
+        for name, seconds, detail in report:
+            self.stdout.write(f"{name:<14} {seconds * 1e3:>8.1f}ms  {detail}")
+        total = sum(seconds for _, seconds, _ in report)
+        self.stdout.write(self.style.SUCCESS(f"Warm-up done in {total:.2f}s"))
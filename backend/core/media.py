@@ -0,0 +1,125 @@
+"""
+Helpers for keeping MEDIA_ROOT in step with the FileField/ImageField columns.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+
+def file_fields():
+    """(model, field) for every FileField (ImageField included) in the project."""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+@cache
+def fields_for(model):
+    return [field for file_model, field in file_fields() if file_model is model]
+
+
+def referenced_files(chunk_size=2000):
+    """Set of storage names referenced by any row, read with streamed queries."""
+    names = set()
+    for model, field in file_fields():
+        values = (
+            model._base_manager.exclude(**{field.attname: ''})
+            .exclude(**{f'{field.attname}__isnull': True})
+            .values_list(field.attname, flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+        names.update(values)
+    return names
+
+
+def _walk(root, top):
+    found = []
+    for dirpath, _, filenames in os.walk(top):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # removed while we were walking
+                continue
+            found.append((os.path.relpath(path, root).replace(os.sep, '/'), stat.st_mtime, stat.st_size))
+    return found
+
+
+def walk_media(root=None, workers=8):
+    """
+    List (name, mtime, size) for every file under MEDIA_ROOT. Each top-level
+    directory is walked in its own thread (the work is mostly stat() calls).
+    """
+    root = str(root or settings.MEDIA_ROOT)
+    if not os.path.isdir(root):
+        return []
+    files = []
+    subdirs = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                stat = entry.stat()
+                files.append((entry.name, stat.st_mtime, stat.st_size))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for found in pool.map(lambda top: _walk(root, top), subdirs):
+            files.extend(found)
+    return files
+
+
+def is_referenced(name):
+    for model, field in file_fields():
+        if model._base_manager.filter(**{field.attname: name}).exists():
+            return True
+    return False
+
+
+def delete_if_orphaned(storage, name):
+    if name and not is_referenced(name):
+        storage.delete(name)
+
+
+# -- optional cleanup when a file is replaced or its row deleted ---------
+
+def _remember_old_files(sender, instance, raw=False, **kwargs):
+    fields = fields_for(sender)
+    if raw or not fields or instance.pk is None:
+        return
+    old = sender._base_manager.filter(pk=instance.pk).values(*[f.attname for f in fields]).first()
+    instance._old_files = old or {}
+
+
+def _delete_replaced_files(sender, instance, created, raw=False, **kwargs):
+    old = getattr(instance, '_old_files', None)
+    if raw or created or not old:
+        return
+    for field in fields_for(sender):
+        previous = old.get(field.attname)
+        current = getattr(instance, field.attname)
+        if previous and previous != (current.name if current else ''):
+            transaction.on_commit(lambda storage=field.storage, name=previous: delete_if_orphaned(storage, name))
+
+
+def _delete_row_files(sender, instance, **kwargs):
+    for field in fields_for(sender):
+        current = getattr(instance, field.attname)
+        if current:
+            transaction.on_commit(lambda storage=field.storage, name=current.name: delete_if_orphaned(storage, name))
+
+
+def connect_file_cleanup():
+    for model in {model for model, _ in file_fields()}:
+        label = model._meta.label_lower
+        pre_save.connect(_remember_old_files, sender=model, dispatch_uid=f'media-{label}-pre-save')
+        post_save.connect(_delete_replaced_files, sender=model, dispatch_uid=f'media-{label}-save')
+        post_delete.connect(_delete_row_files, sender=model, dispatch_uid=f'media-{label}-delete')
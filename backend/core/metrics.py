@@ -0,0 +1,257 @@
+"""
+Prometheus-style metrics without a client library.
+
+Each process keeps its counters, gauges and histograms in memory. When
+``METRICS_DIR`` is set, the process also writes a snapshot to
+``METRICS_DIR/<pid>.json`` at most every ``METRICS_WRITE_INTERVAL`` seconds
+(atomically, via ``os.replace``). ``/metrics`` sums the snapshots of every
+worker, so any worker can answer a scrape:
+
+* counters and histograms of exited workers are kept, so totals never go
+  backwards; clear the directory when the service is (re)deployed;
+* gauges (requests in flight) only count workers that are still alive.
+
+Without ``METRICS_DIR`` only the scraped process is reported, which is
+fine for ``runserver`` and single-process servers.
+"""
+
+import atexit
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# name -> (type, help)
+METRICS = {
+    'http_requests_total': ('counter', "Requests handled, by route, method and status"),
+    'http_request_duration_seconds': ('histogram', "Time spent in Django per request, by route and method"),
+    'http_requests_in_flight': ('gauge', "Requests currently being handled"),
+    'http_request_db_queries': ('histogram', "Database queries per request, by route"),
+    'db_connections_opened_total': ('counter', "Database connections opened, by alias"),
+    'cache_requests_total': ('counter', "Application cache lookups, by cache and result (hit/miss)"),
+    'http_requests_shed_total': ('counter', "Requests answered by load shedding, by reason"),
+}
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.gauges = defaultdict(float)
+        self.histograms = {}
+        self.last_write = 0.0
+
+    def inc(self, name, labels=(), amount=1):
+        with self.lock:
+            self.counters[name, labels] += amount
+
+    def add(self, name, labels=(), amount=1):
+        with self.lock:
+            self.gauges[name, labels] += amount
+
+    def observe(self, name, labels, value, buckets):
+        with self.lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[name, labels] = {
+                    'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0,
+                }
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['counts'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'pid': os.getpid(),
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in self.gauges.items()],
+                'histograms': [
+                    [name, labels, dict(h, counts=list(h['counts']))]
+                    for (name, labels), h in self.histograms.items()
+                ],
+            }
+
+
+registry = Registry()
+
+
+def labels(**values):
+    return tuple(sorted(values.items()))
+
+
+def record_cache(cache_name, hit):
+    registry.inc('cache_requests_total', labels(cache=cache_name, result='hit' if hit else 'miss'))
+
+
+def _connection_opened(sender, connection, **kwargs):
+    registry.inc('db_connections_opened_total', labels(alias=connection.alias))
+
+
+connection_created.connect(_connection_opened, dispatch_uid='metrics-connection-created')
+
+
+# -- sharing between worker processes --------------------------------------
+
+def write_snapshot(force=False):
+    directory = getattr(settings, 'METRICS_DIR', '')
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - registry.last_write < getattr(settings, 'METRICS_WRITE_INTERVAL', 1):
+        return
+    registry.last_write = now
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as fh:
+        json.dump(registry.snapshot(), fh)
+    os.replace(tmp, os.path.join(directory, f'{os.getpid()}.json'))
+
+
+atexit.register(write_snapshot, force=True)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_snapshots():
+    directory = getattr(settings, 'METRICS_DIR', '')
+    if not directory:
+        return [registry.snapshot()]
+    write_snapshot(force=True)
+    snapshots = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            with open(entry.path) as fh:
+                snapshots.append(json.load(fh))
+        except (OSError, ValueError):  # replaced or half-written by a dying worker
+            continue
+    return snapshots
+
+
+def collect():
+    counters = defaultdict(float)
+    gauges = defaultdict(float)
+    histograms = {}
+    for snapshot in read_snapshots():
+        alive = snapshot['pid'] == os.getpid() or _alive(snapshot['pid'])
+        for name, label_pairs, value in snapshot['counters']:
+            counters[name, tuple(map(tuple, label_pairs))] += value
+        if alive:
+            for name, label_pairs, value in snapshot['gauges']:
+                gauges[name, tuple(map(tuple, label_pairs))] += value
+        for name, label_pairs, h in snapshot['histograms']:
+            key = (name, tuple(map(tuple, label_pairs)))
+            total = histograms.setdefault(key, {'buckets': h['buckets'], 'counts': [0] * len(h['buckets']),
+                                                'sum': 0.0, 'count': 0})
+            total['counts'] = [a + b for a, b in zip(total['counts'], h['counts'])]
+            total['sum'] += h['sum']
+            total['count'] += h['count']
+    return counters, gauges, histograms
+
+
+# -- text exposition format ------------------------------------------------
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _series(name, label_pairs, value):
+    if label_pairs:
+        rendered = ','.join(f'{key}="{_escape(val)}"' for key, val in label_pairs)
+        name = f'{name}{{{rendered}}}'
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return f'{name} {value!r}'
+
+
+def render():
+    counters, gauges, histograms = collect()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            lines.extend(_series(name, pairs, value) for (n, pairs), value in sorted(counters.items()) if n == name)
+        elif kind == 'gauge':
+            series = [(pairs, value) for (n, pairs), value in sorted(gauges.items()) if n == name]
+            lines.extend(_series(name, pairs, value) for pairs, value in series or [((), 0.0)])
+        else:
+            for (n, pairs), h in sorted(histograms.items()):
+                if n != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(h['buckets'], h['counts']):
+                    cumulative += count
+                    lines.append(_series(f'{name}_bucket', pairs + (('le', f'{bound:g}'),), cumulative))
+                lines.append(_series(f'{name}_bucket', pairs + (('le', '+Inf'),), h['count']))
+                lines.append(_series(f'{name}_sum', pairs, float(h['sum'])))
+                lines.append(_series(f'{name}_count', pairs, h['count']))
+    return '\n'.join(lines) + '\n'
+
+
+# -- request instrumentation -------------------------------------------------
+
+def route_of(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unmatched>'
+    # DRF router patterns are regexes; drop the anchors for readability
+    return '/' + re.sub(r'(^|/)\^', r'\1', match.route).replace('$', '')
+
+
+class MetricsMiddleware:
+    """
+    Times every request and counts its database queries. Put it first in
+    MIDDLEWARE so the time spent in the other middleware is included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        registry.add('http_requests_in_flight')
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(count_queries):
+                response = self.get_response(request)
+        finally:
+            registry.add('http_requests_in_flight', amount=-1)
+        duration = time.perf_counter() - start
+
+        route = route_of(request)
+        registry.inc('http_requests_total', labels(route=route, method=request.method, status=response.status_code))
+        registry.observe('http_request_duration_seconds', labels(route=route, method=request.method),
+                         duration, LATENCY_BUCKETS)
+        registry.observe('http_request_db_queries', labels(route=route), queries, QUERY_BUCKETS)
+        write_snapshot()
+        return response
@@ -0,0 +1,58 @@
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from . import compression
+
+re_compressible_type = re.compile(r'^(application/(json|xml|rss\+xml|atom\+xml|javascript)|text/)')
+
+
+class CompressionMiddleware:
+    """
+    Compress API responses with the best encoding the client accepts
+    (zstd, br or gzip). Small bodies are left alone, and compressed bytes
+    are reused from the cache for identical bodies.
+
+    Place it above any middleware that reads or rewrites the response body.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if not self.should_compress(request, response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressed = compression.compress_cached(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+
+        # A strong ETag no longer matches the transferred bytes
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+    def should_compress(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return False
+        if response.status_code != 200:
+            return False
+        if len(response.content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 512):
+            return False
+        if not re_compressible_type.match(response.get('Content-Type', '')):
+            return False
+        excluded = getattr(settings, 'COMPRESSION_EXCLUDE_PATHS', ())
+        return not any(request.path.startswith(prefix) for prefix in excluded)
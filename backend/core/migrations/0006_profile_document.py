@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_updated_at_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='document',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
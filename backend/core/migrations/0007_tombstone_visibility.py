@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_profile_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tombstone',
+            name='hidden',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='public',
+            field=models.BooleanField(default=True),
+        ),
+    ]
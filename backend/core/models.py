@@ -11,6 +11,8 @@ class Profile(models.Model):
     specialization = models.CharField(max_length=200, default="Global Health, Internal Medicine, Medical Education")
     linkedin_url = models.URLField(blank=True, default="https://www.linkedin.com/in/olana-wakoya-gichile-a02483168")
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
+    document = models.JSONField(default=dict, blank=True, editable=False)  # serialized profile (core.documents)
 
     def __str__(self):
         return self.full_name
@@ -34,6 +36,7 @@ class Skill(models.Model):
         default='clinical'
     )
     proficiency = models.CharField(max_length=50, blank=True)  # e.g., Expert, Advanced
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
 
     def __str__(self):
         return f"{self.name} ({self.category})"
@@ -50,6 +53,7 @@ class Education(models.Model):
     start_year = models.PositiveIntegerField()
     end_year = models.PositiveIntegerField(blank=True, null=True)
     description = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
 
     def __str__(self):
         return f"{self.degree} - {self.institution}"
@@ -65,6 +69,7 @@ class Experience(models.Model):
     end_date = models.DateField(blank=True, null=True)
     description = models.TextField(blank=True)
     is_current = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
 
     def __str__(self):
         return f"{self.position} at {self.organization}"
@@ -77,7 +82,24 @@ class Resume(models.Model):
     profile = models.OneToOneField(Profile, on_delete=models.CASCADE, related_name='resume')
     pdf_file = models.FileField(upload_to='resumes/', blank=True, null=True)
     external_url = models.URLField(blank=True, help_text="Or link to external resume (e.g., Google Drive, LinkedIn)")
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
 
     def __str__(self):
-        return f"Resume for {self.profile.full_name}"
\ No newline at end of file
+        return f"Resume for {self.profile.full_name}"
+
+class Tombstone(models.Model):
+    """A deleted row, kept for a while so delta-sync clients learn about the deletion."""
+    collection = models.CharField(max_length=100)  # model label, e.g. 'blog.blogpost'
+    object_id = models.CharField(max_length=64)
+    deleted_at = models.DateTimeField(default=timezone.now)
+    public = models.BooleanField(default=True)   # anonymous callers could see the row until then
+    hidden = models.BooleanField(default=False)  # not deleted, only withdrawn from anonymous callers
+
+    def __str__(self):
+        return f"{self.collection}:{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['collection', 'deleted_at'], name='tombstone_collection_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),  # pruning
+        ]
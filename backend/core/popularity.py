@@ -0,0 +1,134 @@
+"""
+Write-behind view counters and precomputed "most read" rankings.
+
+A view is counted at most once per visitor per ``VIEW_DEDUP_WINDOW`` (a
+``cache.add`` on a per-visitor key). Anonymous visitors are told apart by
+client IP only (``REMOTE_ADDR``, or as many ``X-Forwarded-For`` hops as
+``NUM_PROXIES`` trusts), never by headers a client picks itself; the
+endpoints are also throttled (scope ``views``), so a loop can't inflate
+the ranking. Accepted views are summed in a
+per-process buffer and written at most every ``VIEW_FLUSH_INTERVAL`` seconds
+with one ``UPDATE ... SET view_count = view_count + n WHERE id IN (...)`` per
+distinct increment, so a burst of traffic on one post costs one row update
+instead of one per request. A worker killed without a clean exit loses at
+most one interval of views.
+
+After each flush the top ``POPULAR_SIZE`` ids are recomputed (a short scan
+of the ``view_count`` index) and stored in the shared cache, which is what
+the ``popular`` endpoints serve. Their responses carry the
+``<label>:popular`` surrogate key, purged whenever the ranking changes.
+"""
+
+import atexit
+import hashlib
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import F
+from rest_framework.throttling import BaseThrottle
+
+from .surrogate import purge
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = {}
+
+
+def visitor_id(request):
+    if request.user.is_authenticated:
+        ident = f'user:{request.user.pk}'
+    else:
+        ident = BaseThrottle().get_ident(request)
+    return hashlib.sha1(ident.encode()).hexdigest()
+
+
+class ViewCounter:
+    """
+    ``queryset`` is a callable returning the rows that may be ranked (e.g.
+    only published posts); ``size`` defaults to ``settings.POPULAR_SIZE``.
+    """
+
+    def __init__(self, name, model, queryset, size=None):
+        self.name = name
+        self.model = model
+        self.queryset = queryset
+        self.size = size
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._timer = None
+        COUNTERS[name] = self
+        atexit.register(self.flush)
+
+    @property
+    def ranking_key(self):
+        return f'popular:{self.name}'
+
+    @property
+    def surrogate_key(self):
+        return f'{self.name}:popular'
+
+    def record(self, request, pk):
+        """Count a view of ``pk``; returns False if this visitor was already counted."""
+        seen_key = f'views:{self.name}:{pk}:{visitor_id(request)}'
+        if not cache.add(seen_key, 1, settings.VIEW_DEDUP_WINDOW):
+            return False
+        with self._lock:
+            self._pending[pk] += 1
+            if self._timer is None:
+                self._timer = threading.Timer(settings.VIEW_FLUSH_INTERVAL, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        return True
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            connections.close_all()  # only this thread's connections
+
+    def flush(self):
+        """Write buffered views to the database; returns how many were written."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+
+        by_increment = defaultdict(list)
+        for pk, count in pending.items():
+            by_increment[count].append(pk)
+        try:
+            for count, pks in by_increment.items():
+                self.model._base_manager.filter(pk__in=sorted(pks)).update(view_count=F('view_count') + count)
+            self.refresh_ranking()
+        except Exception:
+            # keep the views for the next flush rather than dropping them
+            logger.exception("Could not flush %s view counts", self.name)
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+        return sum(pending.values())
+
+    def refresh_ranking(self):
+        ids = list(
+            self.queryset().filter(view_count__gt=0)
+            .order_by('-view_count', '-pk')
+            .values_list('pk', flat=True)[:self.size or settings.POPULAR_SIZE]
+        )
+        previous = cache.get(self.ranking_key)
+        cache.set(self.ranking_key, ids, None)
+        if previous is not None and previous != ids:
+            purge([self.surrogate_key])
+        return ids
+
+    def popular_ids(self):
+        ids = cache.get(self.ranking_key)
+        if ids is None:
+            ids = self.refresh_ranking()
+        return ids
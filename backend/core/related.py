@@ -0,0 +1,259 @@
+"""
+In-process "related content" index.
+
+Each document is reduced to a short TF-IDF signature (its strongest terms).
+Signatures are kept in an inverted index whose posting lists are capped to
+the heaviest entries, and every document's top-k neighbours are precomputed
+by accumulating dot products over those postings. A lookup is then a dict
+access.
+
+When one row changes, only that row and the documents that share terms with
+it are rescored. IDF values are not recomputed on incremental updates, so
+they drift slightly until the next full rebuild.
+
+Full rebuilds (a cold worker, a gap in the change feed) never run inside a
+request: they are built into a fresh copy on a background thread and swapped
+in when complete. Until then lookups get the previous neighbours, or none.
+A build is pure Python and linear in the corpus: ``manage.py
+rebuild_related_index --synthetic 100000`` takes about 2.5 minutes (20k
+documents, about 20s).
+``core.warmup`` starts every build as a worker boots.
+"""
+
+import copy
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .changefeed import BackgroundBuild, ChangeFeed
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been but by can could did do does for from had has
+have he her his how i if in into is it its more most my no not of on or our out over she so some
+than that the their them then there these they this those through to up us was we were what when
+where which who will with would you your
+""".split())
+
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 2 and token not in STOPWORDS
+    ]
+
+
+def split_tags(tags):
+    return [tag.strip().lower() for tag in (tags or '').split(',') if tag.strip()]
+
+
+# name -> RelatedIndex, filled in as apps define their indexes
+INDEXES = {}
+
+
+class RelatedIndex:
+    """
+    ``queryset`` is a callable returning the rows that may be recommended,
+    ``fields`` the columns passed to ``terms(row)``, which returns a Counter
+    of weighted term frequencies for one row.
+    """
+
+    def __init__(self, name, model, queryset, fields, terms,
+                 top_k=6, signature_size=16, posting_limit=100):
+        self.name = name
+        self.model = model
+        self.queryset = queryset
+        self.fields = fields
+        self.terms = terms
+        self.top_k = top_k
+        self.signature_size = signature_size
+        self.posting_limit = posting_limit
+        self.feed = ChangeFeed(f'related:{name}')
+        self.lock = threading.RLock()
+        self.generation = None
+        self.background = BackgroundBuild(f'related index {name}', self.build)
+        self.clear()
+        INDEXES[name] = self
+
+    @property
+    def ready(self):
+        return self.generation is not None
+
+    def clear(self):
+        self.total_docs = 0
+        self.df = Counter()
+        self.vectors = {}      # pk -> {term: weight}
+        self.postings = {}     # term -> {pk: weight}
+        self.related = {}      # pk -> [(score, pk), ...] best first
+        self.referrers = {}    # pk -> set of pks listing it as related
+        self.dirty = set()
+
+    # -- building -----------------------------------------------------
+
+    def rows(self, **filters):
+        return self.queryset().filter(**filters).values('pk', *self.fields).iterator(chunk_size=2000)
+
+    def build(self, rows=None):
+        """
+        Rebuild from scratch into a copy, then swap it in; lookups go on
+        using the current data meanwhile. Rows are streamed twice: once for
+        document frequencies, once for the signatures.
+        """
+        generation = self.feed.current()
+        fresh = copy.copy(self)  # same settings; clear() gives it its own data
+        fresh.clear()
+        for row in (rows() if rows else fresh.rows()):
+            fresh.total_docs += 1
+            fresh.df.update(fresh.terms(row).keys())
+
+        for row in (rows() if rows else fresh.rows()):
+            fresh.vectors[row['pk']] = fresh.vectorize(row)
+
+        for pk, vector in fresh.vectors.items():
+            for term, weight in vector.items():
+                fresh.postings.setdefault(term, {})[pk] = weight
+        for term, posting in fresh.postings.items():
+            if len(posting) > fresh.posting_limit:
+                fresh.postings[term] = dict(heapq.nlargest(
+                    fresh.posting_limit, posting.items(), key=lambda item: item[1]
+                ))
+
+        for pk in fresh.vectors:
+            fresh.rescore(pk)
+
+        with self.lock:
+            for name in ('total_docs', 'df', 'vectors', 'postings', 'related', 'referrers', 'dirty'):
+                setattr(self, name, getattr(fresh, name))
+            # changes recorded since ``generation`` are replayed by the next sync()
+            self.generation = generation
+
+    def vectorize(self, row):
+        counts = self.terms(row)
+        n = self.total_docs or 1
+        weights = {
+            term: (1 + math.log(tf)) * (math.log((1 + n) / (1 + self.df.get(term, 1))) + 1)
+            for term, tf in counts.items() if tf > 0
+        }
+        strongest = heapq.nlargest(self.signature_size, weights.items(), key=lambda item: item[1])
+        norm = math.sqrt(sum(weight * weight for _, weight in strongest)) or 1.0
+        return {term: weight / norm for term, weight in strongest}
+
+    def candidates(self, pk):
+        scores = Counter()
+        for term, weight in self.vectors[pk].items():
+            for other, other_weight in self.postings.get(term, {}).items():
+                if other != pk:
+                    scores[other] += weight * other_weight
+        return scores
+
+    def rescore(self, pk):
+        for _, old in self.related.get(pk, ()):
+            self.referrers.get(old, set()).discard(pk)
+        best = heapq.nlargest(self.top_k, ((score, other) for other, score in self.candidates(pk).items()))
+        self.related[pk] = best
+        for _, other in best:
+            self.referrers.setdefault(other, set()).add(pk)
+        self.dirty.discard(pk)
+
+    def similarity(self, a, b):
+        va, vb = self.vectors[a], self.vectors[b]
+        if len(va) > len(vb):
+            va, vb = vb, va
+        return sum(weight * vb.get(term, 0.0) for term, weight in va.items())
+
+    # -- incremental updates ------------------------------------------
+
+    def remove(self, pk):
+        vector = self.vectors.pop(pk, None)
+        if vector is None:
+            return
+        self.total_docs -= 1
+        for term in vector:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(pk, None)
+        for _, other in self.related.pop(pk, ()):
+            self.referrers.get(other, set()).discard(pk)
+        # documents that listed pk need a fresh neighbour list
+        self.dirty.update(self.referrers.pop(pk, set()))
+        self.dirty.discard(pk)
+
+    def update(self, pk, row):
+        self.remove(pk)
+        if row is None:
+            return
+        self.total_docs += 1
+        vector = self.vectorize(row)
+        self.vectors[pk] = vector
+
+        touched = set()
+        for term, weight in vector.items():
+            posting = self.postings.setdefault(term, {})
+            if len(posting) >= self.posting_limit:
+                weakest = min(posting, key=posting.get)
+                if posting[weakest] >= weight:
+                    continue
+                del posting[weakest]
+            posting[pk] = weight
+            touched.update(posting)
+        touched.discard(pk)
+
+        self.rescore(pk)
+        for other in touched:
+            if other in self.dirty:
+                continue
+            score = self.similarity(pk, other)
+            best = self.related.get(other, [])
+            if len(best) >= self.top_k and score <= best[-1][0]:
+                continue
+            best = sorted(best + [(score, pk)], reverse=True)
+            for _, dropped in best[self.top_k:]:
+                self.referrers.get(dropped, set()).discard(other)
+            self.related[other] = best[:self.top_k]
+            self.referrers.setdefault(pk, set()).add(other)
+
+    def sync(self):
+        """Bring this process up to date with changes made anywhere."""
+        with self.lock:
+            if self.generation is None:
+                self.background.start()
+                return
+            generation, changed = self.feed.since(self.generation)
+            if changed is None:
+                self.background.start()
+                return
+            if changed:
+                rows = {row['pk']: row for row in self.rows(pk__in=changed)}
+                for pk in changed:
+                    self.update(pk, rows.get(pk))
+            self.generation = generation
+
+    # -- lookups ------------------------------------------------------
+
+    def related_ids(self, pk):
+        with self.lock:
+            self.sync()
+            return self.neighbours(pk)
+
+    def neighbours(self, pk):
+        """``pk``'s related ids from the data in memory, without catching up first."""
+        with self.lock:
+            if pk in self.dirty:
+                self.rescore(pk)
+            return [other for _, other in self.related.get(pk, ())]
+
+    # -- signals ------------------------------------------------------
+
+    def connect(self):
+        post_save.connect(self._changed, sender=self.model, dispatch_uid=f'related-{self.name}-save')
+        post_delete.connect(self._changed, sender=self.model, dispatch_uid=f'related-{self.name}-delete')
+
+    def _changed(self, sender, instance, **kwargs):
+        pk = instance.pk
+        transaction.on_commit(lambda: self.feed.record(pk))
@@ -1,33 +1,35 @@
 from rest_framework import serializers
 from .models import Profile, Skill, Education, Experience, Resume
 from django.contrib.auth.models import User
+from .documents import documents
+from .surrogate import SurrogateKeySerializerMixin
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = ['id', 'name', 'category', 'proficiency', 'profile']   # ← add profile here
         read_only_fields = ['profile']   # ← important: client cannot send it
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Education
         fields = ['id', 'institution', 'degree', 'start_year', 'end_year', 'description', 'profile']
         read_only_fields = ['profile']   # ← prevent frontend from sending it
 
-class ExperienceSerializer(serializers.ModelSerializer):
+class ExperienceSerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Experience
         fields = ['id', 'organization', 'position', 'start_date', 'end_date', 'description', 'is_current', 'profile']
         read_only_fields = ['profile']
 
-class ResumeSerializer(serializers.ModelSerializer):
+class ResumeSerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Resume
         fields = ['id', 'profile', 'pdf_file', 'external_url', 'updated_at']
         read_only_fields = ['profile', 'updated_at']
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     skills = SkillSerializer(many=True, read_only=True)
     educations = EducationSerializer(many=True, read_only=True)
     experiences = ExperienceSerializer(many=True, read_only=True)
@@ -42,6 +44,27 @@ class ProfileSerializer(serializers.ModelSerializer):
         ]
 
 
+class ProfileDocumentField(serializers.Field):
+    """
+    A related profile, read from its stored document (core/documents.py)
+    instead of serializing it again. Each profile is looked up once per
+    response, by primary key.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return getattr(instance, f'{self.source}_id')
+
+    def to_representation(self, profile_id):
+        found = self.context.setdefault('profile_documents', {})
+        if profile_id not in found:
+            found.update(documents([profile_id], self.context.get('request'), self.context.get('surrogate_keys')))
+        return found.get(profile_id)
+
+
 
 
 
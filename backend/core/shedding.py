@@ -0,0 +1,225 @@
+"""
+Load shedding.
+
+When a worker is overloaded, queueing every request behind the slow ones
+only makes all of them time out. ``LoadSheddingMiddleware`` watches three
+signals:
+
+* requests in flight in this process (threaded and ASGI workers);
+* time spent queued before Django saw the request, from the proxy's
+  ``X-Request-Start`` header (``t=<seconds|ms|us>``, nginx / Heroku style);
+* database query latency, averaged over recent queries. Django keeps no
+  MySQL connection pool whose saturation could be read directly, so a
+  saturated database shows up as slow queries instead.
+
+Over a threshold the worker is *overloaded*:
+
+* public GETs get the last good copy of their response for the same host
+  and URL (kept for ``SHED_STALE_TTL`` seconds, marked
+  ``X-Load-Shed: stale``) if there is one;
+* ``SHED_LOW_PRIORITY_PATHS`` (registration, batches, full syncs) get 503
+  with ``Retry-After``, and so do the admin's read-only pages (index,
+  changelists, history) when ``SHED_ADMIN_READS`` is set. Its login and its
+  add/change/delete forms are never low priority;
+* everything else still runs, unless the overload is ``SHED_SEVERE_FACTOR``
+  times over the thresholds, where it gets 503 too.
+
+Independently of load, a request whose client has already given up is not
+run. The client sends ``X-Request-Timeout`` (milliseconds it will wait);
+if less than ``SHED_MIN_REMAINING`` seconds of that are left when the
+request reaches Django, it gets 503.
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse, JsonResponse
+from django.urls import Resolver404, resolve
+
+from .metrics import labels, registry
+
+STALE_HEADERS = ('Content-Type', 'Vary', 'ETag', 'Last-Modified')
+
+
+class DecayingAverage:
+    """Moving average of recent samples that falls back to zero when no samples arrive."""
+
+    def __init__(self, half_life=5.0, weight=0.1):
+        self.half_life = half_life
+        self.weight = weight
+        self.value = 0.0
+        self.updated = time.monotonic()
+
+    def current(self):
+        age = time.monotonic() - self.updated
+        return self.value * 0.5 ** (age / self.half_life)
+
+    def add(self, sample):
+        # races between threads only lose a sample
+        self.value = self.current() * (1 - self.weight) + sample * self.weight
+        self.updated = time.monotonic()
+
+
+class LoadState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.db_latency = DecayingAverage()
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def time_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_latency.add(time.perf_counter() - start)
+
+    def load(self, queue_delay):
+        """Highest ratio of a signal to its threshold; 1.0 and above is overloaded."""
+        return max(
+            self.in_flight / settings.SHED_MAX_IN_FLIGHT,
+            queue_delay / settings.SHED_MAX_QUEUE_DELAY,
+            self.db_latency.current() / settings.SHED_MAX_DB_LATENCY,
+        )
+
+
+state = LoadState()
+
+
+def parse_request_start(value):
+    """Epoch seconds from ``t=1700000000.123`` / ``t=1700000000123`` / microseconds; None if unparsable."""
+    try:
+        number = float(value.strip().removeprefix('t='))
+    except (AttributeError, ValueError):
+        return None
+    if number > 1e14:
+        return number / 1e6
+    if number > 1e11:
+        return number / 1e3
+    return number
+
+
+def stale_key(request):
+    # the Accept header picks JSON vs the browsable API; hosts may serve different sites
+    raw = f"{request.get_host()}\x1f{request.get_full_path()}\x1f{request.headers.get('Accept', '')}"
+    return 'stale:' + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def is_public_read(request):
+    return request.method in ('GET', 'HEAD') and not request.headers.get('Authorization')
+
+
+def is_admin_read(request):
+    """A GET of the admin index, an app index, a changelist or a history page."""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    name = match.url_name or ''
+    return match.namespace == 'admin' and (name in ('index', 'app_list') or name.endswith(('_changelist', '_history')))
+
+
+def is_low_priority(request):
+    if any(request.path.startswith(prefix) for prefix in settings.SHED_LOW_PRIORITY_PATHS):
+        return True
+    return settings.SHED_ADMIN_READS and is_admin_read(request)
+
+
+def store_stale(request, response):
+    if (response.status_code != 200 or response.streaming
+            or 'public' not in response.get('Cache-Control', '')
+            or len(response.content) > settings.SHED_STALE_MAX_SIZE):
+        return
+    key = stale_key(request)
+    # refresh a URL's copy at most once per SHED_STALE_REFRESH, not on every hit
+    if cache.add(key + ':fresh', True, settings.SHED_STALE_REFRESH):
+        cache.set(key, {
+            'content': response.content,
+            'headers': {name: response[name] for name in STALE_HEADERS if response.has_header(name)},
+            'stored_at': time.time(),
+        }, settings.SHED_STALE_TTL)
+
+
+def stale_response(request):
+    stored = cache.get(stale_key(request))
+    if stored is None:
+        return None
+    response = HttpResponse(stored['content'], headers=stored['headers'])
+    response['Age'] = str(int(time.time() - stored['stored_at']))
+    # purges sent since the copy was stored can't reach it; keep edge copies short-lived
+    response['Cache-Control'] = f'public, max-age={settings.SHED_RETRY_AFTER}'
+    response['X-Load-Shed'] = 'stale'
+    return response
+
+
+def unavailable(detail, reason):
+    registry.inc('http_requests_shed_total', labels(reason=reason))
+    response = JsonResponse({'detail': detail}, status=503)
+    response['Retry-After'] = str(settings.SHED_RETRY_AFTER)
+    response['X-Load-Shed'] = reason
+    return response
+
+
+class LoadSheddingMiddleware:
+    """
+    Place it below CorsMiddleware (so 503s stay readable cross-origin) and
+    CompressionMiddleware (so stale copies are stored uncompressed).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SHED_ENABLED:
+            return self.get_response(request)
+
+        now = time.time()
+        started = parse_request_start(request.headers.get('X-Request-Start')) or now
+        queue_delay = max(0.0, now - started)
+
+        timeout = request.headers.get('X-Request-Timeout')
+        if timeout and timeout.isdigit():
+            remaining = started + int(timeout) / 1000 - now
+            if remaining < settings.SHED_MIN_REMAINING:
+                return unavailable("The request expired before it could be handled.", 'deadline')
+
+        load = state.load(queue_delay)
+        if load >= 1:
+            response = self.shed(request, load)
+            if response is not None:
+                return response
+
+        state.enter()
+        try:
+            with connection.execute_wrapper(state.time_query):
+                response = self.get_response(request)
+        finally:
+            state.leave()
+        if is_public_read(request):
+            store_stale(request, response)
+        return response
+
+    def shed(self, request, load):
+        if is_public_read(request):
+            response = stale_response(request)
+            if response is not None:
+                registry.inc('http_requests_shed_total', labels(reason='stale'))
+                return response
+        if is_low_priority(request):
+            return unavailable("The server is busy; try again shortly.", 'low-priority')
+        if load >= settings.SHED_SEVERE_FACTOR:
+            return unavailable("The server is busy; try again shortly.", 'overload')
+        return None
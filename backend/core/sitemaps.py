@@ -0,0 +1,12 @@
+from core.syndication import SiteSitemap
+
+
+class StaticPageSitemap(SiteSitemap):
+    changefreq = 'monthly'
+    priority = 0.6
+
+    def items(self):
+        return ['/', '/about', '/works', '/blog', '/contact']
+
+    def location(self, item):
+        return item
@@ -0,0 +1,212 @@
+"""
+Surrogate-key tagging for CDN / reverse-proxy caching.
+
+Public GET responses carry ``Cache-Control`` plus ``Surrogate-Key`` (Fastly,
+Varnish xkey) and ``Cache-Tag`` (Cloudflare, Akamai) headers. The headers
+name every model instance in the body (``blog.blogpost:12``) and every
+model collection it came from (``blog.blogpost``). When a row is created,
+updated or deleted, its instance key and its collection key are purged:
+every cached response that contains the row, plus the list pages, archives
+and counts it may have entered or left. An update can do that too
+(publishing, rescheduling, recategorising, retagging), so it purges the
+collection as well.
+
+Purges go through ``settings.SURROGATE_PURGER``, after the surrounding
+transaction commits. Use ``HTTPPurger`` for a real edge, or ``LogPurger`` /
+``FilePurger`` locally and in tests. ``HTTPPurger`` never calls the CDN
+inside a request: keys are queued for a background thread, which merges
+everything queued within ``SURROGATE_PURGE_DELAY`` seconds (all the purges
+of one request, usually) into one call and only logs failures.
+"""
+
+import atexit
+import logging
+import threading
+import time
+import urllib.request
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.module_loading import import_string
+
+from .caching import bounded_timeout
+
+logger = logging.getLogger(__name__)
+
+
+def collection_key(model):
+    return model._meta.label_lower
+
+
+def instance_key(instance):
+    return f'{instance._meta.label_lower}:{instance.pk}'
+
+
+# -- tagging -----------------------------------------------------------
+
+class SurrogateKeySerializerMixin:
+    """Records every serialized instance in the root serializer's context."""
+
+    def to_representation(self, instance):
+        keys = self.context.get('surrogate_keys')
+        if keys is not None and hasattr(instance, '_meta'):
+            keys.add(collection_key(type(instance)))
+            keys.add(instance_key(instance))
+        return super().to_representation(instance)
+
+
+def apply_cache_headers(request, response, keys, namespaces=()):
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return response
+
+    patch_vary_headers(response, ('Authorization',))
+    if request.headers.get('Authorization'):
+        # admin views of drafts etc. must never land in a shared cache
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    keys = sorted(keys)
+    if len(keys) > settings.SURROGATE_KEY_LIMIT:
+        # too many to list: fall back to the collections, which still purge correctly
+        keys = sorted({key.split(':', 1)[0] for key in keys})
+    max_age = bounded_timeout(namespaces, settings.CACHE_CONTROL_MAX_AGE)
+    s_maxage = bounded_timeout(namespaces, settings.SURROGATE_MAX_AGE)
+    patch_cache_control(response, public=True, max_age=max_age, s_maxage=s_maxage)
+    response['Surrogate-Control'] = f'max-age={s_maxage}'
+    response['Surrogate-Key'] = ' '.join(keys)
+    response['Cache-Tag'] = ','.join(keys)
+    return response
+
+
+class SurrogateKeyMixin:
+    """
+    For API views. Keys come from the serializers (via the context) plus
+    ``surrogate_keys`` for views that build responses without one.
+    Lifetimes are capped by the TTL bounds of ``cache_namespaces``.
+    """
+    surrogate_keys = ()
+    cache_namespaces = ()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['surrogate_keys'] = self._surrogate_keys
+        return context
+
+    def initial(self, request, *args, **kwargs):
+        self._surrogate_keys = set(self.surrogate_keys)
+        queryset = getattr(self, 'queryset', None)
+        if queryset is not None:
+            self._surrogate_keys.add(collection_key(queryset.model))
+        super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        return apply_cache_headers(
+            request, response, getattr(self, '_surrogate_keys', ()), self.cache_namespaces,
+        )
+
+
+# -- purging -----------------------------------------------------------
+
+class LogPurger:
+    def purge(self, keys):
+        logger.info("purge %s", ' '.join(keys))
+
+
+class FilePurger:
+    """Appends one line of keys per purge; handy to assert on in tests."""
+
+    def purge(self, keys):
+        with open(settings.SURROGATE_PURGE_FILE, 'a') as fh:
+            fh.write(' '.join(keys) + '\n')
+
+
+class HTTPPurger:
+    """
+    Sends ``SURROGATE_PURGE_METHOD`` to ``SURROGATE_PURGE_URL`` with the keys in
+    a header, from a background thread; at most ``SURROGATE_PURGE_MAX_HEADER``
+    characters of keys per call.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.pending = set()
+        self.thread = None
+        atexit.register(self.flush)  # management commands exit right after their purges
+
+    def purge(self, keys):
+        with self.lock:
+            self.pending.update(keys)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='surrogate purges', daemon=True)
+                self.thread.start()
+        self.wake.set()
+
+    def run(self):
+        while True:
+            self.wake.wait()
+            time.sleep(settings.SURROGATE_PURGE_DELAY)  # let the rest of the request's purges queue up
+            self.wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            keys, self.pending = sorted(self.pending), set()
+        batch, length = [], 0
+        for key in keys:
+            if batch and length + len(key) + 1 > settings.SURROGATE_PURGE_MAX_HEADER:
+                self.send(batch)
+                batch, length = [], 0
+            batch.append(key)
+            length += len(key) + 1
+        if batch:
+            self.send(batch)
+
+    def send(self, keys):
+        request = urllib.request.Request(
+            settings.SURROGATE_PURGE_URL,
+            method=settings.SURROGATE_PURGE_METHOD,
+            headers={settings.SURROGATE_PURGE_HEADER: ' '.join(keys), **settings.SURROGATE_PURGE_HEADERS},
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except Exception:
+            # the edge TTL still bounds staleness
+            logger.exception("Surrogate-key purge failed for %s", keys)
+
+
+_purger = None
+
+
+def get_purger():
+    global _purger
+    if _purger is None:
+        _purger = import_string(settings.SURROGATE_PURGER)()
+    return _purger
+
+
+def purge(keys):
+    keys = sorted(set(keys))
+    if keys:
+        # at once outside a transaction; a rolled-back write purges nothing
+        transaction.on_commit(lambda: get_purger().purge(keys))
+
+
+def connect_purge_signals(labels):
+    from django.apps import apps
+
+    def saved(sender, instance, **kwargs):
+        keys = [instance_key(instance), collection_key(sender)]
+        transaction.on_commit(lambda: purge(keys))
+
+    def deleted(sender, instance, **kwargs):
+        keys = [instance_key(instance), collection_key(sender)]
+        transaction.on_commit(lambda: purge(keys))
+
+    for label in labels:
+        model = apps.get_model(label)
+        post_save.connect(saved, sender=model, weak=False, dispatch_uid=f'surrogate-{label}-save')
+        post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=f'surrogate-{label}-delete')
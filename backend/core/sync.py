@@ -0,0 +1,12 @@
+from .delta import SyncCollection
+from .models import Education, Experience, Profile, Resume, Skill
+from .serializers import EducationSerializer, ExperienceSerializer, ProfileSerializer, ResumeSerializer, SkillSerializer
+
+profiles = SyncCollection(
+    'core.profile', Profile, ProfileSerializer,
+    select_related=('resume',), prefetch_related=('skills', 'educations', 'experiences'),
+)
+skills = SyncCollection('core.skill', Skill, SkillSerializer)
+education = SyncCollection('core.education', Education, EducationSerializer)
+experience = SyncCollection('core.experience', Experience, ExperienceSerializer)
+resumes = SyncCollection('core.resume', Resume, ResumeSerializer)
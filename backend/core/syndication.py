@@ -0,0 +1,106 @@
+"""
+Sitemap and feed plumbing shared by the blog and works apps.
+
+Rendered XML is cached per URL under the versions of the cache namespaces
+it depends on (see ``core.caching``), so a change to a blog post only
+re-renders the blog sitemap pages and feeds. Every response carries an ETag
+(a hash of the rendered XML) and Last-Modified, so crawlers that send If-None-Match / If-Modified-Since
+get a 304 without anything being rendered.
+"""
+
+import hashlib
+from functools import wraps
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap, views as sitemap_views
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .caching import bounded_timeout, get_version
+
+
+def site_url(path=''):
+    return settings.SITE_URL.rstrip('/') + path
+
+
+class SiteSitemap(Sitemap):
+    """Sitemap whose <loc> URLs point at the public site (settings.SITE_URL)."""
+    namespace = None       # core.caching namespace this section depends on
+    lastmod_field = None   # model field used for <lastmod>
+    limit = getattr(settings, 'SITEMAP_PAGE_SIZE', 50000)
+
+    def get_protocol(self, protocol=None):
+        return urlsplit(settings.SITE_URL).scheme or 'https'
+
+    def get_domain(self, site=None):
+        return urlsplit(settings.SITE_URL).netloc
+
+    def lastmod(self, item):
+        return getattr(item, self.lastmod_field) if self.lastmod_field else None
+
+    def get_latest_lastmod(self):
+        # one aggregate instead of loading every item (the default behaviour)
+        if not self.lastmod_field:
+            return None
+        return self.items().aggregate(latest=Max(self.lastmod_field))['latest']
+
+
+def serve_cached(request, namespaces, render, timeout=24 * 3600):
+    versions = ','.join(f'{namespace}:{get_version(namespace)}' for namespace in namespaces)
+    digest = hashlib.sha1(f'{request.get_host()}{request.get_full_path()}|{versions}'.encode()).hexdigest()
+    key = f'xml:v2:{digest}'  # v2: entries carry their ETag
+
+    entry = cache.get(key)
+    if entry is None:
+        response = render()
+        if hasattr(response, 'render'):
+            response.render()
+        if response.status_code != 200:
+            return response
+        entry = {
+            'content': response.content,
+            # from the bytes: a re-render after the TTL may differ under the same versions
+            'etag': f'"{hashlib.sha1(response.content).hexdigest()}"',
+            'content_type': response['Content-Type'],
+            'last_modified': response.get('Last-Modified'),
+        }
+        cache.set(key, entry, bounded_timeout(namespaces, timeout))
+
+    etag = entry['etag']
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['ETag'] = etag
+    last_modified = None
+    if entry['last_modified']:
+        response['Last-Modified'] = entry['last_modified']
+        last_modified = parse_http_date_safe(entry['last_modified'])
+    return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+
+def conditional_cache(*namespaces):
+    """Decorator form of ``serve_cached`` for views such as syndication feeds."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            return serve_cached(request, namespaces, lambda: view(request, *args, **kwargs))
+        return wrapped
+    return decorator
+
+
+def sitemap_index(request, sitemaps, sitemap_url_name):
+    namespaces = sorted({sitemap.namespace for sitemap in sitemaps.values() if sitemap.namespace})
+    return serve_cached(request, namespaces, lambda: sitemap_views.index(
+        request, sitemaps, sitemap_url_name=sitemap_url_name,
+    ))
+
+
+def sitemap_section(request, sitemaps, section):
+    if section not in sitemaps:
+        raise Http404(f"No sitemap available for section: {section!r}")
+    namespace = sitemaps[section].namespace
+    return serve_cached(request, [namespace] if namespace else [], lambda: sitemap_views.sitemap(
+        request, {section: sitemaps[section]}, section=section,
+    ))
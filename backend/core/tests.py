@@ -1,3 +1,211 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from blog.models import BlogCategory
+
+from . import documents, shedding
+from .models import Profile, Skill
+from .surrogate import HTTPPurger
+
+
+class ThrottleTests(TestCase):
+    """core.throttling: per-IP and per-endpoint sliding windows (contact form)."""
+
+    def setUp(self):
+        cache.clear()
+        rates = mock.patch.dict(api_settings.DEFAULT_THROTTLE_RATES, {'contact': '2/min', 'contact.total': '3/min'})
+        rates.start()
+        self.addCleanup(rates.stop)
+
+    def post(self, ip, **headers):
+        return self.client.post('/api/contact/messages/', {}, REMOTE_ADDR=ip, **headers).status_code
+
+    def test_limit_per_ip(self):
+        self.assertEqual([self.post('10.0.0.1') for _ in range(3)], [400, 400, 429])
+        self.assertEqual(self.post('10.0.0.2'), 400)
+
+    def test_forwarded_for_is_not_trusted_by_default(self):
+        self.post('10.0.0.1')
+        self.post('10.0.0.1')
+        self.assertEqual(self.post('10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.9'), 429)
+
+    def test_refused_requests_dont_use_up_the_total(self):
+        statuses = [self.post('10.0.0.1') for _ in range(10)]
+        self.assertEqual(statuses.count(429), 8)
+        self.assertEqual(self.post('10.0.0.2'), 400)
+        self.assertEqual(self.post('10.0.0.3'), 429)  # 3/min in total: now it is used up
+
+    def test_login_has_no_global_cap(self):
+        self.assertNotIn('login.total', api_settings.DEFAULT_THROTTLE_RATES)
+
+
+@override_settings(SURROGATE_PURGE_URL='http://cdn.invalid/purge', SURROGATE_PURGE_DELAY=0.05,
+                   SURROGATE_PURGE_MAX_HEADER=40)
+class HTTPPurgerTests(TestCase):
+    """core.surrogate.HTTPPurger: off the request path, merged, failing soft."""
+
+    def test_purges_are_merged_and_sent_in_the_background(self):
+        purger = HTTPPurger()
+        sent = []
+        with mock.patch('urllib.request.urlopen', side_effect=lambda request, timeout: sent.append(
+                request.get_header('Surrogate-key')) or time.sleep(0.2) or mock.Mock()):
+            start = time.perf_counter()
+            purger.purge(['blog.blogpost:1', 'blog.blogpost'])
+            purger.purge(['blog.blogpost', 'blog.blogpost:2'])
+            self.assertLess(time.perf_counter() - start, 0.05)  # the caller never waits for the CDN
+            purger.thread.join(0.5)
+        self.assertEqual(sent, ['blog.blogpost blog.blogpost:1', 'blog.blogpost:2'])
+
+    def test_failure_is_logged(self):
+        purger = HTTPPurger()
+        with mock.patch('urllib.request.urlopen', side_effect=TimeoutError), \
+                self.assertLogs('core.surrogate', 'ERROR'):
+            purger.purge(['works.product'])
+            purger.flush()
+
+
+class ProfileDocumentTests(TestCase):
+    """core.documents: the stored profile document follows its children."""
+
+    def setUp(self):
+        self.first = Profile.objects.create(full_name="Dr. First")
+        self.second = Profile.objects.create(full_name="Dr. Second")
+
+    def skills(self, profile):
+        profile.refresh_from_db()
+        return [skill['name'] for skill in profile.document['skills']]
+
+    def test_child_changes_rebuild_the_document(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skill.objects.create(profile=self.first, name="Ultrasound", category='clinical')
+        self.assertEqual(self.skills(self.first), ["Ultrasound"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.delete()
+        self.assertEqual(self.skills(self.first), [])
+
+    def test_moved_child_leaves_the_old_document(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skill.objects.create(profile=self.first, name="Ultrasound", category='clinical')
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.profile = self.second
+            skill.save()
+        self.assertEqual(self.skills(self.first), [])
+        self.assertEqual(self.skills(self.second), ["Ultrasound"])
+
+    def test_update_without_signals_leaves_it_stale_until_rebuilt(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(profile=self.first, name="Ultrasound", category='clinical')
+        Skill.objects.update(name="Echo")
+        self.assertEqual(self.skills(self.first), ["Ultrasound"])
+        documents.rebuild(self.first.pk)
+        self.assertEqual(self.skills(self.first), ["Echo"])
+
+    def test_missing_profile(self):
+        self.assertIsNone(documents.rebuild(self.second.pk + 100))
+        self.assertEqual(documents.documents([None, self.second.pk + 100]), {})
+
+
+@override_settings(ALLOWED_HOSTS=['a.test', 'b.test'], SHED_ENABLED=True)
+class LoadSheddingTests(TestCase):
+    """core.shedding under a simulated overload (1.5 times the thresholds)."""
+
+    def setUp(self):
+        cache.clear()
+
+    def overloaded(self, load=1.5):
+        return mock.patch.object(shedding.state, 'load', return_value=load)
+
+    def test_stale_copy_for_the_same_host_only(self):
+        fresh = self.client.get('/api/blog/posts/', HTTP_HOST='a.test')
+        with self.overloaded():
+            stale = self.client.get('/api/blog/posts/', HTTP_HOST='a.test')
+            other = self.client.get('/api/blog/posts/', HTTP_HOST='b.test')
+        self.assertEqual(stale['X-Load-Shed'], 'stale')
+        self.assertEqual(stale.content, fresh.content)
+        self.assertEqual(other.status_code, 200)
+        self.assertFalse(other.has_header('X-Load-Shed'))  # ran normally: not low priority, not severe
+
+    def test_low_priority_paths(self):
+        with self.overloaded():
+            self.assertEqual(self.client.post('/api/batch/', HTTP_HOST='a.test').status_code, 503)
+            self.assertEqual(self.client.get('/admin/auth/user/', HTTP_HOST='a.test').status_code, 503)
+            self.assertEqual(self.client.get('/admin/', HTTP_HOST='a.test').status_code, 503)
+
+    def test_admin_login_and_writes_are_kept(self):
+        with self.overloaded():
+            self.assertEqual(self.client.get('/admin/login/', HTTP_HOST='a.test').status_code, 200)
+            response = self.client.post('/admin/login/', {'username': 'x', 'password': 'y'}, HTTP_HOST='a.test')
+            self.assertEqual(response.status_code, 200)  # the form again, with its error
+            self.assertEqual(self.client.get('/admin/auth/user/add/', HTTP_HOST='a.test').status_code, 302)
+
+    def test_severe_overload_without_stale_copy(self):
+        with self.overloaded(load=3):
+            response = self.client.get('/api/works/products/', HTTP_HOST='a.test')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['X-Load-Shed'], 'overload')
+        self.assertEqual(response['Retry-After'], '5')
+
+    def test_expired_request_is_not_run(self):
+        started = time.time() - 2
+        response = self.client.get('/api/works/products/', HTTP_HOST='a.test',
+                                   HTTP_X_REQUEST_START=f't={started}', HTTP_X_REQUEST_TIMEOUT='1000')
+        self.assertEqual(response['X-Load-Shed'], 'deadline')
+
+
+class BatchTests(TestCase):
+    """POST /api/batch/ (core.batch)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='x', is_staff=True)
+
+    def batch(self, requests, atomic=False, authorized=True):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.staff)}'} if authorized else {}
+        return self.client.post('/api/batch/', {'atomic': atomic, 'requests': requests},
+                                content_type='application/json', **headers)
+
+    def test_items_run_in_order(self):
+        response = self.batch([
+            {'method': 'POST', 'path': '/api/blog/categories/', 'body': {'name': "Global Health"}},
+            {'method': 'GET', 'path': '/api/blog/categories/?with_counts=1'},
+            {'method': 'DELETE', 'path': '/api/blog/categories/999/'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        created, listed, missing = response.json()['responses']
+        self.assertEqual(created['status'], 201)
+        self.assertEqual([row['name'] for row in listed['body']], ["Global Health"])
+        self.assertEqual(missing['status'], 404)
+        self.assertTrue(BlogCategory.objects.filter(name="Global Health").exists())
+
+    def test_atomic_batch_rolls_back_on_failure(self):
+        response = self.batch([
+            {'method': 'POST', 'path': '/api/blog/categories/', 'body': {'name': "Global Health"}},
+            {'method': 'POST', 'path': '/api/blog/categories/', 'body': {'name': ""}},
+            {'method': 'POST', 'path': '/api/blog/categories/', 'body': {'name': "Surgery"}},
+        ], atomic=True)
+        self.assertEqual([item['status'] for item in response.json()['responses']], [201, 400, 424])
+        self.assertFalse(BlogCategory.objects.exists())
+
+    def test_empty_bodies_are_null_and_falsy_ones_kept(self):
+        category = BlogCategory.objects.create(name="Surgery")
+        response = self.batch([
+            {'method': 'DELETE', 'path': f'/api/blog/categories/{category.pk}/'},
+            {'method': 'GET', 'path': '/api/blog/archive/'},
+        ])
+        deleted, archive = response.json()['responses']
+        self.assertEqual((deleted['status'], deleted['body']), (204, None))
+        self.assertEqual(archive['body'], [])
+
+    def test_rejected_batches(self):
+        item = {'method': 'GET', 'path': '/api/blog/posts/'}
+        self.assertEqual(self.batch([item], authorized=False).status_code, 401)
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.assertEqual(self.batch([{'method': 'POST', 'path': '/api/batch/'}]).status_code, 400)
+        self.assertEqual(self.batch([{'method': 'GET', 'path': '/admin/'}]).status_code, 400)
@@ -0,0 +1,99 @@
+"""
+Sliding-window throttles whose counters live in the shared cache.
+
+DRF's built-in throttles keep a list of request timestamps per client and
+rewrite it on every request. Here each client gets one counter per fixed
+window. The previous window's count is weighted by how much of it still
+overlaps the sliding window, so a check costs two ``get`` and, if the
+request is let through, one ``incr``. As with DRF's throttles, refused
+requests are not counted. Because the counters live in the shared cache,
+the limit holds across all worker processes.
+
+Views opt in with ``throttle_scope``. Rates come from
+``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``: ``'<scope>'`` is the per-IP
+limit and ``'<scope>.total'`` the limit for the endpoint as a whole. A
+scope without a rate is not throttled. DRF asks every throttle even when
+an earlier one refused the request, so a request the per-IP limit refused
+is not counted against the endpoint's total either: one client hammering
+an endpoint can't use up everyone else's share.
+
+Clients are told apart by ``REMOTE_ADDR``; behind a reverse proxy, set
+``NUM_PROXIES`` so the address comes from ``X-Forwarded-For`` instead (see
+DRF's ``get_ident``), otherwise any client could pick its own.
+"""
+
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'5/min' -> (5, 60)"""
+    if rate is None:
+        return None, None
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    scope_suffix = ''
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_cache_ident(self, request):
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope or getattr(request, 'throttled', False):
+            return True
+        scope += self.scope_suffix
+        num_requests, duration = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(scope))
+        if num_requests is None:
+            return True
+
+        now = time.time()
+        window = int(now // duration)
+        prefix = f'throttle:{scope}:{self.get_cache_ident(request)}'
+        key = f'{prefix}:{window}'
+
+        counts = cache.get_many([key, f'{prefix}:{window - 1}'])
+        current = counts.get(key, 0)
+        previous = counts.get(f'{prefix}:{window - 1}', 0)
+
+        elapsed = (now % duration) / duration
+        estimated = previous * (1 - elapsed) + current + 1
+        if estimated > num_requests:
+            self.wait_seconds = duration - (now % duration)
+            request.throttled = True
+            return False
+
+        cache.add(key, 0, duration * 2)
+        try:
+            cache.incr(key)
+        except ValueError:  # evicted in between
+            cache.set(key, 1, duration * 2)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Limit per client IP, using the ``'<scope>'`` rate. Goes first."""
+
+
+class EndpointRateThrottle(SlidingWindowThrottle):
+    """Limit for all clients together, using the ``'<scope>.total'`` rate."""
+    scope_suffix = '.total'
+
+    def get_cache_ident(self, request):
+        return 'all'
+
+
+PUBLIC_WRITE_THROTTLES = [IPRateThrottle, EndpointRateThrottle]
@@ -0,0 +1,284 @@
+"""
+In-process prefix index for type-ahead.
+
+Every suggestion (a post title, a tag, a skill, ...) is normalized
+(lowercase, accents and punctuation stripped) and stored under the label
+itself plus the rest of it from each later word, so "heal" finds
+"Global Health Equity". The keys are ``(term, entry_id)`` tuples in one
+sorted list: a lookup is a binary search to the first key that starts with
+the query, then a short scan, with no database query.
+
+Sources register per app (``<app>/autocomplete.py``) with
+``AutocompleteSource``. Like the related-content indexes, each process
+catches up through a ``ChangeFeed``: changed rows are re-read and only their
+keys are replaced. Tags shared by several rows are stored once and
+reference-counted.
+
+A full rebuild (a cold worker, a gap in a feed, a reset after a bulk import)
+never runs inside a lookup: ``rebuild()`` fills a fresh index from every
+source on a background thread and swaps it in when complete, and lookups
+keep using the previous index (or none, on a cold worker) until then.
+``core.warmup`` starts the build as a worker boots.
+
+The index holds at most ``AUTOCOMPLETE_MAX_ENTRIES`` suggestions and
+``AUTOCOMPLETE_MAX_WORDS`` keys per suggestion; rows past the cap are left
+out until the next rebuild.
+"""
+
+import bisect
+import re
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .changefeed import BackgroundBuild, ChangeFeed
+
+NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+MAX_TERM_LENGTH = 48
+
+# name -> AutocompleteSource, filled in as apps define their sources
+SOURCES = {}
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return NON_WORD_RE.sub(' ', text.lower()).strip()
+
+
+def identity(suggestion):
+    # rows by type and id; shared values (tags) by type and label
+    return suggestion['type'], suggestion.get('id', suggestion['label'].lower())
+
+
+def terms_for(label):
+    words = normalize(label).split()[:settings.AUTOCOMPLETE_MAX_WORDS]
+    return {' '.join(words[i:])[:MAX_TERM_LENGTH] for i in range(len(words))}
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        self.keys = []         # sorted [(term, entry_id), ...]
+        self.entries = {}      # entry_id -> suggestion dict
+        self.folded = {}       # entry_id -> normalized label
+        self.refcounts = {}    # entry_id -> number of rows contributing it
+        self.ids = {}          # identity -> entry_id
+        self.next_id = 0
+
+    def replace(self, other):
+        """Take over ``other``'s contents."""
+        self.keys, self.entries, self.folded = other.keys, other.entries, other.folded
+        self.refcounts, self.ids, self.next_id = other.refcounts, other.ids, other.next_id
+
+    def add(self, suggestion, sort=True):
+        """Add one reference to ``suggestion``; with ``sort=False`` the caller sorts ``keys`` afterwards."""
+        key = identity(suggestion)
+        entry_id = self.ids.get(key)
+        if entry_id is not None:
+            self.refcounts[entry_id] += 1
+            return entry_id
+        if len(self.entries) >= settings.AUTOCOMPLETE_MAX_ENTRIES:
+            return None
+        entry_id = self.next_id
+        self.next_id += 1
+        self.ids[key] = entry_id
+        self.entries[entry_id] = suggestion
+        self.folded[entry_id] = normalize(suggestion['label'])
+        self.refcounts[entry_id] = 1
+        for term in terms_for(suggestion['label']):
+            if sort:
+                bisect.insort(self.keys, (term, entry_id))
+            else:
+                self.keys.append((term, entry_id))
+        return entry_id
+
+    def discard(self, entry_ids):
+        """Drop one reference per id; suggestions nobody references any more leave the index."""
+        dead = {}
+        for entry_id in entry_ids:
+            self.refcounts[entry_id] -= 1
+            if not self.refcounts[entry_id]:
+                del self.refcounts[entry_id]
+                del self.folded[entry_id]
+                suggestion = dead[entry_id] = self.entries.pop(entry_id)
+                del self.ids[identity(suggestion)]
+        if len(dead) > 32:
+            # one pass instead of many list deletions (rebuilds)
+            self.keys = [key for key in self.keys if key[1] not in dead]
+            return
+        for entry_id, suggestion in dead.items():
+            for term in terms_for(suggestion['label']):
+                position = bisect.bisect_left(self.keys, (term, entry_id))
+                if position < len(self.keys) and self.keys[position] == (term, entry_id):
+                    del self.keys[position]
+
+    def search(self, query, types=None, limit=10):
+        words = normalize(query).split()
+        if not words:
+            return []
+        first, rest = words[0], words[1:]
+        seen, matches = set(), []
+        budget = limit * settings.AUTOCOMPLETE_SCAN_FACTOR
+        position = bisect.bisect_left(self.keys, (first,))
+        while position < len(self.keys) and budget:
+            term, entry_id = self.keys[position]
+            position += 1
+            if not term.startswith(first):
+                break
+            budget -= 1
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+            suggestion = self.entries[entry_id]
+            if types and suggestion['type'] not in types:
+                continue
+            if rest:
+                # every further query word must start a later word of the match
+                later = term.split()[1:]
+                if not all(any(word.startswith(q) for word in later) for q in rest):
+                    continue
+            # matches at the start of the label first, then shorter labels
+            folded = self.folded[entry_id]
+            matches.append((not folded.startswith(first), len(folded), folded, entry_id))
+        matches.sort()
+        return [self.entries[entry_id] for *_, entry_id in matches[:limit]]
+
+
+index = PrefixIndex()
+
+
+class AutocompleteSource:
+    """
+    ``queryset`` is a callable returning the rows to suggest, ``fields`` the
+    columns passed to ``suggestions(row)``, which yields suggestion dicts:
+    ``{'type', 'id', 'label'}`` for a row, or ``{'type', 'label'}`` for a
+    value shared between rows (a tag).
+    """
+
+    def __init__(self, name, model, queryset, fields, suggestions):
+        self.name = name
+        self.model = model
+        self.queryset = queryset
+        self.fields = fields
+        self.suggestions = suggestions
+        self.feed = ChangeFeed(f'autocomplete:{name}')
+        self.generation = None
+        self.contributed = {}   # pk -> [entry_id, ...]
+        self.synced_at = 0.0
+        SOURCES[name] = self
+
+    def rows(self, **filters):
+        return self.queryset().filter(**filters).values('pk', *self.fields).iterator(chunk_size=2000)
+
+    def add(self, row, sort=True, target=None, contributed=None):
+        target = index if target is None else target
+        contributed = self.contributed if contributed is None else contributed
+        entry_ids = [target.add(suggestion, sort) for suggestion in self.suggestions(row)]
+        contributed[row['pk']] = [entry_id for entry_id in entry_ids if entry_id is not None]
+
+    def update(self, pk, row):
+        index.discard(self.contributed.pop(pk, ()))
+        if row is not None:
+            self.add(row)
+
+    def load(self, target, rows=None):
+        """
+        Add every row (or those ``rows()`` yields) to ``target``, unsorted;
+        returns ``(generation, contributed)``.
+        """
+        generation = self.feed.current()
+        contributed = {}
+        for row in (rows() if rows else self.rows()):
+            self.add(row, sort=False, target=target, contributed=contributed)
+        return generation, contributed
+
+    def sync(self):
+        """
+        Catch up with changes made anywhere, at most once per
+        ``AUTOCOMPLETE_SYNC_INTERVAL``. The feed and the rows are read
+        without ``index.lock``, so lookups never wait on the database; only
+        applying the changes takes it.
+        """
+        now = time.monotonic()
+        base = self.generation
+        if base is not None and now - self.synced_at < settings.AUTOCOMPLETE_SYNC_INTERVAL:
+            return
+        self.synced_at = now
+        if base is None:
+            background.start()
+            return
+        generation, changed = self.feed.since(base)
+        if changed is None:
+            background.start()
+            return
+        rows = {row['pk']: row for row in self.rows(pk__in=changed)} if changed else {}
+        with index.lock:
+            if self.generation != base:
+                return  # another thread (or a rebuild) got there first, with rows as new as these
+            for pk in changed:
+                self.update(pk, rows.get(pk))
+            self.generation = generation
+
+    # -- signals ------------------------------------------------------
+
+    def connect(self):
+        post_save.connect(self._changed, sender=self.model, dispatch_uid=f'autocomplete-{self.name}-save')
+        post_delete.connect(self._changed, sender=self.model, dispatch_uid=f'autocomplete-{self.name}-delete')
+
+    def _changed(self, sender, instance, **kwargs):
+        pk = instance.pk
+
+        def record():
+            self.feed.record(pk)
+            self.synced_at = 0.0  # this process sees its own writes on the next lookup
+
+        transaction.on_commit(record)
+
+
+def rebuild():
+    """Build a fresh index from every source and swap it in."""
+    fresh = PrefixIndex()
+    loaded = [(source, source.load(fresh)) for source in list(SOURCES.values())]
+    fresh.keys.sort()
+    with index.lock:
+        index.replace(fresh)
+        for source, (generation, contributed) in loaded:
+            source.generation, source.contributed = generation, contributed
+            source.synced_at = 0.0  # replay what changed during the build on the next lookup
+
+
+background = BackgroundBuild('autocomplete index', rebuild)
+
+
+def suggest(query, types=None, limit=10):
+    for source in SOURCES.values():
+        source.sync()
+    with index.lock:
+        return index.search(query, types, limit)
+
+
+class AutocompleteView(APIView):
+    """``GET /api/autocomplete/?q=glo&types=post,tag&limit=8``"""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get('q', '')[:100]
+        types = {kind for kind in request.query_params.get('types', '').split(',') if kind}
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), settings.AUTOCOMPLETE_MAX_LIMIT)
+        except ValueError:
+            limit = 10
+        response = Response({'query': query, 'results': suggest(query, types, limit)})
+        response['Cache-Control'] = f'public, max-age={settings.AUTOCOMPLETE_MAX_AGE}'
+        return response
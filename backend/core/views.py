@@ -1,5 +1,16 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare, get_random_string
+from django.views.decorators.cache import never_cache
 from rest_framework import viewsets
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, AllowAny
+from rest_framework.response import Response
 from .models import Profile, Skill, Education, Experience, Resume
 from .serializers import (
     ProfileSerializer, SkillSerializer, EducationSerializer,
@@ -7,15 +18,40 @@ from .serializers import (
 )
 
 from rest_framework import generics
+from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth.models import User
 from .serializers import UserRegisterSerializer
-
-class ProfileViewSet(viewsets.ModelViewSet):
+from .throttling import PUBLIC_WRITE_THROTTLES
+from .events import broadcaster
+from . import metrics
+from .documents import render_rows
+from .idempotency import IdempotencyMixin
+from .surrogate import SurrogateKeyMixin
+
+class ProfileViewSet(IdempotencyMixin, SurrogateKeyMixin, viewsets.ModelViewSet):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class SkillViewSet(viewsets.ModelViewSet):
+    # Reads are served from the stored documents (core/documents.py):
+    # one column of one row per profile, no joins, no per-child queries.
+    def list(self, request, *args, **kwargs):
+        rows = self.filter_queryset(self.get_queryset()).order_by('pk').values_list('pk', 'document')
+        page = self.paginate_queryset(rows)
+        found = render_rows(page if page is not None else rows, request, self._surrogate_keys)
+        if page is not None:
+            return self.get_paginated_response(list(found.values()))
+        return Response(list(found.values()))
+
+    def retrieve(self, request, *args, **kwargs):
+        rows = self.filter_queryset(self.get_queryset()).values_list('pk', 'document')
+        row = generics.get_object_or_404(rows, pk=self.kwargs['pk'])
+        found = render_rows([row], request, self._surrogate_keys)
+        if not found:
+            raise Http404
+        return Response(found[row[0]])
+
+class SkillViewSet(IdempotencyMixin, SurrogateKeyMixin, viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -36,7 +72,7 @@ class SkillViewSet(viewsets.ModelViewSet):
         # Optional: only allow owner or staff
         serializer.save()
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(IdempotencyMixin, SurrogateKeyMixin, viewsets.ModelViewSet):
     queryset = Education.objects.all()
     serializer_class = EducationSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -54,7 +90,7 @@ class EducationViewSet(viewsets.ModelViewSet):
 
         serializer.save(profile=profile)
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+class ExperienceViewSet(IdempotencyMixin, SurrogateKeyMixin, viewsets.ModelViewSet):
     queryset = Experience.objects.all()
     serializer_class = ExperienceSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -68,7 +104,7 @@ class ExperienceViewSet(viewsets.ModelViewSet):
                 raise serializers.ValidationError("No profile exists. Create one first.")
         serializer.save(profile=profile)
 
-class ResumeViewSet(viewsets.ModelViewSet):
+class ResumeViewSet(IdempotencyMixin, SurrogateKeyMixin, viewsets.ModelViewSet):
     queryset = Resume.objects.all()
     serializer_class = ResumeSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -90,4 +126,89 @@ class ResumeViewSet(viewsets.ModelViewSet):
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegisterSerializer
-    permission_classes = [AllowAny]
\ No newline at end of file
+    permission_classes = [AllowAny]
+    throttle_classes = PUBLIC_WRITE_THROTTLES
+    throttle_scope = 'register'
+
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    # Every attempt costs a PBKDF2 hash, so cap them before authentication runs
+    throttle_classes = PUBLIC_WRITE_THROTTLES
+    throttle_scope = 'login'
+
+
+def _staff_user_from_token(raw_token):
+    auth = JWTAuthentication()
+    try:
+        user = auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, TokenError):
+        return None
+    return user if user.is_active and user.is_staff else None
+
+
+async def event_stream(request):
+    """
+    Server-Sent Events feed of model changes for the admin SPA.
+
+    EventSource cannot set headers, so the JWT access token comes in
+    ``?token=``. Reconnecting clients resume after ``Last-Event-ID``.
+    Needs an ASGI server (see core_project/asgi.py).
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'Event streams require the ASGI server.'}, status=501)
+
+    raw_token = request.GET.get('token') or request.headers.get('Authorization', '').removeprefix('Bearer ')
+    user = await sync_to_async(_staff_user_from_token)(raw_token) if raw_token else None
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or 0
+    try:
+        last_id = int(last_id)
+    except ValueError:
+        last_id = 0
+
+    response = StreamingHttpResponse(broadcaster.stream(last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+
+# -- operations ------------------------------------------------------------
+
+@never_cache
+def metrics_view(request):
+    """Prometheus text format, summed over all workers (see core/metrics.py)."""
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@never_cache
+def healthz(request):
+    """Liveness: the process is up and serving requests. Touches nothing else."""
+    return JsonResponse({'status': 'ok'})
+
+
+@never_cache
+def readyz(request):
+    """Readiness: one trivial query and one cache round trip."""
+    checks = {}
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        checks['database'] = 'ok'
+    except DatabaseError:
+        checks['database'] = 'unavailable'
+
+    probe = get_random_string(12)
+    try:
+        cache.set('readyz:probe', probe, 10)
+        checks['cache'] = 'ok' if cache.get('readyz:probe') == probe else 'unavailable'
+    except Exception:  # backend-specific connection errors
+        checks['cache'] = 'unavailable'
+
+    ready = all(value == 'ok' for value in checks.values())
+    return JsonResponse({'status': 'ok' if ready else 'unavailable', **checks}, status=200 if ready else 503)
@@ -0,0 +1,245 @@
+"""
+Worker warm-up.
+
+A fresh worker pays for a lot on its first requests: DRF loads its renderer,
+parser and authentication classes on first use, simplejwt its token
+backend, Pillow its format plugins; URL patterns compile their regexes and
+the resolvers build their reverse maps lazily; every ModelSerializer
+introspects its model the first time it is instantiated; the database and
+cache connections open; the in-process indexes (related content,
+autocomplete) start building on their first lookup.
+
+``warm_up()`` does all of that up front, then sends ``WARMUP_URLS``
+through the full middleware stack so the app caches are filled too. The
+indexes are only started, on their background threads: a large one takes
+seconds to minutes, longer than a worker may take to boot, and the worker
+serves without them (empty suggestions) until they are swapped in. Set
+``WARMUP_WAIT_FOR_INDEXES`` to build them before serving instead. Under
+``gunicorn --preload`` the threads started in the master don't survive the
+fork; each worker starts its own builds on first lookup.
+``core_project/wsgi.py`` and ``asgi.py`` call it when ``WARMUP_ON_START``
+is set, before the server hands the worker any traffic. Under ASGI, requests
+run in other threads than the one importing the application, so a connection
+opened here would never serve one: ``asgi.py`` passes
+``keep_connections=False``, which skips opening them and closes whatever the
+other steps opened;
+``manage.py warmup`` runs it on its own (it fills the shared caches) and
+``manage.py profile_startup`` measures what it saves.
+
+A step that fails (e.g. the database is down) is logged and skipped: a
+worker that can't warm up still starts.
+
+With ``gunicorn --preload`` the application is loaded once in the master and
+then forked, so the connections opened here would be shared by every worker.
+Close them in a ``post_fork`` hook (``django.db.connections.close_all()``)
+or leave ``WARMUP_ON_START`` off there.
+"""
+
+import importlib
+import io
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# imported lazily by the libraries on first use; names that aren't installed are skipped
+HOT_MODULES = (
+    'rest_framework.renderers',
+    'rest_framework.parsers',
+    'rest_framework.negotiation',
+    'rest_framework.metadata',
+    'rest_framework.pagination',
+    'rest_framework_simplejwt.authentication',
+    'rest_framework_simplejwt.tokens',
+    'rest_framework_simplejwt.backends',
+    'PIL.Image',
+    'core.compression',
+)
+
+DRF_SETTINGS = (
+    'DEFAULT_RENDERER_CLASSES', 'DEFAULT_PARSER_CLASSES', 'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES', 'DEFAULT_THROTTLE_CLASSES', 'DEFAULT_CONTENT_NEGOTIATION_CLASS',
+    'DEFAULT_METADATA_CLASS', 'DEFAULT_PAGINATION_CLASS', 'DEFAULT_FILTER_BACKENDS', 'EXCEPTION_HANDLER',
+)
+
+
+def import_hot_modules():
+    from PIL import Image
+    from rest_framework.settings import api_settings
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+    from rest_framework_simplejwt.state import token_backend
+
+    for name in (*HOT_MODULES, *settings.WARMUP_MODULES):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    for name in DRF_SETTINGS:
+        getattr(api_settings, name)  # imports the classes named in settings
+    jwt_settings.AUTH_TOKEN_CLASSES  # imported on first access, like DRF's
+    token_backend.get_leeway()
+    Image.init()  # every format plugin, not just the common ones Pillow preloads
+    return f'{len(HOT_MODULES) + len(settings.WARMUP_MODULES)} modules'
+
+
+def walk_patterns(patterns):
+    from django.urls import URLResolver
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield pattern
+            yield from walk_patterns(pattern.url_patterns)
+        else:
+            yield pattern
+
+
+def build_url_resolvers():
+    from django.urls import URLResolver, get_resolver
+
+    resolver = get_resolver()
+    patterns = list(walk_patterns(resolver.url_patterns))
+    for pattern in patterns:
+        pattern.pattern.regex  # compiled on first access
+        if isinstance(pattern, URLResolver):
+            pattern.reverse_dict
+    resolver.reverse_dict
+    return f'{len(patterns)} patterns'
+
+
+def view_classes():
+    from django.urls import get_resolver
+
+    seen = []
+    for pattern in walk_patterns(get_resolver().url_patterns):
+        cls = getattr(getattr(pattern, 'callback', None), 'cls', None)
+        if cls is not None and cls not in seen:
+            seen.append(cls)
+    return seen
+
+
+def build_serializers():
+    from .fast import FastListMixin, Unsupported, field_plan
+
+    built = 0
+    for cls in view_classes():
+        serializer_class = getattr(cls, 'serializer_class', None)
+        if serializer_class is None:
+            continue
+        serializer_class().fields  # ModelSerializer introspection, model _meta caches
+        built += 1
+        if issubclass(cls, FastListMixin):
+            try:
+                field_plan(serializer_class, frozenset(cls.fast_nested))
+            except Unsupported:
+                pass
+    return f'{built} serializers'
+
+
+def open_connections():
+    from django.core.cache import caches
+    from django.db import connections
+
+    for connection in connections.all():
+        connection.ensure_connection()
+    for cache in caches.all():
+        cache.get('warmup:probe')
+    return f'{len(connections.all())} databases, {len(caches.all())} caches'
+
+
+def build_indexes():
+    from . import typeahead
+    from .related import INDEXES
+
+    if settings.WARMUP_WAIT_FOR_INDEXES:
+        for related in INDEXES.values():
+            related.build()
+        typeahead.rebuild()
+        return f'{len(INDEXES)} related, {len(typeahead.SOURCES)} autocomplete built'
+    for related in INDEXES.values():
+        related.background.start()
+    typeahead.background.start()
+    return f'{len(INDEXES)} related, {len(typeahead.SOURCES)} autocomplete building in the background'
+
+
+def warm_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*':
+            return host.lstrip('.')
+    return 'localhost'
+
+
+def request(handler, path):
+    """Send a GET through ``handler`` (a WSGI application); returns the status code."""
+    path, _, query = path.partition('?')
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': warm_host(),
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_ACCEPT': 'application/json',
+        'HTTP_ACCEPT_ENCODING': 'gzip',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.url_scheme': 'http',
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+        'wsgi.version': (1, 0),
+    }
+    status = []
+    response = handler(environ, lambda line, headers, exc_info=None: status.append(line))
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()  # request_finished: connection bookkeeping as after a real request
+    return int(status[0].split()[0])
+
+
+def prime_caches(handler=None):
+    if handler is None:
+        from django.core.handlers.wsgi import WSGIHandler
+        handler = WSGIHandler()
+    statuses = [request(handler, path) for path in settings.WARMUP_URLS]
+    failed = sum(status >= 400 for status in statuses)
+    return f'{len(statuses)} requests' + (f', {failed} failed' if failed else '')
+
+
+def warm_up(handler=None, keep_connections=True):
+    """
+    Run every step; returns ``[(step, seconds, detail), ...]``. ``handler``
+    is the WSGI application the worker serves, so the requests go through
+    its already-loaded middleware.
+    """
+    from django.db import connections
+
+    steps = [
+        ('imports', import_hot_modules),
+        ('url resolvers', build_url_resolvers),
+        ('serializers', build_serializers),
+        ('connections', open_connections),
+        ('indexes', build_indexes),
+        ('caches', lambda: prime_caches(handler)),
+    ]
+    if not keep_connections:
+        steps.remove(('connections', open_connections))
+    report = []
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            detail = step()
+        except Exception as exc:
+            logger.warning("Warm-up step %r failed: %s", name, exc)
+            detail = f'failed: {exc}'
+        report.append((name, time.perf_counter() - start, detail))
+    if not keep_connections:
+        connections.close_all()
+    logger.info("Warm-up done in %.2fs (%s)", sum(seconds for _, seconds, _ in report),
+                ', '.join(f'{name} {seconds * 1e3:.0f}ms' for name, seconds, _ in report))
+    return report
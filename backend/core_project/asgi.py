@@ -3,6 +3,10 @@ ASGI config for core_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the project with an ASGI server (e.g. ``uvicorn core_project.asgi:application``)
+to enable the Server-Sent Events stream at /api/events/; a long-lived stream
+costs a coroutine here instead of tying up a whole WSGI worker.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -14,3 +18,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core_project.settings')
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_START:
+    from core.warmup import warm_up
+    # this thread never serves a request; don't leave connections open in it
+    warm_up(keep_connections=False)
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -37,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'rest_framework',
     'corsheaders',
     'core',
@@ -47,9 +51,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-
+    'core.metrics.MetricsMiddleware',                  # first, so it times everything below
     'corsheaders.middleware.CorsMiddleware',           
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.shedding.LoadSheddingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -82,19 +88,54 @@ WSGI_APPLICATION = 'core_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': 'dr_olana_db',
-        'USER': 'olana_user',                # ← change if you have different user
-        'PASSWORD': 'ABcd@1234',   # ← your MySQL root password
-        'HOST': '127.0.0.1',
-        'PORT': '3306',
-        'OPTIONS': {
-            'charset': 'utf8mb4',
-        },
+# MySQL by default. DATABASE_ENGINE=sqlite runs on a single file with no database
+# service (small sites, CI); both use the same migrations.
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'mysql')
+
+if DATABASE_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # seconds to wait for the write lock instead of failing with "database is locked"
+                'timeout': 20,
+                # take the write lock at BEGIN, so writers queue on the timeout above
+                'transaction_mode': 'IMMEDIATE',
+                # WAL: readers never block the writer or each other. synchronous=NORMAL is
+                # safe with WAL (a power cut can lose the last commits, never corrupt).
+                # mmap_size lets reads come straight from the OS page cache.
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA mmap_size=268435456;'
+                    'PRAGMA cache_size=-20000;'
+                    'PRAGMA temp_store=MEMORY'
+                ),
+            },
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': os.environ.get('MYSQL_DATABASE', 'dr_olana_db'),
+            'USER': os.environ.get('MYSQL_USER', 'olana_user'),
+            'PASSWORD': os.environ.get('MYSQL_PASSWORD', 'ABcd@1234'),  # local development default
+            'HOST': os.environ.get('MYSQL_HOST', '127.0.0.1'),
+            'PORT': os.environ.get('MYSQL_PORT', '3306'),
+            'OPTIONS': {
+                'charset': 'utf8mb4',
+            },
+        }
+    }
+
+# Keep connections open between requests (seconds), so a worker pays for the
+# connect once (see core.warmup) rather than on every request. Off by default:
+# Django advises against persistent connections under ASGI (asgi.py). Set e.g.
+# DATABASE_CONN_MAX_AGE=60 for WSGI-only deployments.
+DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DATABASE_CONN_MAX_AGE', 0))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
 
 
 # Password validation
@@ -139,8 +180,28 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Local memory is per process; point this at Redis/Memcached in production so
+# every worker shares the same entries.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'olana-default',
+    }
+}
+
+
 
 CORS_ALLOW_ALL_ORIGINS = True  # for development only — we'll secure later
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key', 'x-request-timeout')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed', 'Retry-After', 'X-Load-Shed']
+
+
+# List endpoints that opt in (core.fast.FastListMixin) build rows from .values()
+# instead of one serializer per instance; output is byte-identical.
+FAST_LIST_SERIALIZERS = os.environ.get('FAST_LIST_SERIALIZERS', '1') == '1'
 
 
 REST_FRAMEWORK = {
@@ -156,15 +217,150 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+
+    # Hops of reverse proxies in front of Django that append to X-Forwarded-For.
+    # 0 (the default) identifies clients by REMOTE_ADDR, since a client can put
+    # anything in the header; set it to 1 behind a single nginx.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+
+    # Public write endpoints (core.throttling): '<scope>' is per IP,
+    # '<scope>.total' is for the endpoint as a whole. Login has no total:
+    # a global cap would let one botnet lock everybody out, the admin included.
+    'DEFAULT_THROTTLE_RATES': {
+        'contact': '5/min',
+        'contact.total': '60/min',
+        'register': '5/hour',
+        'register.total': '50/hour',
+        'login': '10/min',
+        'sync': '30/min',
+        'sync.total': '600/min',
+        'views': '30/min',
+        'views.total': '6000/min',
+    },
 }
 
+# Identical contact submissions within this many seconds are dropped
+CONTACT_DEDUP_WINDOW = 3600
+
+
+# Admin change events (core.events, served at /api/events/ under ASGI)
+EVENT_MODELS = [
+    'contact.ContactMessage',
+    'core.Profile', 'core.Skill', 'core.Education', 'core.Experience', 'core.Resume',
+    'works.Portfolio', 'works.Product',
+    'blog.BlogPost', 'blog.BlogCategory',
+]
+EVENTS_RETENTION = 3600       # seconds an event stays available for Last-Event-ID resume
+EVENTS_BACKLOG = 500          # most events replayed to a reconnecting client
+EVENTS_POLL_INTERVAL = 0.5    # seconds between checks of the shared sequence counter
+EVENTS_HEARTBEAT = 15         # seconds between keep-alive comments
+
+
+# CDN / reverse-proxy caching (core.surrogate)
+SURROGATE_KEY_MODELS = [label for label in EVENT_MODELS if label != 'contact.ContactMessage']
+CACHE_CONTROL_MAX_AGE = 60            # browsers
+SURROGATE_MAX_AGE = 24 * 3600         # shared caches; edits are purged by key
+SURROGATE_KEY_LIMIT = 200             # beyond this, only collection keys are sent
+SURROGATE_PURGER = os.environ.get('SURROGATE_PURGER', 'core.surrogate.LogPurger')
+SURROGATE_PURGE_FILE = BASE_DIR / 'purge.log'                       # FilePurger
+SURROGATE_PURGE_URL = os.environ.get('SURROGATE_PURGE_URL', '')     # HTTPPurger
+SURROGATE_PURGE_METHOD = 'PURGE'
+SURROGATE_PURGE_HEADER = 'Surrogate-Key'    # 'xkey-purge' for Varnish xkey
+SURROGATE_PURGE_HEADERS = {}                # e.g. {'Fastly-Key': '...'}
+SURROGATE_PURGE_DELAY = 0.2                 # HTTPPurger: seconds of purges merged into one call
+SURROGATE_PURGE_MAX_HEADER = 8000           # HTTPPurger: characters of keys per call
+
 
 
 
+# Public site (the React frontend); used for sitemap <loc> and feed links
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:5173')
+SITEMAP_PAGE_SIZE = 50000   # URLs per child sitemap (protocol maximum)
+
+
 # Media files (images, PDFs, etc.)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Delete an uploaded file as soon as its row is deleted or the file replaced
+# (if no other row references it). Otherwise run `manage.py cleanup_media`.
+MEDIA_DELETE_REPLACED_FILES = os.environ.get('MEDIA_DELETE_REPLACED_FILES', '') == '1'
+
+# View counters (core.popularity): one view per visitor per window, buffered
+# in each process and written in batches
+VIEW_DEDUP_WINDOW = 30 * 60
+VIEW_FLUSH_INTERVAL = 10
+POPULAR_SIZE = 10
+
+# Idempotency-Key on writes (core.idempotency): how long a response is kept for
+# replays, and when a key whose request never finished (a killed worker) is freed
+IDEMPOTENCY_TTL = 24 * 3600
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+# POST /api/batch/ (core.batch): items per call, and threads for runs of GETs
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_CONCURRENCY = 4
+
+# GET /api/sync/ (core.delta): tokens reach this many seconds back so rows saved
+# by a transaction still open at sync time are not missed; deletions are
+# remembered for the retention period (manage.py prune_tombstones), older
+# tokens get a full resync
+SYNC_OVERLAP = 5
+SYNC_TOMBSTONE_RETENTION = 30 * 24 * 3600
+SYNC_PAGE_SIZE = 500   # rows per response; the rest follows via ?cursor=
+
+# GET /api/autocomplete/ (core.typeahead): size bounds of the in-process index,
+# keys scanned per result, how often a process checks for changes made by others
+AUTOCOMPLETE_MAX_ENTRIES = 50000
+AUTOCOMPLETE_MAX_WORDS = 8
+AUTOCOMPLETE_SCAN_FACTOR = 20
+AUTOCOMPLETE_SYNC_INTERVAL = 1
+AUTOCOMPLETE_MAX_LIMIT = 20
+AUTOCOMPLETE_MAX_AGE = 60
+
+# /metrics (core.metrics). Set METRICS_DIR to a directory shared by the workers
+# of one host (e.g. on tmpfs) so any worker reports the totals of all of them.
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+METRICS_WRITE_INTERVAL = 1  # seconds between snapshot writes per worker
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')  # if set, scrapes need "Authorization: Bearer <token>"
+
+# Worker warm-up (core.warmup), run by wsgi.py/asgi.py before serving: extra
+# modules to import, and public GETs whose responses should be cached up front
+WARMUP_ON_START = os.environ.get('WARMUP_ON_START', '1') == '1'
+# build the related-content and autocomplete indexes before serving rather than
+# in the background; a large index can outlast the server's worker boot timeout
+WARMUP_WAIT_FOR_INDEXES = os.environ.get('WARMUP_WAIT_FOR_INDEXES', '0') == '1'
+WARMUP_MODULES = []
+WARMUP_URLS = [
+    '/api/core/profiles/',
+    '/api/core/skills/',
+    '/api/blog/posts/',
+    '/api/blog/categories/?with_counts=1',
+    '/api/blog/archive/',
+    '/api/works/portfolios/',
+    '/api/works/products/',
+]
+
+# Load shedding (core.shedding). Thresholds: requests in flight per process,
+# seconds queued in front of Django (X-Request-Start), average query seconds.
+# Past them public GETs get stale copies and low-priority paths get 503.
+SHED_ENABLED = os.environ.get('SHED_ENABLED', '1') == '1'
+SHED_MAX_IN_FLIGHT = int(os.environ.get('SHED_MAX_IN_FLIGHT', 32))
+SHED_MAX_QUEUE_DELAY = 2.0
+SHED_MAX_DB_LATENCY = 0.5
+SHED_SEVERE_FACTOR = 2          # this many times over a threshold, shed everything without a stale copy
+SHED_LOW_PRIORITY_PATHS = ['/api/register/', '/api/batch/', '/api/sync/']
+SHED_ADMIN_READS = True         # the admin's index, changelists and history pages are low priority too
+SHED_RETRY_AFTER = 5
+SHED_MIN_REMAINING = 0.1        # seconds of the client's X-Request-Timeout that must be left
+SHED_STALE_TTL = 3600           # how long a last good copy can be served
+SHED_STALE_REFRESH = 30         # a URL's copy is refreshed at most this often
+SHED_STALE_MAX_SIZE = 256 * 1024
+
+# Admin changelists (core.admin_base.LargeTableAdmin) count exactly up to this
+# many rows; beyond it they use table statistics or show "N+"
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
 # Static files (CSS, JS, etc. - we'll use later)
 STATIC_URL = '/static/'
 
@@ -174,4 +370,11 @@ from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
-}
\ No newline at end of file
+}
+
+
+# Response compression (core.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = 512          # bytes; smaller bodies are sent as-is
+COMPRESSION_LEVELS = {'zstd': 3, 'br': 5, 'gzip': 6}
+COMPRESSION_CACHE_TIMEOUT = 300     # seconds to keep compressed bodies, 0 disables
+COMPRESSION_EXCLUDE_PATHS = ['/api/token/']  # token responses carry secrets (BREACH)
@@ -2,13 +2,26 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from core.views import RegisterView
+from core.views import RegisterView, ThrottledTokenObtainPairView, event_stream, healthz, metrics_view, readyz
+from core.batch import BatchView
+from core.delta import SyncView
+from core.typeahead import AutocompleteView
+from core.sitemaps import StaticPageSitemap
+from core.syndication import conditional_cache, sitemap_index, sitemap_section
+from blog.feeds import LatestPostsAtomFeed, LatestPostsFeed
+from blog.sitemaps import BlogPostSitemap
+from works.feeds import LatestPortfolioAtomFeed, LatestPortfolioFeed
+from works.sitemaps import PortfolioSitemap
 
 
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
+
+
+sitemaps = {
+    'pages': StaticPageSitemap(),
+    'blog': BlogPostSitemap(),
+    'works': PortfolioSitemap(),
+}
 
 
 urlpatterns = [
@@ -19,8 +32,25 @@ urlpatterns = [
     path('api/contact/', include('contact.urls')),
 
     path('api/register/', RegisterView.as_view(), name='register'),
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/', ThrottledTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/events/', event_stream, name='event-stream'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/sync/', SyncView.as_view(), name='sync'),
+    path('api/autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
+
+    # Monitoring
+    path('metrics', metrics_view, name='metrics'),
+    path('healthz', healthz, name='healthz'),
+    path('readyz', readyz, name='readyz'),
+
+    # Crawlers & feed readers
+    path('sitemap.xml', sitemap_index, {'sitemaps': sitemaps, 'sitemap_url_name': 'sitemap-section'}, name='sitemap-index'),
+    path('sitemap-<section>.xml', sitemap_section, {'sitemaps': sitemaps}, name='sitemap-section'),
+    path('feeds/blog/rss/', conditional_cache('blog')(LatestPostsFeed()), name='blog-feed-rss'),
+    path('feeds/blog/atom/', conditional_cache('blog')(LatestPostsAtomFeed()), name='blog-feed-atom'),
+    path('feeds/works/rss/', conditional_cache('works')(LatestPortfolioFeed()), name='works-feed-rss'),
+    path('feeds/works/atom/', conditional_cache('works')(LatestPortfolioAtomFeed()), name='works-feed-atom'),
 ]
 
 if settings.DEBUG:
@@ -6,10 +6,12 @@ class PortfolioAdmin(admin.ModelAdmin):
     list_display = ('title', 'date', 'is_featured', 'created_at')
     list_filter = ('is_featured', 'date')
     search_fields = ('title', 'description', 'tags')
+    autocomplete_fields = ('profile',)
     prepopulated_fields = {}  # no slug yet
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ('title', 'available', 'price', 'created_at')
     list_filter = ('available',)
-    search_fields = ('title', 'description')
\ No newline at end of file
+    search_fields = ('title', 'description')
+    autocomplete_fields = ('profile',)
\ No newline at end of file
@@ -3,3 +3,18 @@ from django.apps import AppConfig
 
 class WorksConfig(AppConfig):
     name = 'works'
+
+    def ready(self):
+        from core.caching import invalidate_on_change
+        from core.images import track_images
+        from .models import Portfolio, Product
+        from .autocomplete import portfolios, products
+        from .related import related_portfolios
+        from . import sync  # noqa: F401  registers the delta-sync collections
+
+        related_portfolios.connect()
+        portfolios.connect()
+        products.connect()
+        track_images(Portfolio, 'image')
+        track_images(Product, 'image')
+        invalidate_on_change('works', Portfolio, Product)
@@ -0,0 +1,30 @@
+from core.related import split_tags
+from core.typeahead import AutocompleteSource
+from .models import Portfolio, Product
+
+
+def portfolio_suggestions(row):
+    yield {'type': 'portfolio', 'id': row['pk'], 'label': row['title']}
+    for tag in split_tags(row['tags']):
+        yield {'type': 'tag', 'label': tag}
+
+
+def product_suggestions(row):
+    yield {'type': 'product', 'id': row['pk'], 'label': row['title']}
+
+
+portfolios = AutocompleteSource(
+    'works.portfolio',
+    model=Portfolio,
+    queryset=lambda: Portfolio.objects.all(),
+    fields=['title', 'tags'],
+    suggestions=portfolio_suggestions,
+)
+
+products = AutocompleteSource(
+    'works.product',
+    model=Product,
+    queryset=lambda: Product.objects.all(),
+    fields=['title'],
+    suggestions=product_suggestions,
+)
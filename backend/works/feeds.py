@@ -0,0 +1,41 @@
+from django.contrib.syndication.views import Feed
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from core.related import split_tags
+from core.syndication import site_url
+from .models import Portfolio
+
+
+class LatestPortfolioFeed(Feed):
+    title = "Dr. Olana Wakoya Gichile — Publications & Works"
+    description = "Recent publications, presentations and case studies."
+
+    def link(self):
+        return site_url('/works')
+
+    def items(self):
+        return Portfolio.objects.all()[:20]
+
+    def item_title(self, portfolio):
+        return portfolio.title
+
+    def item_description(self, portfolio):
+        return Truncator(portfolio.description).words(60)
+
+    def item_link(self, portfolio):
+        return site_url(f'/works/{portfolio.pk}')
+
+    def item_pubdate(self, portfolio):
+        return portfolio.created_at
+
+    def item_updateddate(self, portfolio):
+        return portfolio.updated_at
+
+    def item_categories(self, portfolio):
+        return split_tags(portfolio.tags)
+
+
+class LatestPortfolioAtomFeed(LatestPortfolioFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPortfolioFeed.description
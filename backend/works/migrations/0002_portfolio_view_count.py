@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('works', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolio',
+            name='view_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+    ]
@@ -7,11 +7,19 @@ class Portfolio(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     image = models.ImageField(upload_to='portfolios/', blank=True, null=True)
+    # filled from the upload by core.images
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False, help_text="Dominant colour of the image, #rrggbb")
+    image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blurred preview as a data: URI")
     link = models.URLField(blank=True, help_text="Optional external link (e.g., publication, presentation)")
     date = models.DateField(default=timezone.now)
     tags = models.CharField(max_length=300, blank=True, help_text="Comma-separated tags, e.g., research, case study, presentation")
     is_featured = models.BooleanField(default=False, help_text="Show in home page featured section?")
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
+    # written in batches by core.popularity, never by save()
+    view_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
 
     def __str__(self):
         return self.title
@@ -25,9 +33,15 @@ class Product(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, help_text="Optional price if it's a paid service/program")
     image = models.ImageField(upload_to='products/', blank=True, null=True)
+    # filled from the upload by core.images
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False, help_text="Dominant colour of the image, #rrggbb")
+    image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blurred preview as a data: URI")
     available = models.BooleanField(default=True)
     link = models.URLField(blank=True, help_text="Booking/registration link")
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync (core.delta)
 
     def __str__(self):
         return self.title
@@ -0,0 +1,8 @@
+from core.popularity import ViewCounter
+from .models import Portfolio
+
+portfolio_views = ViewCounter(
+    'works.portfolio',
+    model=Portfolio,
+    queryset=lambda: Portfolio.objects.all(),
+)
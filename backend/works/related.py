@@ -0,0 +1,23 @@
+from collections import Counter
+
+from core.related import RelatedIndex, split_tags, tokenize
+from .models import Portfolio
+
+
+def portfolio_terms(row):
+    terms = Counter()
+    for token in tokenize(row['title']):
+        terms[token] += 2
+    terms.update(tokenize(row['description']))
+    for tag in split_tags(row['tags']):
+        terms[f'tag:{tag}'] += 3
+    return terms
+
+
+related_portfolios = RelatedIndex(
+    'works.portfolio',
+    model=Portfolio,
+    queryset=lambda: Portfolio.objects.all(),
+    fields=['title', 'description', 'tags'],
+    terms=portfolio_terms,
+)
@@ -1,21 +1,24 @@
 from rest_framework import serializers
 from .models import Portfolio, Product
 from core.serializers import ProfileSerializer  # Import to show profile if needed
+from core.surrogate import SurrogateKeySerializerMixin
 
-class PortfolioSerializer(serializers.ModelSerializer):
+class PortfolioSerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Portfolio
         fields = [
-            'id', 'profile', 'title', 'description', 'image', 
-            'link', 'date', 'tags', 'is_featured', 'created_at'
+            'id', 'profile', 'title', 'description', 'image',
+            'image_width', 'image_height', 'image_color', 'image_placeholder',
+            'link', 'date', 'tags', 'is_featured', 'created_at', 'view_count'
         ]
-        read_only_fields = ['profile', 'created_at']
+        read_only_fields = ['profile', 'created_at', 'view_count', 'image_width', 'image_height', 'image_color', 'image_placeholder']
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SurrogateKeySerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = [
-            'id', 'profile', 'title', 'description', 'price', 
-            'image', 'available', 'link', 'created_at'
+            'id', 'profile', 'title', 'description', 'price',
+            'image', 'image_width', 'image_height', 'image_color', 'image_placeholder',
+            'available', 'link', 'created_at'
         ]
-        read_only_fields = ['profile', 'created_at']
\ No newline at end of file
+        read_only_fields = ['profile', 'created_at', 'image_width', 'image_height', 'image_color', 'image_placeholder']
\ No newline at end of file
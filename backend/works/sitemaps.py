@@ -0,0 +1,15 @@
+from core.syndication import SiteSitemap
+from .models import Portfolio
+
+
+class PortfolioSitemap(SiteSitemap):
+    namespace = 'works'
+    lastmod_field = 'updated_at'
+    changefreq = 'monthly'
+    priority = 0.7
+
+    def items(self):
+        return Portfolio.objects.only('pk', 'updated_at').order_by('pk')
+
+    def location(self, portfolio):
+        return f'/works/{portfolio.pk}'
@@ -0,0 +1,6 @@
+from core.delta import SyncCollection
+from .models import Portfolio, Product
+from .serializers import PortfolioSerializer, ProductSerializer
+
+portfolios = SyncCollection('works.portfolio', Portfolio, PortfolioSerializer)
+products = SyncCollection('works.product', Product, ProductSerializer)
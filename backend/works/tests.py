@@ -1,3 +1,128 @@
-from django.test import TestCase
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.pagination import PageNumberPagination
+
+from core import caching
+from core.models import Profile
+from .models import Portfolio, Product
+
+
+class FastListTests(TestCase):
+    """The fast list path (core.fast) must return exactly what the serializers return."""
+
+    @classmethod
+    def setUpTestData(cls):
+        profile = Profile.objects.create(full_name="Dr. Test")
+        for number in range(5):
+            Portfolio.objects.create(
+                profile=profile, title=f"Case study {number}", description="...",
+                date=date(2024, 1, 1) + timedelta(days=number), tags="research",
+                image=f'portfolios/slide {number}.png' if number % 2 else None,
+                is_featured=number == 0,
+            )
+            Product.objects.create(
+                profile=profile, title=f"Course {number}", description="...",
+                price=Decimal('49.90') if number % 2 else None,
+                image=f'products/course-{number}.jpg' if number % 2 else None,
+                available=number != 3,
+            )
+
+    def get(self, path, fast):
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            return self.client.get(path, HTTP_ACCEPT='application/json')
+
+    def assertSameOutput(self, path):
+        slow = self.get(path, False)
+        fast = self.get(path, True)
+        self.assertEqual(slow.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+        self.assertEqual(fast.get('Surrogate-Key'), slow.get('Surrogate-Key'))
+        return fast.json()
+
+    def test_portfolios(self):
+        body = self.assertSameOutput('/api/works/portfolios/')
+        self.assertEqual(body['count'], 5)
+        images = {item['title']: item['image'] for item in body['results']}
+        self.assertEqual(images["Case study 1"], 'http://testserver/media/portfolios/slide%201.png')
+        self.assertIsNone(images["Case study 0"])
+
+    def test_products(self):
+        body = self.assertSameOutput('/api/works/products/')
+        prices = {item['title']: item['price'] for item in body['results']}
+        self.assertEqual(prices["Course 1"], '49.90')
+        self.assertIsNone(prices["Course 0"])
+
+    def test_pagination(self):
+        # page_size is read from the settings once, when DRF is imported
+        with mock.patch.object(PageNumberPagination, 'page_size', 2):
+            for path in ('/api/works/portfolios/', '/api/works/products/'):
+                first = self.assertSameOutput(path)
+                last = self.assertSameOutput(path + '?page=3')
+                self.assertEqual(len(first['results']), 2)
+                self.assertEqual(len(last['results']), 1)
+                self.assertIsNone(last['next'])
+
+
+class SyndicationTests(TestCase):
+    """The sitemap and feeds follow edits (Portfolio.updated_at), not just new items."""
+
+    def test_edit_changes_lastmod_and_etag(self):
+        portfolio = Portfolio.objects.create(profile=Profile.objects.create(full_name="Dr. Test"),
+                                             title="Case study", description="...", date=date(2024, 1, 1))
+        month_ago = portfolio.created_at - timedelta(days=30)
+        Portfolio.objects.filter(pk=portfolio.pk).update(created_at=month_ago, updated_at=month_ago)
+        caching.bump('works')  # update() sends no signal
+        before = self.client.get('/sitemap-works.xml')
+        feed = self.client.get('/feeds/works/atom/')
+
+        portfolio = Portfolio.objects.get(pk=portfolio.pk)
+        portfolio.title = "Case study, revised"
+        with self.captureOnCommitCallbacks(execute=True):
+            portfolio.save()
+        after = self.client.get('/sitemap-works.xml')
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertNotEqual(after['Last-Modified'], before['Last-Modified'])
+        self.assertIn(f'<lastmod>{portfolio.updated_at.date().isoformat()}</lastmod>', after.content.decode())
+        updated = self.client.get('/feeds/works/atom/')
+        self.assertNotEqual(updated['ETag'], feed['ETag'])
+        self.assertIn(f'<updated>{portfolio.updated_at.isoformat()}', updated.content.decode())
+
+
+class BackfillImageMetadataTests(TestCase):
+    """backfill_image_metadata writes with bulk_update, so it invalidates by hand."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        Path(media.name, 'products').mkdir()
+        Image.new('RGB', (40, 30), (200, 10, 10)).save(Path(media.name, 'products', 'course.png'))
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        profile = Profile.objects.create(full_name="Dr. Test")
+        self.product = Product.objects.create(profile=profile, title="Course", description="...")
+        Product.objects.filter(pk=self.product.pk).update(image='products/course.png')  # no metadata yet
+
+    def test_fills_metadata_and_invalidates(self):
+        version = caching.get_version('works')
+        with mock.patch('core.surrogate.purge') as purge:
+            call_command('backfill_image_metadata', workers=1, stdout=mock.Mock(), stderr=mock.Mock())
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.image_width, self.product.image_height), (40, 30))
+        self.assertGreater(caching.get_version('works'), version)
+        purge.assert_called_once_with(['works.product', f'works.product:{self.product.pk}'])
+
+    def test_unreadable_file_is_reported(self):
+        Product.objects.filter(pk=self.product.pk).update(image='products/missing.png')
+        stderr = mock.Mock()
+        with mock.patch('core.surrogate.purge') as purge:
+            call_command('backfill_image_metadata', workers=1, stdout=mock.Mock(), stderr=stderr)
+        self.product.refresh_from_db()
+        self.assertIsNone(self.product.image_width)
+        self.assertIn('missing.png', stderr.write.call_args[0][0])
+        purge.assert_not_called()
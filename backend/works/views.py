@@ -1,13 +1,22 @@
-from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
 from .models import Portfolio, Product
+from .popularity import portfolio_views
+from .related import related_portfolios
 from .serializers import PortfolioSerializer, ProductSerializer
 from core.models import Profile  # Import for auto-assign
+from core.fast import FastListMixin
+from core.idempotency import IdempotencyMixin
+from core.surrogate import SurrogateKeyMixin, instance_key
+from core.throttling import PUBLIC_WRITE_THROTTLES
 
-class PortfolioViewSet(viewsets.ModelViewSet):
+class PortfolioViewSet(IdempotencyMixin, FastListMixin, SurrogateKeyMixin, viewsets.ModelViewSet):
     queryset = Portfolio.objects.all()
     serializer_class = PortfolioSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_scope = 'views'  # record_view only; nothing else here is throttled
 
     def perform_create(self, serializer):
         if self.request.user.is_authenticated and hasattr(self.request.user, 'profile'):
@@ -18,7 +27,33 @@ class PortfolioViewSet(viewsets.ModelViewSet):
                 raise serializers.ValidationError("No profile found. Create one first.")
         serializer.save(profile=profile)
 
-class ProductViewSet(viewsets.ModelViewSet):
+    @action(detail=True)
+    def related(self, request, pk=None):
+        # Served from the precomputed similarity index (see works/related.py)
+        portfolio = self.get_object()
+        self._surrogate_keys.add(instance_key(portfolio))
+        ids = related_portfolios.related_ids(portfolio.pk)
+        portfolios = Portfolio.objects.in_bulk(ids)
+        serializer = self.get_serializer([portfolios[i] for i in ids if i in portfolios], many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['post'], url_path='view', permission_classes=[AllowAny],
+            throttle_classes=PUBLIC_WRITE_THROTTLES)
+    def record_view(self, request, pk=None):
+        # Counted in memory and flushed in batches (see core/popularity.py)
+        portfolio_views.record(request, self.get_object().pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False)
+    def popular(self, request):
+        # Most viewed portfolio items, from the ranking refreshed after each counter flush
+        self._surrogate_keys.add(portfolio_views.surrogate_key)
+        ids = portfolio_views.popular_ids()
+        portfolios = Portfolio.objects.in_bulk(ids)
+        serializer = self.get_serializer([portfolios[i] for i in ids if i in portfolios], many=True)
+        return Response(serializer.data)
+
+class ProductViewSet(IdempotencyMixin, FastListMixin, SurrogateKeyMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import adminApi from '../services/adminApi';
+import { batch, subscribeToChanges } from '../services/adminApi';
 import {
   Users, FileText, BookOpen, MessageSquare,
   Calendar, TrendingUp, ChevronRight, PlusCircle,
@@ -26,18 +26,36 @@ export default function Dashboard() {
     fetchDashboardData();
   }, []);
 
+  // Refresh when content or messages change instead of polling
+  useEffect(() => {
+    let timer;
+    const unsubscribe = subscribeToChanges(() => {
+      clearTimeout(timer);
+      timer = setTimeout(() => fetchDashboardData(), 300);
+    });
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, []);
+
   const fetchDashboardData = async () => {
     setLoading(true);
     setError(null);
 
     try {
-      const [profileRes, portfolioRes, productRes, blogRes, messageRes] = await Promise.all([
-        adminApi.get('/core/profiles/'),
-        adminApi.get('/works/portfolios/'),
-        adminApi.get('/works/products/'),
-        adminApi.get('/blog/posts/'),
-        adminApi.get('/contact/messages/'),
+      // one round trip instead of five
+      const responses = await batch([
+        { path: '/core/profiles/' },
+        { path: '/works/portfolios/' },
+        { path: '/works/products/' },
+        { path: '/blog/posts/' },
+        { path: '/contact/messages/' },
       ]);
+      if (responses.some((r) => r.status !== 200)) {
+        throw new Error('Dashboard batch request failed');
+      }
+      const [profileRes, portfolioRes, productRes, blogRes, messageRes] = responses.map((r) => ({ data: r.body }));
 
       setStats({
         profiles: profileRes.data.count || profileRes.data.results?.length || 0,
@@ -1,6 +1,6 @@
 // src/admin/pages/contact/ContactMessages.jsx
-import { useState, useCallback } from 'react';
-import adminApi from '../../services/adminApi';
+import { useState, useCallback, useEffect } from 'react';
+import adminApi, { subscribeToChanges } from '../../services/adminApi';
 import DataTable from '../../components/DataTable';
 import FormModal from '../../components/FormModal';
 import ConfirmDialog from '../../components/ConfirmDialog';
@@ -16,6 +16,13 @@ export default function ContactMessages() {
   // This key forces DataTable to re-fetch after actions
   const [refreshKey, setRefreshKey] = useState(0);
 
+  // New or edited messages show up without re-polling the list
+  useEffect(() => subscribeToChanges((change) => {
+    if (change.model === 'contact.contactmessage') {
+      setRefreshKey(prev => prev + 1);
+    }
+  }), []);
+
   const handleView = useCallback(async (message) => {
     setSelectedMessage(message);
     setModalOpen(true);
@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { newIdempotencyKey } from '../../services/api';
 
 const API_BASE = 'http://127.0.0.1:8000/api'; // ← change only if your backend port is different
 
@@ -6,12 +7,17 @@ const adminApi = axios.create({
   baseURL: API_BASE,
 });
 
-// Auto-add JWT token to every request
+const WRITE_METHODS = ['post', 'put', 'patch'];
+
+// Auto-add JWT token to every request, and an Idempotency-Key to writes
 adminApi.interceptors.request.use((config) => {
   const token = localStorage.getItem('accessToken');
   if (token) {
     config.headers.Authorization = `Bearer ${token}`;
   }
+  if (WRITE_METHODS.includes(config.method) && !config.headers['Idempotency-Key']) {
+    config.headers['Idempotency-Key'] = newIdempotencyKey();
+  }
   return config;
 });
 
@@ -19,6 +25,13 @@ adminApi.interceptors.request.use((config) => {
 adminApi.interceptors.response.use(
   (response) => response,
   (error) => {
+    // a write that timed out is retried once with the same key: the server
+    // replays the first result instead of saving twice
+    const { config } = error;
+    if (error.code === 'ECONNABORTED' && config && WRITE_METHODS.includes(config.method) && !config._retried) {
+      config._retried = true;
+      return adminApi(config);
+    }
     if (error.response?.status === 401) {
       localStorage.removeItem('accessToken');
       localStorage.removeItem('refreshToken');
@@ -28,4 +41,33 @@ adminApi.interceptors.response.use(
   }
 );
 
+// Live change feed (Server-Sent Events). EventSource can't send headers,
+// so the access token goes in the query string. Returns an unsubscribe function.
+export function subscribeToChanges(onChange) {
+  const token = localStorage.getItem('accessToken');
+  if (!token || typeof EventSource === 'undefined') return () => {};
+
+  const source = new EventSource(`${API_BASE}/events/?token=${encodeURIComponent(token)}`);
+  source.onmessage = (event) => {
+    try {
+      onChange(JSON.parse(event.data));
+    } catch (err) {
+      console.error('Bad change event:', err);
+    }
+  };
+  return () => source.close();
+}
+
+// Several API calls in one round trip (POST /api/batch/). Paths are relative to
+// the API base like everywhere else, e.g. { method: 'GET', path: '/blog/posts/' }.
+// Resolves to [{ status, headers, body }] in the same order; with atomic: true
+// all writes are rolled back if any item fails.
+export async function batch(requests, { atomic = false } = {}) {
+  const res = await adminApi.post('/batch/', {
+    atomic,
+    requests: requests.map(({ method = 'GET', path, body }) => ({ method, path: `/api${path}`, body })),
+  });
+  return res.data.responses;
+}
+
 export default adminApi;
\ No newline at end of file
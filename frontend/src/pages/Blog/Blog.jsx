@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { MagnifyingGlassIcon, CalendarIcon, TagIcon } from '@heroicons/react/24/outline';
-import api from '../../services/api';
+import api, { placeholderStyle } from '../../services/api';
 
 function Blog() {
   const [posts, setPosts] = useState([]);
@@ -79,6 +79,10 @@ function Blog() {
                     <img
                       src={post.featured_image}
                       alt={post.title}
+                      width={post.featured_image_width || undefined}
+                      height={post.featured_image_height || undefined}
+                      loading="lazy"
+                      style={placeholderStyle(post, 'featured_image')}
                       className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-700"
                     />
                   ) : (
@@ -132,9 +136,13 @@ function Blog() {
                   )}
 
                   <button
-                    onClick={() =>
-                      setExpandedPostId(expandedPostId === post.id ? null : post.id)
-                    }
+                    onClick={() => {
+                      if (expandedPostId !== post.id) {
+                        // counted once per visitor server-side; failures don't matter here
+                        api.post(`/blog/posts/${post.id}/view/`).catch(() => {});
+                      }
+                      setExpandedPostId(expandedPostId === post.id ? null : post.id);
+                    }}
                     className="mt-auto inline-flex items-center text-emerald-600 font-medium hover:text-emerald-700 transition-colors group/link"
                   >
                     {expandedPostId === post.id ? 'Hide Article' : 'Read Full Article'}
@@ -10,7 +10,7 @@ import {
   LightBulbIcon,
   BookOpenIcon
 } from '@heroicons/react/24/outline';
-import api from '../services/api';
+import api, { placeholderStyle } from '../services/api';
 
 function Home() {
   const [profile, setProfile] = useState(null);
@@ -251,6 +251,10 @@ function Home() {
                       <img
                         src={portfolio.image}
                         alt={portfolio.title}
+                        width={portfolio.image_width || undefined}
+                        height={portfolio.image_height || undefined}
+                        loading="lazy"
+                        style={placeholderStyle(portfolio, 'image')}
                         className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-700"
                       />
                     ) : (
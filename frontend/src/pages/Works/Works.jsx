@@ -8,7 +8,7 @@ import {
   CheckCircleIcon,
   XCircleIcon
 } from '@heroicons/react/24/outline';
-import api from '../../services/api';
+import api, { placeholderStyle } from '../../services/api';
 
 function Works() {
   const [portfolios, setPortfolios] = useState([]);
@@ -109,6 +109,10 @@ function Works() {
                       <img
                         src={item.image}
                         alt={item.title}
+                        width={item.image_width || undefined}
+                        height={item.image_height || undefined}
+                        loading="lazy"
+                        style={placeholderStyle(item, 'image')}
                         className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-700"
                       />
                     ) : (
@@ -186,6 +190,10 @@ function Works() {
                       <img
                         src={item.image}
                         alt={item.title}
+                        width={item.image_width || undefined}
+                        height={item.image_height || undefined}
+                        loading="lazy"
+                        style={placeholderStyle(item, 'image')}
                         className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-700"
                       />
                     ) : (
@@ -5,6 +5,35 @@ const api = axios.create({
   timeout: 10000,
 });
 
+// Writes carry an Idempotency-Key, and a write that times out is retried once
+// with the same key, so the server replays the first result instead of
+// creating a duplicate (e.g. a second contact message).
+const WRITE_METHODS = ['post', 'put', 'patch'];
+
+export function newIdempotencyKey() {
+  return globalThis.crypto?.randomUUID?.() ?? `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+}
+
+api.interceptors.request.use((config) => {
+  if (WRITE_METHODS.includes(config.method) && !config.headers['Idempotency-Key']) {
+    config.headers['Idempotency-Key'] = newIdempotencyKey();
+  }
+  // lets an overloaded server skip requests we will have given up on by then
+  if (config.timeout) {
+    config.headers['X-Request-Timeout'] = String(config.timeout);
+  }
+  return config;
+});
+
+api.interceptors.response.use(undefined, (error) => {
+  const { config } = error;
+  if (error.code === 'ECONNABORTED' && config && WRITE_METHODS.includes(config.method) && !config._retried) {
+    config._retried = true;
+    return api(config);
+  }
+  return Promise.reject(error);
+});
+
 // Add interceptor to attach token
 // api.interceptors.request.use(
 //   (config) => {
@@ -17,4 +46,18 @@ const api = axios.create({
 //   (error) => Promise.reject(error)
 // );
 
+// Dominant colour + tiny blurred preview (both stored at upload) behind an
+// image while the real file loads; no extra request.
+export function placeholderStyle(item, field = 'image') {
+  const color = item[`${field}_color`];
+  const preview = item[`${field}_placeholder`];
+  if (!color && !preview) return undefined;
+  return {
+    backgroundColor: color || undefined,
+    backgroundImage: preview ? `url("${preview}")` : undefined,
+    backgroundSize: 'cover',
+    backgroundPosition: 'center',
+  };
+}
+
 export default api;
\ No newline at end of file